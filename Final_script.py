@@ -7,9 +7,12 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import csv
 import os
 import pandas as pd
+from crawl_checkpoint import CrawlCheckpoint
+from app.utils.aimd import AIMDWindow
 
 ID = os.environ.get('linkedin_username')
 PW = os.environ.get('linkedin_pw')
@@ -17,8 +20,6 @@ PW = os.environ.get('linkedin_pw')
 driver = webdriver.Chrome(ChromeDriverManager().install())
 driver.get("https://www.linkedin.com/sales/login")
 
-contacts = []
-
 # Log In
 iframe = driver.find_element_by_tag_name("iframe")
 driver.switch_to.frame(iframe)
@@ -64,7 +65,19 @@ industries ={
     "Staffing and Recruitment": 104
 }
 
-total_pages = 1
+# Rows are streamed to the CSV page by page; a rerun resumes after the last finished page
+
+checkpoint = CrawlCheckpoint('scraped_newhr.csv', ['LinkedIn Name', 'Title_Company', 'Industry', 'Location'])
+checkpoint.open()
+
+total_pages = checkpoint.pages_done + 1
+
+# Pause between pages adapts to how LinkedIn responds: it halves whenever a page
+# fails to load (timeouts, security challenges) and shrinks slowly while pages
+# load quickly. page_delay is the pause at the smallest window.
+
+pacer = AIMDWindow(initial=2, minimum=1, maximum=8, latency_target=10)
+page_delay = 60
 
 def var_URL(industry, page=1):
     industry = str(industry)
@@ -82,6 +95,13 @@ def find_last_page():
         last_page = int(float(last_page))
     return last_page
 
+def extract_row(info):
+    exclude = ['Premium Member Badge', 'Viewed']
+    exclude2 = 'is online' 
+    exclude3 = 'was last active'
+    line = [x for x in info if x not in exclude and exclude2 not in x and exclude3 not in x]
+    return [line[0], line[1], line[-1], line[-2]]
+
 
 # Loop through each industry, scrape data from each page
 
@@ -89,18 +109,25 @@ try:
 
     for industry, industry_code in industries.items():
 
-        url = var_URL(industry_code)
+        if checkpoint.is_complete(industry):
+            print('industry:', industry, 'already scraped')
+            continue
+
+        current_page = checkpoint.next_page(industry)
+        lastpage = checkpoint.last_page(industry)
 
-        driver.get(url)
+        if lastpage is None:
+            url = var_URL(industry_code)
 
-        element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "search-results__pagination"))
-        )
+            driver.get(url)
 
-        time.sleep(2)
+            element = WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "search-results__pagination"))
+            )
 
-        current_page = 1
-        lastpage = find_last_page()
+            time.sleep(2)
+
+            lastpage = find_last_page()
 
         print('industry:', industry)
         print('total pages:', lastpage)
@@ -108,12 +135,26 @@ try:
         while current_page <= lastpage:
 
             url2 = var_URL(industry_code, current_page)
-            driver.get(url2)
             print('current page:', current_page)
 
-            element = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "search-results__result-item"))
-            ) 
+            attempts = 0
+            while True:
+                page_started = time.time()
+                driver.get(url2)
+                try:
+                    element = WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "search-results__result-item"))
+                    )
+                    break
+                except TimeoutException:
+                    attempts += 1
+                    pacer.record(error=True)
+                    if attempts >= 3:
+                        raise
+                    print('page did not load, backing off')
+                    time.sleep(pacer.pace(page_delay))
+
+            pacer.record(latency=time.time() - page_started)
 
             time.sleep(2)
 
@@ -127,10 +168,7 @@ try:
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight*0.3);")
             time.sleep(np.random.uniform(0.5, 1))
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight*0.45);")
-            if current_page%5 == 0:
-                time.sleep(np.random.randint(30, 90))
-            else:
-                time.sleep(np.random.uniform(0.5, 1))
+            time.sleep(np.random.uniform(0.5, 1))
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight*0.6);")
             time.sleep(np.random.uniform(1.5, 2))
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight*0.75);")
@@ -142,47 +180,29 @@ try:
 
             html = driver.find_elements_by_class_name('horizontal-person-entity-lockup-4')
 
+            rows = []
             for info in html:
                 info = info.text
                 info = info.split('\n')
                 info.append(industry)
-                contacts.append(info)
+                rows.append(extract_row(info))
 
-            if current_page%3 == 0 or current_page == lastpage+1:
-                time.sleep(np.random.randint(10, 20))
-            elif total_pages%10 == 0:
-                time.sleep(np.random.randint(90, 120))
+            checkpoint.record(industry, current_page, lastpage, rows)
+
+            time.sleep(pacer.pace(page_delay) * np.random.uniform(0.75, 1.25))
 
             current_page += 1
             total_pages += 1
         
-except:
-    driver.quit()
+except Exception as e:
+    print('crawl stopped at', industry, 'page', current_page, '-', e)
+    print('run again to resume from the last checkpoint')
+    raise
 finally:
+    checkpoint.close()
     driver.quit()
 
 
-# write data into a list to be exported to CSV file
-
-extract = []
-
-for line in contacts:
-    exclude = ['Premium Member Badge', 'Viewed']
-    exclude2 = 'is online' 
-    exclude3 = 'was last active'
-    line = [x for x in line if x not in exclude and exclude2 not in x and exclude3 not in x]
-    extract.extend([[line[0], line[1], line[-1], line[-2]]])
-
-
-# write to csv file
-
-with open('scraped_newhr.csv', 'w') as csv_file:
-    csv_writer = csv.writer(csv_file)
-    csv_writer.writerow(['LinkedIn Name', 'Title_Company', 'Industry', 'Location'])
-    for line in extract:
-        csv_writer.writerow(line)
-
-
 
 
 
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 import os
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
@@ -34,6 +34,84 @@ class Settings(BaseSettings):
     # Application Settings
     MAX_LEADS_PER_REQUEST: int = 25
     MIN_SCORE_THRESHOLD: float = 0.7
+
+    # Scraper Politeness (seconds between requests to the same host)
+    SCRAPER_MIN_DELAY: float = float(os.getenv("SCRAPER_MIN_DELAY", "2"))
+    SCRAPER_MAX_DELAY: float = float(os.getenv("SCRAPER_MAX_DELAY", "5"))
+    SCRAPER_CRAWL_DELAYS: Optional[str] = os.getenv("SCRAPER_CRAWL_DELAYS", None)
+
+    # robots.txt (fetched once per site, cached in memory and on disk)
+    ROBOTS_ENABLED: bool = os.getenv("ROBOTS_ENABLED", "True").lower() == "true"
+    ROBOTS_CACHE_DIR: str = os.getenv("ROBOTS_CACHE_DIR", ".cache/robots")
+    ROBOTS_CACHE_TTL: int = int(os.getenv("ROBOTS_CACHE_TTL", "86400"))
+    ROBOTS_ERROR_TTL: int = int(os.getenv("ROBOTS_ERROR_TTL", "600"))
+    ROBOTS_USER_AGENT: str = os.getenv("ROBOTS_USER_AGENT", "*")
+    ROBOTS_MAX_CRAWL_DELAY: float = float(os.getenv("ROBOTS_MAX_CRAWL_DELAY", "30"))
+
+    # Adaptive Concurrency (AIMD window per source; SCRAPER_AIMD_SOURCE_MAX="google=4,linkedin=4")
+    SCRAPER_AIMD_INITIAL: float = float(os.getenv("SCRAPER_AIMD_INITIAL", "2"))
+    SCRAPER_AIMD_MIN: float = float(os.getenv("SCRAPER_AIMD_MIN", "1"))
+    SCRAPER_AIMD_MAX: float = float(os.getenv("SCRAPER_AIMD_MAX", "16"))
+    SCRAPER_AIMD_INCREASE: float = float(os.getenv("SCRAPER_AIMD_INCREASE", "1"))
+    SCRAPER_AIMD_DECREASE: float = float(os.getenv("SCRAPER_AIMD_DECREASE", "0.5"))
+    SCRAPER_AIMD_LATENCY_TARGET: float = float(os.getenv("SCRAPER_AIMD_LATENCY_TARGET", "5"))
+    SCRAPER_AIMD_MAX_RETRY_AFTER: float = float(os.getenv("SCRAPER_AIMD_MAX_RETRY_AFTER", "300"))
+    SCRAPER_AIMD_SOURCE_MAX: Optional[str] = os.getenv("SCRAPER_AIMD_SOURCE_MAX", "google=4,linkedin=4")
+    # Pause between pages of sequential crawls at the smallest window (seconds)
+    SCRAPER_PACE_DELAY: float = float(os.getenv("SCRAPER_PACE_DELAY", "4"))
+
+    # Circuit Breakers (per source; trip on error rate or slow calls over the last CIRCUIT_WINDOW calls)
+    CIRCUIT_WINDOW: int = int(os.getenv("CIRCUIT_WINDOW", "20"))
+    CIRCUIT_MIN_CALLS: int = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+    CIRCUIT_ERROR_RATE: float = float(os.getenv("CIRCUIT_ERROR_RATE", "0.5"))
+    CIRCUIT_SLOW_CALL_SECONDS: float = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "30"))
+    CIRCUIT_SLOW_RATE: float = float(os.getenv("CIRCUIT_SLOW_RATE", "0.5"))
+    CIRCUIT_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_OPEN_SECONDS", "60"))
+    CIRCUIT_MAX_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_MAX_OPEN_SECONDS", "900"))
+
+    # Extraction Specs (JSON file of per-source specs overriding the built-in ones; re-read when it changes)
+    SCRAPER_EXTRACTION_SPECS_FILE: Optional[str] = os.getenv("SCRAPER_EXTRACTION_SPECS_FILE", None)
+    SCRAPER_EXTRACTION_SPECS_CHECK_INTERVAL: float = float(os.getenv("SCRAPER_EXTRACTION_SPECS_CHECK_INTERVAL", "5"))
+
+    # Scraper Rate Limits (token buckets; SCRAPER_SOURCE_RATE_LIMITS="google=20:5,...")
+    SCRAPER_RATE_PER_MINUTE: float = float(os.getenv("SCRAPER_RATE_PER_MINUTE", "100"))
+    SCRAPER_RATE_BURST: int = int(os.getenv("SCRAPER_RATE_BURST", "10"))
+    SCRAPER_HOST_RATE_PER_MINUTE: float = float(os.getenv("SCRAPER_HOST_RATE_PER_MINUTE", "30"))
+    SCRAPER_HOST_RATE_BURST: int = int(os.getenv("SCRAPER_HOST_RATE_BURST", "3"))
+    SCRAPER_SOURCE_RATE_LIMITS: Optional[str] = os.getenv("SCRAPER_SOURCE_RATE_LIMITS", None)
+
+    # Scraper Response Cache (SCRAPER_CACHE_SOURCE_TTLS="google=3600,web=86400")
+    SCRAPER_CACHE_DIR: str = os.getenv("SCRAPER_CACHE_DIR", ".cache/http")
+    SCRAPER_CACHE_MAX_BYTES: int = int(os.getenv("SCRAPER_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+    SCRAPER_CACHE_TTL: int = int(os.getenv("SCRAPER_CACHE_TTL", "3600"))
+    SCRAPER_CACHE_SOURCE_TTLS: Optional[str] = os.getenv("SCRAPER_CACHE_SOURCE_TTLS", None)
+
+    # Page Downloads (bodies are streamed up to SCRAPER_MAX_PAGE_BYTES)
+    SCRAPER_MAX_PAGE_BYTES: int = int(os.getenv("SCRAPER_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+    SCRAPER_DOWNLOAD_CHUNK_BYTES: int = int(os.getenv("SCRAPER_DOWNLOAD_CHUNK_BYTES", str(64 * 1024)))
+    SCRAPER_ALLOWED_CONTENT_TYPES: str = os.getenv(
+        "SCRAPER_ALLOWED_CONTENT_TYPES", "text/html,application/xhtml+xml,text/plain"
+    )
+
+    # Playwright Browser Pool
+    BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+    BROWSER_PAGES_PER_CONTEXT: int = int(os.getenv("BROWSER_PAGES_PER_CONTEXT", "50"))
+    BROWSER_STORAGE_STATE: Optional[str] = os.getenv("BROWSER_STORAGE_STATE", ".cache/browser_state.json")
+    BROWSER_HEADLESS: bool = os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
+    BROWSER_NAVIGATION_TIMEOUT_MS: int = int(os.getenv("BROWSER_NAVIGATION_TIMEOUT_MS", "10000"))
+    BROWSER_LEAN_SOURCES: str = os.getenv("BROWSER_LEAN_SOURCES", "google,linkedin")
+    BROWSER_BLOCKED_RESOURCE_TYPES: str = os.getenv("BROWSER_BLOCKED_RESOURCE_TYPES", "image,media,font,stylesheet")
+    BROWSER_IN_PAGE_EXTRACTION: bool = os.getenv("BROWSER_IN_PAGE_EXTRACTION", "true").lower() == "true"
+
+    # Shared HTTP Client Pool
+    HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+    # HTML Parsing (auto, lxml, selectolax or html.parser)
+    HTML_PARSER_BACKEND: str = os.getenv("HTML_PARSER_BACKEND", "auto")
     
     class Config:
         case_sensitive = True
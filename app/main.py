@@ -1,10 +1,21 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 import logging
+from app import models
+from app.api import deps
 from app.core.config import settings
 from app.api.v1.endpoints import leads
+from app.utils.aimd import adaptive_concurrency
+from app.utils.browser_pool import browser_pool
+from app.utils.browsing_profiles import browsing_profiles
+from app.utils.circuit_breaker import circuit_breakers
+from app.utils.extraction_spec import extraction_specs
+from app.utils.http_client import http_client
+from app.utils.page_download import page_downloader
+from app.utils.response_cache import response_cache
+from app.utils.robots import robots_policy
 
 # Configure logging
 logging.basicConfig(
@@ -63,6 +74,26 @@ async def health_check():
         "version": settings.VERSION
     }
 
+@app.get("/scraper/stats")
+async def scraper_stats(
+    current_user: models.User = Depends(deps.get_current_user)
+):
+    """Scraping infrastructure statistics for operators"""
+    return {
+        "http_pool": http_client.stats(),
+        "browser_pool": browser_pool.stats(),
+        "browsing_profiles": {
+            source: {"lean": profile.lean, "blocked_requests": profile.blocked_requests}
+            for source, profile in browsing_profiles.items()
+        },
+        "response_cache": response_cache.stats(),
+        "downloads": page_downloader.stats(),
+        "robots": robots_policy.stats(),
+        "concurrency": adaptive_concurrency.stats(),
+        "circuit_breakers": circuit_breakers.stats(),
+        "extraction_specs": extraction_specs.stats()
+    }
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Global HTTP exception handler"""
@@ -80,8 +111,16 @@ async def http_exception_handler(request, exc):
 async def startup_event():
     """Initialize services and connections on startup"""
     logger.info("Starting %s in %s mode", settings.PROJECT_NAME, settings.ENVIRONMENT)
+    await http_client.start()
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        # Searches retry the launch on first use; keep the API up meanwhile
+        logger.error("Failed to start browser pool: %s", e)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up resources on shutdown"""
-    logger.info("Shutting down %s", settings.PROJECT_NAME) 
\ No newline at end of file
+    logger.info("Shutting down %s", settings.PROJECT_NAME)
+    await http_client.close()
+    await browser_pool.close() 
\ No newline at end of file
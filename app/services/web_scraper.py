@@ -1,13 +1,12 @@
 """Web scraping module specialized for property management leads."""
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
-import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
+import time
+import aiohttp
 from fake_useragent import UserAgent
 from tenacity import retry, stop_after_attempt, wait_exponential
-from ratelimit import limits, sleep_and_retry
 from dataclasses import dataclass
 from linkedin_api import Linkedin
 import re
@@ -17,11 +16,37 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 import pandas as pd
 from app.core.config import settings
-from playwright.async_api import async_playwright
+from app.utils.aimd import adaptive_concurrency
+from app.utils.browser_pool import browser_pool
+from app.utils.block_detection import looks_like_captcha
+from app.utils.browsing_profiles import browsing_profiles
+from app.utils.circuit_breaker import CircuitOpenError, circuit_breakers
+from app.utils.extraction_spec import extraction_specs
+from app.utils.html_parser import html_parser
+from app.utils.http_client import http_client
+from app.utils.page_extraction import extract_records
+from app.utils.politeness import scheduler
+from app.utils.response_cache import response_cache
+from app.utils.robots import robots_policy
+from app.utils.token_bucket import TokenBucketLimiter, parse_rate_limits
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Where Google and LinkedIn send a client they have stopped serving
+BLOCKED_PAGE_MARKERS = ("/sorry/", "/checkpoint/challenge", "/authwall")
+
+# The LinkedIn API client is used one profile at a time; its window sets the pause
+linkedin_window = adaptive_concurrency.window("linkedin")
+
+rate_limiter = TokenBucketLimiter(
+    source_rate_per_minute=settings.SCRAPER_RATE_PER_MINUTE,
+    source_burst=settings.SCRAPER_RATE_BURST,
+    host_rate_per_minute=settings.SCRAPER_HOST_RATE_PER_MINUTE,
+    host_burst=settings.SCRAPER_HOST_RATE_BURST,
+    source_limits=parse_rate_limits(settings.SCRAPER_SOURCE_RATE_LIMITS)
+)
+
 @dataclass
 class Lead:
     """Data class for property management leads."""
@@ -45,6 +70,7 @@ class WebScraper:
         """Initialize the web scraper with necessary configurations."""
         self.user_agent = UserAgent()
         self.session = None
+        self.headers = {}
         self.rate_limit = 100
         self.max_retries = 5
         self.linkedin_api = None
@@ -99,17 +125,14 @@ class WebScraper:
                 raise
 
     async def __aenter__(self):
-        """Set up async context."""
-        self.session = aiohttp.ClientSession(
-            headers={'User-Agent': self.user_agent.random},
-            timeout=aiohttp.ClientTimeout(total=30)
-        )
+        """Set up async context by borrowing the shared HTTP session."""
+        self.session = await http_client.get_session()
+        self.headers = {'User-Agent': self.user_agent.random}
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Clean up async context."""
-        if self.session:
-            await self.session.close()
+        """Clean up async context. The shared HTTP session stays open."""
+        self.session = None
         if self.driver:
             self.driver.quit()
             self.driver = None
@@ -205,14 +228,48 @@ class WebScraper:
         return min(score, 1.0)  # Cap at 1.0
 
     @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=4, max=10))
-    @sleep_and_retry
-    @limits(calls=100, period=60)
-    async def fetch_page(self, url: str) -> str:
-        """Fetch webpage content with improved rate limiting and retries."""
+    async def fetch_page(self, url: str, source: str = "web") -> str:
+        """
+        Fetch webpage content through the response cache, with rate limiting and retries.
+        Tokens are taken inside the retried body, so every attempt that reaches the
+        network is rate limited; cache hits cost nothing. Pages robots.txt disallows
+        come back empty without being requested. Network requests also hold a slot
+        in the source's adaptive concurrency window and report how they went.
+        """
+        if not await robots_policy.allowed(self.session, url, headers=self.headers):
+            return ""
+
+        started = None
+
+        async def before_request():
+            nonlocal started
+            await rate_limiter.acquire(url, source)
+            await scheduler.wait(url)
+            started = await adaptive_concurrency.acquire(source)
+
         try:
-            async with self.session.get(url) as response:
-                response.raise_for_status()
-                return await response.text()
+            try:
+                response = await response_cache.fetch(
+                    self.session, url, source, before_request=before_request, headers=self.headers
+                )
+            except BaseException as e:
+                # Free the slot on any failure, cancellation included
+                if started is not None:
+                    failed = isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError))
+                    await adaptive_concurrency.release(source, started, error=failed)
+                raise
+            if started is not None:
+                await adaptive_concurrency.release(
+                    source,
+                    started,
+                    status=response.status,
+                    captcha=looks_like_captcha(response.text),
+                    retry_after=response.retry_after
+                )
+            if response.status >= 400:
+                raise Exception(f"HTTP {response.status}")
+            # Skipped (non-HTML) responses come back empty and are not retried
+            return response.text
         except Exception as e:
             logger.error(f"Error fetching page {url}: {str(e)}")
             raise
@@ -225,8 +282,7 @@ class WebScraper:
 
     async def close(self):
         """Clean up resources."""
-        if self.session:
-            await self.session.close()
+        self.session = None
         if self.driver:
             self.driver.quit()
             self.driver = None
@@ -253,7 +309,13 @@ class WebScraper:
                 if not self._is_quality_property_manager(result):
                     continue
                     
-                profile = self.linkedin_api.get_profile(result['public_id'])
+                started = time.monotonic()
+                try:
+                    profile = self.linkedin_api.get_profile(result['public_id'])
+                except Exception:
+                    linkedin_window.record(error=True)
+                    raise
+                linkedin_window.record(latency=time.monotonic() - started)
                 
                 # Extract years of experience
                 experience_years = self._calculate_experience_years(profile.get('experience', []))
@@ -278,7 +340,8 @@ class WebScraper:
                 if len(leads) >= limit:
                     break
                     
-                await asyncio.sleep(1)  # Respect rate limits
+                # Pause between profiles; shorter while LinkedIn answers quickly
+                await asyncio.sleep(linkedin_window.pace(settings.SCRAPER_PACE_DELAY))
                 
         except Exception as e:
             logger.error(f"error scraping linkedin: {str(e)}")
@@ -376,164 +439,158 @@ class WebScraper:
 
 class WebScraperService:
     def __init__(self):
-        self.browser = None
-        self.context = None
+        self.browser_pool = browser_pool
+        self.browsing_profiles = browsing_profiles
     
     async def setup(self):
-        """Initialize the browser."""
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(headless=True)
-        self.context = await self.browser.new_context()
+        """Make sure the shared browser pool is running."""
+        await self.browser_pool.start()
 
     async def close(self):
-        """Clean up resources."""
-        if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
+        """Release resources. The shared browser pool stays warm for the next run."""
+        pass
 
     async def find_property_managers(self, 
                                    location: str, 
                                    properties_range: str,
                                    max_leads: int = 25) -> List[Dict]:
-        """Find property managers based on criteria."""
-        if not self.browser:
-            await self.setup()
+        """
+        Find property managers based on criteria.
+        Every query runs against Google and LinkedIn concurrently. Outstanding
+        searches are cancelled as soon as enough unique leads have passed the
+        properties filter. Sources whose circuit breaker is open are skipped.
+        """
+        await self.setup()
 
-        leads = []
         search_queries = [
             f"property manager {location}",
             f"residential property management company {location}",
             f"apartment property manager {location}"
         ]
+        searches = []
+        for source, search in (("google", self._search_google), ("linkedin", self._search_linkedin)):
+            if circuit_breakers.get(source).available:
+                searches.append(search)
+            else:
+                logger.info(f"Skipping {source}: its circuit breaker is open")
+        tasks = [
+            asyncio.create_task(search(query))
+            for query in search_queries
+            for search in searches
+        ]
 
-        for query in search_queries:
-            if len(leads) >= max_leads:
-                break
-
-            # Search Google
-            google_results = await self._search_google(query)
-            
-            # Search LinkedIn
-            linkedin_results = await self._search_linkedin(query)
-            
-            # Combine and deduplicate results
-            all_results = google_results + linkedin_results
-            unique_results = self._deduplicate_leads(all_results)
-            
-            # Filter by properties range
-            filtered_results = self._filter_by_properties(unique_results, properties_range)
-            
-            leads.extend(filtered_results)
-            
-            # Respect rate limits
-            await asyncio.sleep(2)
+        results: Dict[int, List[Dict]] = {}
+        seen = set()
+        try:
+            pending = set(tasks)
+            while pending and len(seen) < max_leads:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    filtered = self._filter_by_properties(task.result(), properties_range)
+                    results[tasks.index(task)] = filtered
+                    seen.update(self._lead_key(lead) for lead in filtered)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Trim to max_leads
-        return leads[:max_leads]
+        # Deduplicate across all queries in query/source order, then trim to max_leads
+        leads = [lead for index in sorted(results) for lead in results[index]]
+        return self._deduplicate_leads(leads)[:max_leads]
 
     async def _search_google(self, query: str) -> List[Dict]:
         """Search Google for property management companies."""
-        page = await self.context.new_page()
         results = []
         
         try:
-            # Search Google
-            await page.goto(f'https://www.google.com/search?q={query}')
-            await page.wait_for_load_state('networkidle')
+            search_url = f'https://www.google.com/search?q={query}'
+            await scheduler.wait(search_url)
+            profile = self.browsing_profiles["google"]
+            async with self.browser_pool.page(profile) as page, circuit_breakers.get("google").call():
+                # Search Google
+                await profile.goto(page, search_url)
+                
+                # Extract business listings in the page, or take its HTML to parse here
+                records, content = await self._extract_page(page, "google")
+                self._raise_if_blocked(page, content)
             
-            # Extract business listings and organic results
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
+            if records is None:
+                records = extraction_specs.get("google").extract(html_parser.parse(content))
             
             # Process Google Business listings
-            business_results = soup.find_all('div', class_='VkpGBb')
-            for result in business_results:
-                name = result.find('div', class_='dbg0pd')
-                if name:
-                    name = name.text.strip()
-                    website = self._extract_website(result)
-                    phone = self._extract_phone(result)
-                    
-                    results.append({
-                        'name': name,
-                        'company': name,
-                        'source': 'google',
-                        'website': website,
-                        'phone': phone,
-                        'location': self._extract_location(result)
-                    })
+            for record in records:
+                results.append({
+                    'name': record['name'],
+                    'company': record['name'],
+                    'source': 'google',
+                    'website': record.get('website'),
+                    'phone': record.get('phone'),
+                    'location': record.get('location')
+                })
             
+        except CircuitOpenError as e:
+            logger.info(f"Skipping Google search: {str(e)}")
         except Exception as e:
             logger.error(f"Error in Google search: {str(e)}")
-        finally:
-            await page.close()
         
         return results
 
     async def _search_linkedin(self, query: str) -> List[Dict]:
         """Search LinkedIn for property managers."""
-        page = await self.context.new_page()
         results = []
         
         try:
-            # Search LinkedIn
-            await page.goto('https://www.linkedin.com/search/results/people/')
-            await page.fill('input[aria-label="Search"]', query)
-            await page.press('input[aria-label="Search"]', 'Enter')
-            await page.wait_for_load_state('networkidle')
+            search_url = 'https://www.linkedin.com/search/results/people/'
+            await scheduler.wait(search_url)
+            profile = self.browsing_profiles["linkedin"]
+            async with self.browser_pool.page(profile) as page, circuit_breakers.get("linkedin").call():
+                # Search LinkedIn
+                await page.goto(search_url, wait_until='domcontentloaded')
+                self._raise_if_blocked(page)
+                await page.fill('input[aria-label="Search"]', query)
+                await page.press('input[aria-label="Search"]', 'Enter')
+                await profile.wait_until_ready(page)
+                
+                # Extract profiles
+                records, content = await self._extract_page(page, "linkedin")
+                self._raise_if_blocked(page, content)
             
-            # Extract profiles
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
+            if records is None:
+                records = extraction_specs.get("linkedin").extract(html_parser.parse(content))
             
-            profiles = soup.find_all('li', class_='reusable-search__result-container')
-            for profile in profiles:
-                name = profile.find('span', class_='actor-name')
-                title = profile.find('div', class_='entity-result__primary-subtitle')
-                
-                if name and title:
-                    results.append({
-                        'name': name.text.strip(),
-                        'title': title.text.strip(),
-                        'source': 'linkedin',
-                        'linkedin_url': self._extract_linkedin_url(profile),
-                        'company': self._extract_company(profile)
-                    })
+            for record in records:
+                results.append({
+                    'name': record['name'],
+                    'title': record['title'],
+                    'source': 'linkedin',
+                    'linkedin_url': record.get('linkedin_url'),
+                    'company': record.get('company')
+                })
                     
+        except CircuitOpenError as e:
+            logger.info(f"Skipping LinkedIn search: {str(e)}")
         except Exception as e:
             logger.error(f"Error in LinkedIn search: {str(e)}")
-        finally:
-            await page.close()
             
         return results
 
-    def _extract_website(self, element) -> Optional[str]:
-        """Extract website URL from Google result."""
-        website_elem = element.find('a', href=True)
-        return website_elem['href'] if website_elem else None
-
-    def _extract_phone(self, element) -> Optional[str]:
-        """Extract phone number from result."""
-        phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        text = element.get_text()
-        match = re.search(phone_pattern, text)
-        return match.group(0) if match else None
-
-    def _extract_location(self, element) -> Optional[str]:
-        """Extract location from result."""
-        location_elem = element.find('div', class_='address')
-        return location_elem.text.strip() if location_elem else None
-
-    def _extract_linkedin_url(self, element) -> Optional[str]:
-        """Extract LinkedIn profile URL."""
-        link = element.find('a', href=True)
-        return link['href'] if link else None
-
-    def _extract_company(self, element) -> Optional[str]:
-        """Extract company name from LinkedIn result."""
-        company_elem = element.find('div', class_='entity-result__secondary-subtitle')
-        return company_elem.text.strip() if company_elem else None
+    def _raise_if_blocked(self, page, content: Optional[str] = None):
+        """Fail the search, counting against the source's breaker, on a challenge page or login wall."""
+        if any(marker in page.url for marker in BLOCKED_PAGE_MARKERS) or looks_like_captcha(content):
+            raise RuntimeError(f"Blocked: landed on {page.url}")
+
+    async def _extract_page(self, page, source: str) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """
+        Return (records, None) when in-page extraction is enabled, otherwise
+        (None, html) for the source's extraction spec to be run on the parsed page.
+        """
+        if settings.BROWSER_IN_PAGE_EXTRACTION:
+            return await extract_records(page, extraction_specs.get(source)), None
+        return None, await page.content()
+
+    def _lead_key(self, lead: Dict) -> str:
+        """Identity of a lead for deduplication."""
+        return f"{lead.get('name', '')}-{lead.get('company', '')}"
 
     def _deduplicate_leads(self, leads: List[Dict]) -> List[Dict]:
         """Remove duplicate leads based on name and company."""
@@ -541,7 +598,7 @@ class WebScraperService:
         unique_leads = []
         
         for lead in leads:
-            key = f"{lead.get('name', '')}-{lead.get('company', '')}"
+            key = self._lead_key(lead)
             if key not in seen:
                 seen.add(key)
                 unique_leads.append(lead)
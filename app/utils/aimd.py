@@ -0,0 +1 @@
+../../backend/app/utils/aimd.py
\ No newline at end of file
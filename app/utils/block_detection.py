@@ -0,0 +1 @@
+../../backend/app/utils/block_detection.py
\ No newline at end of file
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import async_playwright
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PooledContext:
+    """A browser context with one warm page and a count of pages served."""
+
+    def __init__(self, browser, context, page):
+        self.browser = browser
+        self.context = context
+        self.page = page
+        self.pages_served = 0
+
+
+class BrowserPool:
+    """
+    Long-lived Chromium with a bounded pool of warm contexts.
+    Contexts start from the persisted storage_state (cookies, logins) and are
+    recycled after a page budget to keep browser memory in check. Only one
+    live context at a time writes the storage_state back, so contexts closing
+    one after another do not overwrite each other's session.
+    """
+
+    def __init__(
+        self,
+        max_contexts: int,
+        pages_per_context: int,
+        storage_state_path: Optional[str] = None,
+        headless: bool = True
+    ):
+        self.max_contexts = max(1, max_contexts)
+        self.pages_per_context = max(1, pages_per_context)
+        self.storage_state_path = storage_state_path
+        self.headless = headless
+        self.playwright = None
+        self.browser = None
+        self._idle: List[PooledContext] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._state_owner: Optional[PooledContext] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._in_use = 0
+        self._pages_served = 0
+        self._contexts_created = 0
+        self._contexts_recycled = 0
+
+    async def start(self):
+        """Launch the browser. Called from application startup and lazily on first use."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.browser and self.browser.is_connected():
+                return
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+            # Idle contexts belonged to the previous browser. Leased ones are
+            # dropped when they come back, and keep holding their slot until
+            # then, so the semaphore is created once and never replaced.
+            self._idle = []
+            self._state_owner = None
+            if self._slots is None:
+                self._slots = asyncio.Semaphore(self.max_contexts)
+            logger.info("Browser pool started")
+
+    async def close(self):
+        """Save the session state and shut the browser and driver down."""
+        for pooled in self._idle:
+            await self._close_context(pooled)
+        self._idle = []
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        logger.info("Browser pool closed")
+
+    async def _new_context(self) -> PooledContext:
+        storage_state = None
+        if self.storage_state_path and os.path.exists(self.storage_state_path):
+            storage_state = self.storage_state_path
+        context = await self.browser.new_context(storage_state=storage_state)
+        page = await context.new_page()
+        self._contexts_created += 1
+        pooled = PooledContext(self.browser, context, page)
+        if self._state_owner is None:
+            self._state_owner = pooled
+        return pooled
+
+    async def _close_context(self, pooled: PooledContext):
+        """Close the context; the context that owns the session state persists it first."""
+        owner = pooled is self._state_owner
+        if owner:
+            self._state_owner = None
+        try:
+            if owner and self.storage_state_path:
+                os.makedirs(os.path.dirname(self.storage_state_path) or ".", exist_ok=True)
+                await pooled.context.storage_state(path=self.storage_state_path)
+            await pooled.context.close()
+        except Exception as e:
+            logger.warning(f"Error closing browser context: {str(e)}")
+
+    @asynccontextmanager
+    async def page(self, profile=None):
+        """
+        Lease a warm page. At most max_contexts pages are leased at once; the
+        context goes back to the pool afterwards unless its page budget is spent.
+        A lean browsing profile's request interception is active for the lease only.
+        """
+        if not (self.browser and self.browser.is_connected()):
+            await self.start()
+        async with self._slots:
+            pooled = self._idle.pop() if self._idle else await self._new_context()
+            self._in_use += 1
+            intercepting = profile is not None and profile.lean
+            try:
+                if intercepting:
+                    await pooled.page.route("**/*", profile.handle_route)
+                yield pooled.page
+            finally:
+                self._in_use -= 1
+                if intercepting and not pooled.page.is_closed():
+                    try:
+                        await pooled.page.unroute("**/*", profile.handle_route)
+                    except Exception as e:
+                        logger.warning(f"Error removing request interception: {str(e)}")
+                pooled.pages_served += 1
+                self._pages_served += 1
+                reusable = pooled.browser is self.browser and not pooled.page.is_closed()
+                if reusable and pooled.pages_served < self.pages_per_context:
+                    self._idle.append(pooled)
+                else:
+                    self._contexts_recycled += 1
+                    await self._close_context(pooled)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, utilization and recycling counters."""
+        return {
+            "running": bool(self.browser and self.browser.is_connected()),
+            "max_contexts": self.max_contexts,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "utilization": self._in_use / self.max_contexts,
+            "pages_served": self._pages_served,
+            "contexts_created": self._contexts_created,
+            "contexts_recycled": self._contexts_recycled,
+        }
+
+
+browser_pool = BrowserPool(
+    max_contexts=settings.BROWSER_POOL_SIZE,
+    pages_per_context=settings.BROWSER_PAGES_PER_CONTEXT,
+    storage_state_path=settings.BROWSER_STORAGE_STATE,
+    headless=settings.BROWSER_HEADLESS
+)
@@ -0,0 +1,98 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Analytics, ad and tag-manager hosts that never carry content we parse
+TRACKER_DOMAINS: Tuple[str, ...] = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "scorecardresearch.com",
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+)
+
+
+@dataclass
+class BrowsingProfile:
+    """How a source is browsed: which requests to drop and when a page is ready."""
+    wait_selector: Optional[str] = None
+    blocked_resource_types: FrozenSet[str] = frozenset()
+    blocked_domains: Tuple[str, ...] = ()
+    timeout_ms: int = 10000
+    blocked_requests: int = field(default=0, compare=False)
+
+    @property
+    def lean(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_domains)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.blocked_resource_types:
+            return True
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == domain or host.endswith("." + domain) for domain in self.blocked_domains)
+
+    async def handle_route(self, route):
+        """Playwright route handler: abort blocked requests, let the rest through."""
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def goto(self, page, url: str):
+        """Navigate without waiting for subresources, then wait until the page is ready."""
+        await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout_ms)
+        await self.wait_until_ready(page)
+
+    async def wait_until_ready(self, page):
+        """Wait for the target selector, or for network idle when the source has none."""
+        if self.wait_selector:
+            await page.wait_for_selector(self.wait_selector, state="attached", timeout=self.timeout_ms)
+        else:
+            await page.wait_for_load_state("networkidle", timeout=self.timeout_ms)
+
+
+def lean_profile(wait_selector: Optional[str]) -> BrowsingProfile:
+    """A profile that blocks the configured resource types and known trackers."""
+    blocked_types = frozenset(
+        resource_type.strip()
+        for resource_type in settings.BROWSER_BLOCKED_RESOURCE_TYPES.split(',')
+        if resource_type.strip()
+    )
+    return BrowsingProfile(
+        wait_selector=wait_selector,
+        blocked_resource_types=blocked_types,
+        blocked_domains=TRACKER_DOMAINS,
+        timeout_ms=settings.BROWSER_NAVIGATION_TIMEOUT_MS
+    )
+
+
+def build_profiles() -> Dict[str, BrowsingProfile]:
+    """Per-source profiles; sources missing from BROWSER_LEAN_SOURCES browse normally."""
+    selectors = {
+        "google": "#search, #rso, div.VkpGBb",
+        "linkedin": "li.reusable-search__result-container, .search-results-container",
+    }
+    lean_sources = {source.strip() for source in settings.BROWSER_LEAN_SOURCES.split(',')}
+    return {
+        source: (
+            lean_profile(selector)
+            if source in lean_sources
+            else BrowsingProfile(wait_selector=selector, timeout_ms=settings.BROWSER_NAVIGATION_TIMEOUT_MS)
+        )
+        for source, selector in selectors.items()
+    }
+
+
+browsing_profiles = build_profiles()
@@ -0,0 +1 @@
+../../backend/app/utils/circuit_breaker.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../backend/app/utils/concurrency.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../backend/app/utils/extraction_spec.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../backend/app/utils/html_parser.py
\ No newline at end of file
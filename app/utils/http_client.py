@@ -0,0 +1 @@
+../../backend/app/utils/http_client.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../backend/app/utils/page_download.py
\ No newline at end of file
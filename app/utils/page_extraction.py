@@ -0,0 +1,37 @@
+from typing import Any, Dict, List
+
+from app.utils.extraction_spec import RecordExtractor
+
+# Runs inside the page: one compact record per container element.
+# A field reads the text (or an attribute) of its selector's first match within
+# the container, or of the container itself when no selector is given, and can
+# narrow the value to the first match of a regex pattern.
+EXTRACT_RECORDS_JS = """
+(containers, fields) => containers.map(container => {
+    const record = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        const node = spec.selector ? container.querySelector(spec.selector) : container;
+        let value = null;
+        if (node) {
+            value = spec.attribute ? node.getAttribute(spec.attribute) : node.textContent.trim();
+        }
+        if (value && spec.pattern) {
+            const match = value.match(new RegExp(spec.pattern));
+            value = match ? match[0] : null;
+        }
+        record[name] = value;
+    }
+    return record;
+})
+"""
+
+
+async def extract_records(page, extractor: RecordExtractor) -> List[Dict[str, Any]]:
+    """
+    Run an extraction spec's selectors inside the page and return only the
+    extracted fields, post-processed and with incomplete records dropped.
+    """
+    raw_records = await page.eval_on_selector_all(
+        extractor.container or ":root", EXTRACT_RECORDS_JS, extractor.js_fields()
+    )
+    return extractor.finish(raw_records, page.url)
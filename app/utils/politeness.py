@@ -0,0 +1 @@
+../../backend/app/utils/politeness.py
\ No newline at end of file
@@ -0,0 +1 @@
+../../backend/app/utils/response_cache.py
\ No newline at end of file
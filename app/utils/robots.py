@@ -0,0 +1 @@
+../../backend/app/utils/robots.py
\ No newline at end of file
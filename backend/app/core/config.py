@@ -27,6 +27,98 @@ class Settings(BaseSettings):
 
     # Proxy Settings
     PROXY_LIST: Optional[str] = os.getenv("PROXY_LIST", None)
+    # Proxies rotate per request; blocked or failing proxies cool down (seconds)
+    PROXY_FAILURE_THRESHOLD: int = int(os.getenv("PROXY_FAILURE_THRESHOLD", "3"))
+    PROXY_COOLDOWN: float = float(os.getenv("PROXY_COOLDOWN", "60"))
+    PROXY_BAN_COOLDOWN: float = float(os.getenv("PROXY_BAN_COOLDOWN", "600"))
+    PROXY_MAX_COOLDOWN: float = float(os.getenv("PROXY_MAX_COOLDOWN", "3600"))
+
+    # Scraper Concurrency
+    SCRAPER_MAX_CONCURRENCY: int = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "10"))
+    SCRAPER_MAX_PER_HOST: int = int(os.getenv("SCRAPER_MAX_PER_HOST", "2"))
+    # Result pages fetched ahead of the page being parsed
+    SCRAPER_PREFETCH_PAGES: int = int(os.getenv("SCRAPER_PREFETCH_PAGES", "2"))
+
+    # Scraper Politeness (seconds between requests to the same host)
+    SCRAPER_MIN_DELAY: float = float(os.getenv("SCRAPER_MIN_DELAY", "2"))
+    SCRAPER_MAX_DELAY: float = float(os.getenv("SCRAPER_MAX_DELAY", "5"))
+    SCRAPER_CRAWL_DELAYS: Optional[str] = os.getenv("SCRAPER_CRAWL_DELAYS", None)
+
+    # robots.txt (fetched once per site, cached in memory and on disk)
+    ROBOTS_ENABLED: bool = os.getenv("ROBOTS_ENABLED", "True").lower() == "true"
+    ROBOTS_CACHE_DIR: str = os.getenv("ROBOTS_CACHE_DIR", ".cache/robots")
+    ROBOTS_CACHE_TTL: int = int(os.getenv("ROBOTS_CACHE_TTL", "86400"))
+    ROBOTS_ERROR_TTL: int = int(os.getenv("ROBOTS_ERROR_TTL", "600"))
+    ROBOTS_USER_AGENT: str = os.getenv("ROBOTS_USER_AGENT", "*")
+    ROBOTS_MAX_CRAWL_DELAY: float = float(os.getenv("ROBOTS_MAX_CRAWL_DELAY", "30"))
+
+    # Adaptive Concurrency (AIMD window per source; SCRAPER_AIMD_SOURCE_MAX="google=4,linkedin=4")
+    SCRAPER_AIMD_INITIAL: float = float(os.getenv("SCRAPER_AIMD_INITIAL", "2"))
+    SCRAPER_AIMD_MIN: float = float(os.getenv("SCRAPER_AIMD_MIN", "1"))
+    SCRAPER_AIMD_MAX: float = float(os.getenv("SCRAPER_AIMD_MAX", "16"))
+    SCRAPER_AIMD_INCREASE: float = float(os.getenv("SCRAPER_AIMD_INCREASE", "1"))
+    SCRAPER_AIMD_DECREASE: float = float(os.getenv("SCRAPER_AIMD_DECREASE", "0.5"))
+    SCRAPER_AIMD_LATENCY_TARGET: float = float(os.getenv("SCRAPER_AIMD_LATENCY_TARGET", "5"))
+    SCRAPER_AIMD_MAX_RETRY_AFTER: float = float(os.getenv("SCRAPER_AIMD_MAX_RETRY_AFTER", "300"))
+    SCRAPER_AIMD_SOURCE_MAX: Optional[str] = os.getenv("SCRAPER_AIMD_SOURCE_MAX", "google=4,linkedin=4")
+    # Pause between pages of sequential crawls at the smallest window (seconds)
+    SCRAPER_PACE_DELAY: float = float(os.getenv("SCRAPER_PACE_DELAY", "4"))
+
+    # Circuit Breakers (per source; trip on error rate or slow calls over the last CIRCUIT_WINDOW calls)
+    CIRCUIT_WINDOW: int = int(os.getenv("CIRCUIT_WINDOW", "20"))
+    CIRCUIT_MIN_CALLS: int = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+    CIRCUIT_ERROR_RATE: float = float(os.getenv("CIRCUIT_ERROR_RATE", "0.5"))
+    CIRCUIT_SLOW_CALL_SECONDS: float = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "30"))
+    CIRCUIT_SLOW_RATE: float = float(os.getenv("CIRCUIT_SLOW_RATE", "0.5"))
+    CIRCUIT_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_OPEN_SECONDS", "60"))
+    CIRCUIT_MAX_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_MAX_OPEN_SECONDS", "900"))
+
+    # Extraction Specs (JSON file of per-source specs overriding the built-in ones; re-read when it changes)
+    SCRAPER_EXTRACTION_SPECS_FILE: Optional[str] = os.getenv("SCRAPER_EXTRACTION_SPECS_FILE", None)
+    SCRAPER_EXTRACTION_SPECS_CHECK_INTERVAL: float = float(os.getenv("SCRAPER_EXTRACTION_SPECS_CHECK_INTERVAL", "5"))
+
+    # Scraper Response Cache (SCRAPER_CACHE_SOURCE_TTLS="google=3600,web=86400")
+    SCRAPER_CACHE_DIR: str = os.getenv("SCRAPER_CACHE_DIR", ".cache/http")
+    SCRAPER_CACHE_MAX_BYTES: int = int(os.getenv("SCRAPER_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+    SCRAPER_CACHE_TTL: int = int(os.getenv("SCRAPER_CACHE_TTL", "3600"))
+    SCRAPER_CACHE_SOURCE_TTLS: Optional[str] = os.getenv("SCRAPER_CACHE_SOURCE_TTLS", None)
+
+    # Crawl Frontier (SCRAPER_FRONTIER_TTL=0 only de-duplicates within a job)
+    SCRAPER_FRONTIER_TTL: int = int(os.getenv("SCRAPER_FRONTIER_TTL", "0"))
+    SCRAPER_FRONTIER_FILE: str = os.getenv("SCRAPER_FRONTIER_FILE", ".cache/frontier.bloom")
+    SCRAPER_FRONTIER_CAPACITY: int = int(os.getenv("SCRAPER_FRONTIER_CAPACITY", "1000000"))
+    SCRAPER_FRONTIER_ERROR_RATE: float = float(os.getenv("SCRAPER_FRONTIER_ERROR_RATE", "0.001"))
+
+    # Page Downloads (bodies are streamed up to SCRAPER_MAX_PAGE_BYTES)
+    SCRAPER_MAX_PAGE_BYTES: int = int(os.getenv("SCRAPER_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+    SCRAPER_DOWNLOAD_CHUNK_BYTES: int = int(os.getenv("SCRAPER_DOWNLOAD_CHUNK_BYTES", str(64 * 1024)))
+    SCRAPER_ALLOWED_CONTENT_TYPES: str = os.getenv(
+        "SCRAPER_ALLOWED_CONTENT_TYPES", "text/html,application/xhtml+xml,text/plain"
+    )
+
+    # Shared HTTP Client Pool
+    HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+    HTTP_DNS_CACHE_TTL: int = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+    HTTP_KEEPALIVE_TIMEOUT: float = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+    # HTML Parsing (auto, lxml, selectolax or html.parser)
+    HTML_PARSER_BACKEND: str = os.getenv("HTML_PARSER_BACKEND", "auto")
+
+    # LinkedIn Driver Pool
+    LINKEDIN_DRIVER_POOL_SIZE: int = int(os.getenv("LINKEDIN_DRIVER_POOL_SIZE", "2"))
+    LINKEDIN_PAGES_PER_DRIVER: int = int(os.getenv("LINKEDIN_PAGES_PER_DRIVER", "100"))
+    LINKEDIN_COOKIE_FILE: str = os.getenv("LINKEDIN_COOKIE_FILE", ".cache/linkedin_cookies.json")
+    LINKEDIN_HEADLESS: bool = os.getenv("LINKEDIN_HEADLESS", "true").lower() == "true"
+
+    # LinkedIn Scrolling (loading waits on the DOM; pauses are pacing only)
+    LINKEDIN_SCROLL_BUDGET: float = float(os.getenv("LINKEDIN_SCROLL_BUDGET", "20"))
+    LINKEDIN_SCROLL_QUIET_MS: int = int(os.getenv("LINKEDIN_SCROLL_QUIET_MS", "750"))
+    LINKEDIN_SCROLL_STABLE_ROUNDS: int = int(os.getenv("LINKEDIN_SCROLL_STABLE_ROUNDS", "2"))
+    LINKEDIN_SCROLL_PAUSES: int = int(os.getenv("LINKEDIN_SCROLL_PAUSES", "1"))
+    LINKEDIN_SCROLL_PAUSE_MIN: float = float(os.getenv("LINKEDIN_SCROLL_PAUSE_MIN", "0.5"))
+    LINKEDIN_SCROLL_PAUSE_MAX: float = float(os.getenv("LINKEDIN_SCROLL_PAUSE_MAX", "1.5"))
 
     # Email Verification
     EMAIL_VERIFICATION_API_KEY: Optional[str] = os.getenv("EMAIL_VERIFICATION_API_KEY", None)
@@ -15,6 +15,17 @@ from .models import models
 from .services import linkedin_scraper, airbnb_scraper, web_scraper
 from .services.ai_service import AIService
 from .utils.rate_limiter import RateLimiter
+from .utils.http_client import http_client
+from .utils.aimd import adaptive_concurrency
+from .utils.circuit_breaker import circuit_breakers
+from .utils.extraction_spec import extraction_specs
+from .utils.driver_pool import driver_pool
+from .utils.frontier import crawl_frontier
+from .utils.page_download import page_downloader
+from .utils.proxy_pool import proxy_pool
+from .utils.response_cache import response_cache
+from .utils.robots import robots_policy
+from .utils.structured_data import structured_data_extractor
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
@@ -55,6 +66,15 @@ rate_limiter = RateLimiter(
 # AI Service
 ai_service = AIService(api_key=settings.OPENAI_API_KEY)
 
+@app.on_event("startup")
+async def startup_event():
+    await http_client.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await http_client.close()
+    await driver_pool.close()
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -145,6 +165,19 @@ async def start_scraping(
             db.add(db_lead)
         db.commit()
 
+    if request.source in ("linkedin", "airbnb", "web"):
+        # A web crawl starts from Google results, so it needs the google breaker too
+        sources = [request.source, "google"] if request.source == "web" else [request.source]
+        for source in sources:
+            breaker = circuit_breakers.get(source)
+            if not breaker.available:
+                # Fail fast instead of queueing a crawl against a source that is blocking us
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"{source} is temporarily unavailable",
+                    headers={"Retry-After": str(max(1, round(breaker.retry_in())))}
+                )
+
     if request.source == "linkedin":
         leads = await linkedin_scraper.scrape_leads(request.parameters)
     elif request.source == "airbnb":
@@ -198,6 +231,24 @@ async def get_stats(
         "leads_by_source": dict(leads_by_source)
     }
 
+@app.get("/scraper/stats")
+async def get_scraper_stats(
+    current_user: models.User = Depends(get_current_user)
+):
+    return {
+        "http_pool": http_client.stats(),
+        "linkedin_drivers": driver_pool.stats(),
+        "response_cache": response_cache.stats(),
+        "downloads": page_downloader.stats(),
+        "frontier": crawl_frontier.stats(),
+        "proxies": proxy_pool.stats(),
+        "robots": robots_policy.stats(),
+        "concurrency": adaptive_concurrency.stats(),
+        "circuit_breakers": circuit_breakers.stats(),
+        "structured_data": structured_data_extractor.stats(),
+        "extraction_specs": extraction_specs.stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
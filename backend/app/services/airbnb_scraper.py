@@ -1,12 +1,22 @@
-import aiohttp
 import asyncio
+import time
+from contextlib import asynccontextmanager
+import aiohttp
 from bs4 import BeautifulSoup
 import logging
-from typing import List, Dict, Any
-import random
-import time
+from typing import List, Dict, Any, Optional, Tuple
 from fake_useragent import UserAgent
 from ..core.config import settings
+from ..utils.aimd import adaptive_concurrency
+from ..utils.block_detection import BAN_STATUSES
+from ..utils.circuit_breaker import circuit_breakers
+from ..utils.concurrency import HostLimiter
+from ..utils.extraction_spec import extraction_specs
+from ..utils.html_parser import html_parser
+from ..utils.http_client import http_client
+from ..utils.pagination import crawl_pages
+from ..utils.politeness import scheduler
+from ..utils.proxy_pool import proxy_pool
 
 logger = logging.getLogger(__name__)
 
@@ -23,67 +33,105 @@ class AirbnbScraper:
         }
 
     async def setup_session(self):
-        """Initialize aiohttp session with proxy if configured."""
-        if settings.PROXY_LIST:
-            proxy = random.choice(settings.PROXY_LIST.split(','))
-            self.session = aiohttp.ClientSession(
-                headers=self.headers,
-                proxy=f"http://{proxy}"
-            )
-        else:
-            self.session = aiohttp.ClientSession(headers=self.headers)
+        """Borrow the shared HTTP session; proxies are picked per request."""
+        self.session = await http_client.get_session()
 
     async def close_session(self):
-        """Close the aiohttp session."""
-        if self.session:
-            await self.session.close()
+        """Release the shared HTTP session; the pool stays open for other jobs."""
+        self.session = None
 
-    def _random_delay(self):
-        """Add random delay between requests."""
-        time.sleep(random.uniform(2, 5))
+    @asynccontextmanager
+    async def _get(self, url: str):
+        """
+        Issue a GET through the shared session with this scraper's headers and a
+        proxy from the pool, under the adaptive concurrency window for Airbnb.
+        The status and time to headers are reported to the pool, the window and the
+        Airbnb circuit breaker, which raises CircuitOpenError while open.
+        """
+        breaker = circuit_breakers.get("airbnb")
+        probe = breaker.acquire()
+        proxy = proxy_pool.acquire()
+        reported = False
+        try:
+            async with adaptive_concurrency.slot("airbnb") as outcome:
+                started = time.monotonic()
+                try:
+                    async with self.session.get(url, headers=self.headers, proxy=proxy) as response:
+                        latency = time.monotonic() - started
+                        proxy_pool.report(proxy, status=response.status, latency=latency)
+                        breaker.record(response.status not in BAN_STATUSES and response.status < 500, latency, probe)
+                        reported = True
+                        outcome.status = response.status
+                        outcome.retry_after = response.headers.get("Retry-After")
+                        yield response
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if not reported:
+                        proxy_pool.report(proxy, error=True)
+                        breaker.record(False, time.monotonic() - started, probe)
+                        reported = True
+                        outcome.error = True
+                    raise
+        finally:
+            if not reported:
+                breaker.cancel(probe)
 
     async def scrape_leads(self, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Scrape property managers from Airbnb based on provided parameters.
+        Listings are parsed in two passes: the first collects every listing and its
+        host URL across all pages, the second fetches each unique host profile once,
+        concurrently under the scraper limits.
         """
         leads = []
+        limiter = HostLimiter(
+            parameters.get("max_concurrency", settings.SCRAPER_MAX_CONCURRENCY),
+            parameters.get("max_per_host", settings.SCRAPER_MAX_PER_HOST)
+        )
+        # Parsed host profiles by URL for this job; None marks a profile that failed.
+        # Kept per call because concurrent jobs share the scraper.
+        host_profiles: Dict[str, Optional[Dict[str, Any]]] = {}
         try:
             await self.setup_session()
             
             # Get initial search results
             search_url = self._construct_search_url(parameters)
-            async with self.session.get(search_url) as response:
+            await scheduler.wait(search_url)
+            async with self._get(search_url) as response:
                 if response.status != 200:
                     raise Exception(f"Failed to fetch search results: {response.status}")
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Get total number of pages
-                total_pages = self._get_total_pages(soup)
-                
-                # Scrape each page
-                for page in range(1, total_pages + 1):
-                    logger.info(f"Scraping page {page} of {total_pages}")
-                    
-                    if page > 1:
-                        page_url = self._construct_search_url(parameters, page)
-                        async with self.session.get(page_url) as page_response:
-                            if page_response.status != 200:
-                                continue
-                            html = await page_response.text()
-                            soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Extract property listings
-                    listings = soup.find_all('div', {'itemprop': 'itemListElement'})
-                    
-                    for listing in listings:
-                        lead = await self._parse_listing(listing)
-                        if lead:
-                            leads.append(lead)
-                    
-                    # Add delay between pages
-                    self._random_delay()
+                html = await response.read()
+                charset = response.charset
+            soup = html_parser.parse(html, charset)
+            
+            # Get total number of pages
+            total_pages = self._get_total_pages(soup)
+            
+            # First pass: collect listings and host URLs from each page,
+            # prefetching the next pages while the current one is parsed
+            logger.info(f"Scraping page 1 of {total_pages}")
+            listings_found = self._parse_search_soup(soup)
+            if listings_found:
+                pages = crawl_pages(
+                    lambda page: self._fetch_search_page(parameters, page),
+                    self._parse_search_page,
+                    total_pages,
+                    window=parameters.get("prefetch_pages", settings.SCRAPER_PREFETCH_PAGES),
+                    first_page=2
+                )
+                async for page, page_listings in pages:
+                    logger.info(f"Scraped page {page} of {total_pages}")
+                    listings_found.extend(page_listings)
+            
+            # Second pass: fetch each unique host profile once
+            host_urls = list(dict.fromkeys(listing["host_url"] for listing in listings_found))
+            logger.info(f"Fetching {len(host_urls)} host profiles for {len(listings_found)} listings")
+            await limiter.map(lambda host_url: self._fetch_host_profile(host_url, host_profiles), host_urls)
+            
+            for listing_data in listings_found:
+                host = host_profiles.get(listing_data["host_url"])
+                if host:
+                    leads.append(self._build_lead(listing_data, host))
             
             return leads
             
@@ -93,6 +141,23 @@ class AirbnbScraper:
         finally:
             await self.close_session()
 
+    async def _fetch_search_page(self, parameters: Dict[str, Any], page: int) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Fetch one search results page as (body, charset), or None to skip a page that could not be loaded."""
+        page_url = self._construct_search_url(parameters, page)
+        await scheduler.wait(page_url)
+        async with self._get(page_url) as response:
+            if response.status != 200:
+                return None
+            return await response.read(), response.charset
+
+    def _parse_search_page(self, page: Tuple[bytes, Optional[str]]) -> List[Dict[str, Any]]:
+        html, charset = page
+        return self._parse_search_soup(html_parser.parse(html, charset))
+
+    def _parse_search_soup(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        """Parse every property listing on a search results page; host details are fetched separately."""
+        return extraction_specs.get("airbnb_listing").extract(soup, base_url=self.base_url)
+
     def _construct_search_url(self, parameters: Dict[str, Any], page: int = 1) -> str:
         """Construct Airbnb search URL."""
         base_url = f"{self.base_url}/s/{parameters.get('location', 'United-States')}/homes"
@@ -132,86 +197,56 @@ class AirbnbScraper:
         except:
             return 1
 
-    async def _parse_listing(self, listing) -> Dict[str, Any]:
-        """Parse individual listing into lead data."""
+    async def _fetch_host_profile(
+        self,
+        host_url: str,
+        host_profiles: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch and parse a host profile once; the result is memoized by URL in host_profiles."""
+        if host_url in host_profiles:
+            return host_profiles[host_url]
+        
+        host = None
         try:
-            # Get listing details
-            title = listing.find('meta', {'itemprop': 'name'})['content']
-            price = listing.find('span', {'class': '_tyxjp1'}).text
-            rating = listing.find('span', {'class': 'r1g2bVn'}).text
-            
-            # Get host information
-            host_link = listing.find('a', {'class': '_1n81at5'})
-            if not host_link:
-                return None
-                
-            host_url = f"{self.base_url}{host_link['href']}"
-            
-            # Fetch host profile
-            async with self.session.get(host_url) as response:
-                if response.status != 200:
-                    return None
+            await scheduler.wait(host_url)
+            async with self._get(host_url) as response:
+                if response.status == 200:
+                    host_html = await response.read()
+                    host_soup = html_parser.parse(host_html, response.charset)
+                    host = extraction_specs.get("airbnb_host").extract_one(host_soup)
                     
-                host_html = await response.text()
-                host_soup = BeautifulSoup(host_html, 'html.parser')
-                
-                host_name = host_soup.find('h1', {'class': '_1n81at5'}).text
-                host_location = host_soup.find('div', {'class': '_1n81at5'}).text
-                
-                # Get host's other listings
-                listings_count = host_soup.find('div', {'class': '_1n81at5'}).text
-                listings_count = int(''.join(filter(str.isdigit, listings_count)))
-                
-                return {
-                    "name": host_name,
-                    "title": "Property Manager",
-                    "company": f"Airbnb Host ({listings_count} properties)",
-                    "location": host_location,
-                    "source": "airbnb",
-                    "property_count": listings_count,
-                    "average_rating": float(rating.split()[0]),
-                    "profile_url": host_url
-                }
-                
         except Exception as e:
-            logger.error(f"Error parsing listing: {str(e)}")
-            return None
+            logger.error(f"Error fetching host profile: {str(e)}")
+        
+        host_profiles[host_url] = host
+        return host
+
+    def _build_lead(self, listing_data: Dict[str, Any], host: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine a listing with its host profile into lead data."""
+        return {
+            "name": host["name"],
+            "title": "Property Manager",
+            "company": f"Airbnb Host ({host['property_count']} properties)",
+            "location": host["location"],
+            "source": "airbnb",
+            "property_count": host["property_count"],
+            "average_rating": listing_data["average_rating"],
+            "profile_url": listing_data["host_url"]
+        }
 
     async def get_host_details(self, host_url: str) -> Dict[str, Any]:
         """Get detailed information about a host."""
         try:
-            async with self.session.get(host_url) as response:
+            await scheduler.wait(host_url)
+            async with self._get(host_url) as response:
                 if response.status != 200:
                     return None
                     
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extract host details
-                name = soup.find('h1', {'class': '_1n81at5'}).text
-                location = soup.find('div', {'class': '_1n81at5'}).text
-                response_rate = soup.find('div', {'class': '_1n81at5'}).text
-                response_time = soup.find('div', {'class': '_1n81at5'}).text
-                
-                # Get all listings
-                listings = []
-                listings_section = soup.find('div', {'class': '_1n81at5'})
-                if listings_section:
-                    for listing in listings_section.find_all('div', {'class': '_1n81at5'}):
-                        listing_data = {
-                            "title": listing.find('div', {'class': '_1n81at5'}).text,
-                            "price": listing.find('span', {'class': '_tyxjp1'}).text,
-                            "rating": listing.find('span', {'class': 'r1g2bVn'}).text
-                        }
-                        listings.append(listing_data)
+                html = await response.read()
+                soup = html_parser.parse(html, response.charset)
                 
-                return {
-                    "name": name,
-                    "location": location,
-                    "response_rate": response_rate,
-                    "response_time": response_time,
-                    "listings": listings
-                }
+                # Host details and listings as the airbnb_host_details spec describes them
+                return extraction_specs.get("airbnb_host_details").extract_one(soup)
                 
         except Exception as e:
             logger.error(f"Error getting host details: {str(e)}")
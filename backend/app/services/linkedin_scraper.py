@@ -3,66 +3,148 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selenium.webdriver.chrome.service import Service
+import asyncio
+import threading
 import time
 import random
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ..core.config import settings
+from ..utils.aimd import adaptive_concurrency
+from ..utils.circuit_breaker import circuit_breakers
+from ..utils.driver_pool import PooledDriver, chromedriver_path, driver_pool
+from ..utils.extraction_spec import extraction_specs
+from ..utils.html_parser import html_parser
+from ..utils.pagination import crawl_pages
+from ..utils.proxy_pool import proxy_pool
 import os
 
 logger = logging.getLogger(__name__)
 
+# Redirects LinkedIn uses for security challenges and blocked sessions
+LINKEDIN_BLOCK_MARKERS = ("/checkpoint/challenge", "/authwall")
+
+# One browser loads pages one at a time; the window sets the pause between them
+linkedin_window = adaptive_concurrency.window("linkedin")
+linkedin_breaker = circuit_breakers.get("linkedin")
+
+# Jumps to the bottom of the page, then reports once the DOM has been quiet for
+# quiet_ms (or timeout_ms has passed) how many results and how much page there is.
+SCROLL_AND_SETTLE_JS = """
+const [selector, quietMs, timeoutMs, done] = arguments;
+let finished = false;
+let quietTimer = null;
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, quietMs);
+});
+const capTimer = setTimeout(finish, timeoutMs);
+function finish() {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(capTimer);
+    done({count: document.querySelectorAll(selector).length, height: document.body.scrollHeight});
+}
+observer.observe(document.body, {childList: true, subtree: true});
+window.scrollTo(0, document.body.scrollHeight);
+quietTimer = setTimeout(finish, quietMs);
+"""
+
+class LinkedInCrawl:
+    """
+    State of one scrape_leads call. The scraper is shared by concurrent jobs,
+    so each job keeps its leased driver, the lock its page loads take, the
+    page whose turn it is to load and its done flag here.
+    Prefetched pages load in worker threads that may reach the driver in any
+    order, and a page reads whatever the driver shows, so each waits its turn.
+    """
+
+    def __init__(self, lease: PooledDriver, first_page: int = 1):
+        self.lease = lease
+        self.driver = lease.driver
+        self.lock = threading.Lock()
+        self.turn = threading.Condition()
+        self.next_page = first_page
+        self.done = False
+
+    def wait_turn(self, page: int) -> bool:
+        """Block until the pages before page have loaded; False once the crawl is over."""
+        with self.turn:
+            self.turn.wait_for(lambda: self.done or self.next_page == page)
+            return not self.done
+
+    def end_turn(self, page: int):
+        """Hand the driver to the page after page."""
+        with self.turn:
+            self.next_page = page + 1
+            self.turn.notify_all()
+
+    def finish(self):
+        """Mark the crawl over and release the pages still waiting for their turn."""
+        with self.turn:
+            self.done = True
+            self.turn.notify_all()
+
+    def wait_idle(self):
+        """Block until an in-flight page load has finished with the driver."""
+        with self.lock:
+            pass
+
+
 class LinkedInScraper:
     def __init__(self):
         self.username = settings.LINKEDIN_USERNAME
         self.password = settings.LINKEDIN_PASSWORD
-        self.driver = None
-        self.setup_driver()
+        self.pool = driver_pool
 
     def setup_driver(self):
-        """Initialize the Chrome WebDriver with appropriate options."""
+        """Create a Chrome WebDriver with appropriate options. Used by the driver pool."""
         options = webdriver.ChromeOptions()
-        options.add_argument('--headless')  # Run in headless mode
+        if settings.LINKEDIN_HEADLESS:
+            options.add_argument('--headless')  # Run in headless mode
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
         options.add_argument('--window-size=1920,1080')
         
-        # Add proxy if configured
-        if settings.PROXY_LIST:
-            proxy = random.choice(settings.PROXY_LIST.split(','))
+        # A browser keeps one proxy for its lifetime; each new driver gets a fresh pick
+        proxy = proxy_pool.acquire()
+        if proxy:
             options.add_argument(f'--proxy-server={proxy}')
 
-        self.driver = webdriver.Chrome(ChromeDriverManager().install(), options=options)
+        driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+        driver.proxy_url = proxy
+        return driver
 
-    async def login(self):
-        """Log in to LinkedIn Sales Navigator."""
+    def login(self, driver) -> bool:
+        """Log in to LinkedIn Sales Navigator. Blocks on Selenium; run it in a worker thread."""
         try:
-            self.driver.get("https://www.linkedin.com/sales/login")
+            driver.get("https://www.linkedin.com/sales/login")
             
             # Wait for iframe and switch to it
-            iframe = WebDriverWait(self.driver, 10).until(
+            iframe = WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "iframe"))
             )
-            self.driver.switch_to.frame(iframe)
+            driver.switch_to.frame(iframe)
             
             # Enter credentials
-            username_field = WebDriverWait(self.driver, 10).until(
+            username_field = WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.ID, "username"))
             )
             username_field.send_keys(self.username)
             
-            password_field = self.driver.find_element(By.ID, "password")
+            password_field = driver.find_element(By.ID, "password")
             password_field.send_keys(self.password)
             
             # Click login button
-            login_button = self.driver.find_element(By.CLASS_NAME, "login__form_action_container")
+            login_button = driver.find_element(By.CLASS_NAME, "login__form_action_container")
             login_button.click()
             
             # Wait for login to complete
-            WebDriverWait(self.driver, 10).until(
+            WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "search-results__pagination"))
             )
             
@@ -71,71 +153,184 @@ class LinkedInScraper:
             logger.error(f"Login failed: {str(e)}")
             return False
 
+    def _ensure_logged_in(self, crawl: LinkedInCrawl) -> bool:
+        """Reuse the driver's session, then saved cookies, and only log in as a last resort."""
+        if crawl.lease.logged_in:
+            return True
+        if self.pool.restore_cookies(crawl.driver, "https://www.linkedin.com") and self._session_active(crawl):
+            crawl.lease.logged_in = True
+            return True
+        if self.login(crawl.driver):
+            self.pool.save_cookies(crawl.driver)
+            crawl.lease.logged_in = True
+            return True
+        return False
+
+    def _session_active(self, crawl: LinkedInCrawl) -> bool:
+        """Check whether the current cookies reach Sales Navigator without a login redirect."""
+        self._open(crawl, "https://www.linkedin.com/sales/home")
+        current_url = crawl.driver.current_url
+        return "login" not in current_url and "checkpoint" not in current_url
+
+    def _open(self, crawl: LinkedInCrawl, url: str):
+        """
+        Navigate the leased driver and count the page against its budget.
+        Load time and security challenges are reported against the driver's proxy;
+        a challenged driver is retired when the job ends, so its replacement
+        starts behind a different proxy. Both count against the LinkedIn circuit
+        breaker, which stops the crawl with CircuitOpenError while open.
+        """
+        lease = crawl.lease
+        probe = linkedin_breaker.acquire()
+        started = time.monotonic()
+        try:
+            crawl.driver.get(url)
+        except Exception:
+            proxy_pool.report(lease.proxy, error=True)
+            linkedin_window.record(error=True)
+            linkedin_breaker.record(False, time.monotonic() - started, probe)
+            raise
+        except BaseException:
+            linkedin_breaker.cancel(probe)
+            raise
+        finally:
+            lease.pages_served += 1
+        blocked = any(marker in crawl.driver.current_url for marker in LINKEDIN_BLOCK_MARKERS)
+        latency = time.monotonic() - started
+        proxy_pool.report(lease.proxy, latency=latency, blocked=blocked)
+        linkedin_window.record(latency=latency, captcha=blocked)
+        linkedin_breaker.record(not blocked, latency, probe)
+        if blocked:
+            logger.warning(f"LinkedIn challenged the session at {url}")
+            lease.pages_served = max(lease.pages_served, self.pool.pages_per_driver)
+
     def _random_delay(self):
-        """Add random delay between actions to avoid detection."""
-        time.sleep(random.uniform(1, 3))
+        """
+        Random delay between actions to avoid detection. It centres on the pace of
+        the LinkedIn window: longer after challenges, shorter while pages load quickly.
+        """
+        time.sleep(random.uniform(0.5, 1.5) * linkedin_window.pace(settings.SCRAPER_PACE_DELAY))
+
+    def _human_pause(self):
+        """Short reading pause while scrolling; kept separate from waiting for content."""
+        time.sleep(random.uniform(settings.LINKEDIN_SCROLL_PAUSE_MIN, settings.LINKEDIN_SCROLL_PAUSE_MAX))
 
-    def _scroll_page(self):
-        """Scroll the page gradually to load all content."""
-        total_height = int(self.driver.execute_script("return document.body.scrollHeight"))
-        for i in range(0, total_height, 100):
-            self.driver.execute_script(f"window.scrollTo(0, {i});")
-            self._random_delay()
+    def _scroll_page(self, driver, result_selector: str = ".search-results__result-item"):
+        """
+        Jump to the bottom until the result list stops growing.
+        Each jump waits for lazy-loaded content through a MutationObserver instead of a
+        fixed sleep; scrolling stops once the result count and page height are unchanged
+        for LINKEDIN_SCROLL_STABLE_ROUNDS jumps or LINKEDIN_SCROLL_BUDGET seconds pass.
+        """
+        deadline = time.monotonic() + settings.LINKEDIN_SCROLL_BUDGET
+        pauses_left = settings.LINKEDIN_SCROLL_PAUSES
+        last_state = None
+        stable_rounds = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.info("Scroll time budget spent before the result list settled")
+                break
+            timeout_ms = int(remaining * 1000)
+            driver.set_script_timeout(remaining + 5)
+            state = driver.execute_async_script(
+                SCROLL_AND_SETTLE_JS, result_selector, settings.LINKEDIN_SCROLL_QUIET_MS, timeout_ms
+            )
+            if state == last_state:
+                stable_rounds += 1
+                if stable_rounds >= settings.LINKEDIN_SCROLL_STABLE_ROUNDS:
+                    break
+            else:
+                stable_rounds = 0
+                last_state = state
+            if pauses_left > 0:
+                pauses_left -= 1
+                self._human_pause()
 
     async def scrape_leads(self, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Scrape leads from LinkedIn Sales Navigator based on provided parameters.
         """
         leads = []
-        try:
-            if not await self.login():
+        async with self.pool.driver(self.setup_driver) as pooled:
+            crawl = LinkedInCrawl(pooled)
+            try:
+                # Login and the first page load block on Selenium; keep them off the event loop
+                total_pages = await asyncio.to_thread(self._open_first_page, crawl, parameters)
+                
+                # Scrape each page; the driver loads the next page while this one is parsed
+                pages = crawl_pages(
+                    lambda page: asyncio.to_thread(self._load_results_page, crawl, parameters, page),
+                    self._parse_results_page,
+                    total_pages,
+                    window=parameters.get("prefetch_pages", settings.SCRAPER_PREFETCH_PAGES)
+                )
+                async for page, page_leads in pages:
+                    logger.info(f"Scraped page {page} of {total_pages}")
+                    leads.extend(page_leads)
+                
+                return leads
+                
+            except Exception as e:
+                logger.error(f"Error scraping leads: {str(e)}")
+                raise
+            finally:
+                # Let an in-flight page load finish before the driver goes back to the pool;
+                # the driver stays logged in
+                crawl.finish()
+                await asyncio.to_thread(crawl.wait_idle)
+
+    def _open_first_page(self, crawl: LinkedInCrawl, parameters: Dict[str, Any]) -> int:
+        """
+        Log in if needed, open the first results page and return the page count.
+        Runs in a worker thread.
+        """
+        with crawl.lock:
+            if not self._ensure_logged_in(crawl):
                 raise Exception("Failed to log in to LinkedIn")
 
             # Construct search URL based on parameters
-            search_url = self._construct_search_url(parameters)
-            self.driver.get(search_url)
+            self._open(crawl, self._construct_search_url(parameters))
             
             # Wait for results to load
-            WebDriverWait(self.driver, 10).until(
+            WebDriverWait(crawl.driver, 10).until(
                 EC.presence_of_element_located((By.CLASS_NAME, "search-results__result-item"))
             )
             
             # Get total number of pages
-            total_pages = self._get_total_pages()
-            
-            # Scrape each page
-            for page in range(1, total_pages + 1):
-                logger.info(f"Scraping page {page} of {total_pages}")
+            return self._get_total_pages(crawl.driver)
+
+    def _load_results_page(self, crawl: LinkedInCrawl, parameters: Dict[str, Any], page: int) -> Optional[str]:
+        """
+        Navigate to a results page, scroll it fully and return its HTML.
+        Runs in a worker thread once the pages before it have loaded; None when
+        the crawl ended first. Page 1 is already open when the crawl starts.
+        """
+        if not crawl.wait_turn(page):
+            return None
+        try:
+            with crawl.lock:
+                if crawl.done:
+                    return None
+                if page > 1:
+                    # Add delay between pages
+                    self._random_delay()
+                    self._open(crawl, self._construct_search_url(parameters, page))
+                    self._random_delay()
                 
                 # Scroll to load all results
-                self._scroll_page()
-                
-                # Parse results
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-                results = soup.find_all('div', class_='search-results__result-item')
-                
-                for result in results:
-                    lead = self._parse_result(result)
-                    if lead:
-                        leads.append(lead)
-                
-                # Add delay between pages
-                self._random_delay()
-                
-                # Go to next page if not the last page
-                if page < total_pages:
-                    next_page_url = self._construct_search_url(parameters, page + 1)
-                    self.driver.get(next_page_url)
-                    self._random_delay()
-            
-            return leads
-            
-        except Exception as e:
-            logger.error(f"Error scraping leads: {str(e)}")
-            raise
+                self._scroll_page(crawl.driver)
+                return crawl.driver.page_source
         finally:
-            if self.driver:
-                self.driver.quit()
+            crawl.end_turn(page)
+
+    def _parse_results_page(self, html: str) -> List[Dict[str, Any]]:
+        """Parse every search result on a results page into leads."""
+        soup = html_parser.parse(html)
+        return [
+            {**result, "source": "linkedin"}
+            for result in extraction_specs.get("sales_navigator").extract(soup)
+        ]
 
     def _construct_search_url(self, parameters: Dict[str, Any], page: int = 1) -> str:
         """Construct LinkedIn Sales Navigator search URL."""
@@ -154,10 +349,10 @@ class LinkedInScraper:
         query_string = "&".join([f"{k}={v}" for k, v in params.items()])
         return f"{base_url}?{query_string}"
 
-    def _get_total_pages(self) -> int:
+    def _get_total_pages(self, driver) -> int:
         """Get total number of pages from pagination."""
         try:
-            pagination = self.driver.find_elements(By.CSS_SELECTOR, ".search-results__pagination-list li")
+            pagination = driver.find_elements(By.CSS_SELECTOR, ".search-results__pagination-list li")
             if not pagination:
                 return 1
             
@@ -167,22 +362,3 @@ class LinkedInScraper:
             return int(last_page)
         except:
             return 1
-
-    def _parse_result(self, result) -> Dict[str, Any]:
-        """Parse individual search result into lead data."""
-        try:
-            name = result.find('div', class_='result-lockup__name').text.strip()
-            title = result.find('div', class_='result-lockup__highlight-keyword').text.strip()
-            company = result.find('div', class_='result-lockup__position-company').text.strip()
-            location = result.find('div', class_='result-lockup__misc-list').text.strip()
-            
-            return {
-                "name": name,
-                "title": title,
-                "company": company,
-                "location": location,
-                "source": "linkedin"
-            }
-        except Exception as e:
-            logger.error(f"Error parsing result: {str(e)}")
-            return None 
\ No newline at end of file
@@ -1,17 +1,35 @@
-import aiohttp
 import asyncio
+import aiohttp
 from bs4 import BeautifulSoup
 import logging
 from typing import List, Dict, Any
-import random
 import time
 from fake_useragent import UserAgent
 from ..core.config import settings
+from ..utils.aimd import adaptive_concurrency
+from ..utils.concurrency import HostLimiter
+from ..utils.block_detection import BAN_STATUSES, looks_like_captcha
+from ..utils.circuit_breaker import CircuitOpenError, circuit_breakers
+from ..utils.contact_extractor import contact_extractor
+from ..utils.extraction_spec import extraction_specs
+from ..utils.frontier import crawl_frontier
+from ..utils.html_parser import html_parser
+from ..utils.http_client import http_client
+from ..utils.keyword_matcher import KeywordAutomaton
+from ..utils.politeness import scheduler
+from ..utils.proxy_pool import proxy_pool
+from ..utils.response_cache import CachedResponse, response_cache
+from ..utils.robots import robots_policy
+from ..utils.structured_data import ContactRecord, structured_data_extractor
+from ..utils.text_index import build_text_index
 import re
 from urllib.parse import urljoin
 
 logger = logging.getLogger(__name__)
 
+# Elements whose text is searched for property manager keywords
+MANAGER_TAGS = ['p', 'div', 'span', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
 class WebScraper:
     def __init__(self):
         self.ua = UserAgent()
@@ -34,6 +52,14 @@ class WebScraper:
             "property coordinator",
             "property specialist"
         ]
+        # Compiled once: one automaton for every keyword, one name pattern per keyword
+        self.keyword_automaton = KeywordAutomaton(
+            [keyword.lower() for keyword in self.property_manager_keywords]
+        )
+        self.name_patterns = [
+            re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+' + keyword)
+            for keyword in self.property_manager_keywords
+        ]
         self.excluded_domains = [
             "linkedin.com",
             "airbnb.com",
@@ -43,57 +69,128 @@ class WebScraper:
         ]
 
     async def setup_session(self):
-        """Initialize aiohttp session with proxy if configured."""
-        if settings.PROXY_LIST:
-            proxy = random.choice(settings.PROXY_LIST.split(','))
-            self.session = aiohttp.ClientSession(
-                headers=self.headers,
-                proxy=f"http://{proxy}"
-            )
-        else:
-            self.session = aiohttp.ClientSession(headers=self.headers)
+        """Borrow the shared HTTP session; proxies are picked per request."""
+        self.session = await http_client.get_session()
 
     async def close_session(self):
-        """Close the aiohttp session."""
-        if self.session:
-            await self.session.close()
+        """Release the shared HTTP session; the pool stays open for other jobs."""
+        self.session = None
 
-    def _random_delay(self):
-        """Add random delay between requests."""
-        time.sleep(random.uniform(2, 5))
+    async def _fetch(self, url: str, source: str = "web") -> CachedResponse:
+        """
+        GET a URL through the response cache with this scraper's headers and a proxy
+        from the pool. Requests that reach the network hold a slot in the source's
+        adaptive concurrency window and report their outcome to it, to the pool and
+        to the source's circuit breaker, which raises CircuitOpenError while open.
+        """
+        proxy = proxy_pool.acquire()
+        breaker = circuit_breakers.get(source)
+        admitted = False
+        probe = False
+        started = None
+        
+        async def before_request():
+            nonlocal admitted, probe, started
+            probe = breaker.acquire()
+            admitted = True
+            await scheduler.wait(url)
+            started = await adaptive_concurrency.acquire(source)
+        
+        try:
+            response = await response_cache.fetch(
+                self.session,
+                url,
+                source,
+                before_request=before_request,
+                headers=self.headers,
+                proxy=proxy
+            )
+        except BaseException as e:
+            # Free the concurrency slot on any failure, cancellation included
+            if started is not None:
+                failed = isinstance(e, (aiohttp.ClientError, asyncio.TimeoutError))
+                await adaptive_concurrency.release(source, started, error=failed)
+                if isinstance(e, Exception):
+                    proxy_pool.report(proxy, error=True)
+            if started is not None and isinstance(e, Exception):
+                breaker.record(False, time.monotonic() - started, probe)
+            elif admitted:
+                breaker.cancel(probe)
+            raise
+        if started is not None:
+            captcha = looks_like_captcha(response.text)
+            breaker.record(
+                not (captcha or response.status in BAN_STATUSES or response.status >= 500),
+                time.monotonic() - started,
+                probe
+            )
+            proxy_pool.report(
+                proxy,
+                status=response.status,
+                latency=time.monotonic() - started,
+                blocked=captcha
+            )
+            await adaptive_concurrency.release(
+                source,
+                started,
+                status=response.status,
+                captcha=captcha,
+                retry_after=response.retry_after
+            )
+        return response
 
     async def scrape_leads(self, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Scrape property managers from various web sources based on provided parameters.
+        Queries and result pages are fetched concurrently, bounded by a global and a
+        per-host limit. Leads are returned in query order, then result order, so the
+        output does not depend on which request finishes first.
         """
-        leads = []
+        limiter = HostLimiter(
+            parameters.get("max_concurrency", settings.SCRAPER_MAX_CONCURRENCY),
+            parameters.get("max_per_host", settings.SCRAPER_MAX_PER_HOST)
+        )
         try:
             await self.setup_session()
             
             # Get search results from multiple sources
             search_queries = self._generate_search_queries(parameters)
+            google_results = await limiter.map(
+                self._scrape_google,
+                search_queries,
+                key=lambda query: "https://www.google.com/search"
+            )
             
-            for query in search_queries:
-                # Google search
-                google_results = await self._scrape_google(query)
-                
-                # Process each result
-                for url in google_results:
-                    try:
-                        page_leads = await self._process_webpage(url)
-                        leads.extend(page_leads)
-                    except Exception as e:
-                        logger.error(f"Error processing webpage {url}: {str(e)}")
-                        continue
-                    
-                    self._random_delay()
+            # Collect result URLs in a stable order; the frontier drops URLs that
+            # canonicalize to one already queued, or visited by a recent job
+            frontier = crawl_frontier.job()
+            urls = frontier.admit_all(
+                url for results in google_results for url in results or []
+            )
+            # Drop pages robots.txt disallows before any of them is queued
+            urls = await robots_policy.filter(
+                self.session, urls, proxies=proxy_pool, headers=self.headers
+            )
+            
+            # Process each result, merging page leads as they complete
+            page_leads: Dict[int, List[Dict[str, Any]]] = {}
+            
+            def merge(index: int, leads: List[Dict[str, Any]]):
+                page_leads[index] = leads or []
             
+            await limiter.map(self._process_webpage, urls, on_result=merge)
+            
+            leads = []
+            for index in sorted(page_leads):
+                leads.extend(page_leads[index])
             return leads
             
         except Exception as e:
             logger.error(f"Error scraping web leads: {str(e)}")
             raise
         finally:
+            # Keep the URLs visited so far even when the job fails
+            await asyncio.to_thread(crawl_frontier.save)
             await self.close_session()
 
     def _generate_search_queries(self, parameters: Dict[str, Any]) -> List[str]:
@@ -123,122 +220,159 @@ class WebScraper:
         """Scrape Google search results."""
         try:
             search_url = f"https://www.google.com/search?q={query}"
-            async with self.session.get(search_url) as response:
-                if response.status != 200:
-                    return []
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extract search result URLs
-                urls = []
-                for result in soup.find_all('div', {'class': 'g'}):
-                    link = result.find('a')
-                    if link and 'href' in link.attrs:
-                        url = link['href']
-                        if not any(domain in url for domain in self.excluded_domains):
-                            urls.append(url)
-                
-                return urls[:10]  # Limit to top 10 results
+            response = await self._fetch(search_url, source="google")
+            if response.status != 200:
+                return []
+            
+            soup = html_parser.parse(response.text)
+            
+            # Extract search result URLs
+            urls = []
+            for result in extraction_specs.get("google_results").extract(soup):
+                url = result['url']
+                if not any(domain in url for domain in self.excluded_domains):
+                    urls.append(url)
+            
+            return urls[:10]  # Limit to top 10 results
                 
+        except CircuitOpenError:
+            return []
         except Exception as e:
             logger.error(f"Error scraping Google results: {str(e)}")
             return []
 
     async def _process_webpage(self, url: str) -> List[Dict[str, Any]]:
-        """Process a webpage to extract property manager information."""
+        """
+        Process a webpage to extract property manager information.
+        People and contact details the page declares as schema.org structured data
+        are used first; the keyword and pattern heuristics only run for what it
+        does not declare, and the page is only parsed when they or microdata need it.
+        """
         try:
-            async with self.session.get(url) as response:
-                if response.status != 200:
-                    return []
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                leads = []
-                
-                # Extract contact information
-                contact_info = self._extract_contact_info(soup)
-                
-                # Extract property manager information
+            response = await self._fetch(url)
+            if response.status != 200:
+                return []
+            crawl_frontier.mark_visited(url)
+            if response.skipped:
+                return []
+            
+            text = response.text
+            soup = html_parser.parse(text) if structured_data_extractor.has_microdata(text) else None
+            records = structured_data_extractor.extract(text, soup)
+            
+            leads = []
+            
+            # Extract property manager information
+            manager_info = self._structured_manager_info(records)
+            if not manager_info:
+                soup = soup if soup is not None else html_parser.parse(text)
                 manager_info = self._extract_manager_info(soup)
-                
-                # Combine information
-                for manager in manager_info:
-                    lead = {
-                        "name": manager.get("name", ""),
-                        "title": manager.get("title", "Property Manager"),
-                        "company": manager.get("company", ""),
-                        "location": contact_info.get("location", ""),
-                        "email": contact_info.get("email", ""),
-                        "phone": contact_info.get("phone", ""),
-                        "source": "web",
-                        "source_url": url
-                    }
-                    leads.append(lead)
-                
-                return leads
-                
+            if not manager_info:
+                return []
+            
+            # Extract contact information
+            contact_info = self._structured_contact_info(records)
+            if not contact_info:
+                soup = soup if soup is not None else html_parser.parse(text)
+                contact_info = self._extract_contact_info(soup)
+            
+            # Combine information; a person's own details win over the page's
+            for manager in manager_info:
+                lead = {
+                    "name": manager.get("name", ""),
+                    "title": manager.get("title") or "Property Manager",
+                    "company": manager.get("company", ""),
+                    "location": manager.get("location") or contact_info.get("location", ""),
+                    "email": manager.get("email") or contact_info.get("email", ""),
+                    "phone": manager.get("phone") or contact_info.get("phone", ""),
+                    "source": "web",
+                    "source_url": url
+                }
+                leads.append(lead)
+            
+            return leads
+            
+        except CircuitOpenError:
+            return []
         except Exception as e:
             logger.error(f"Error processing webpage {url}: {str(e)}")
             return []
 
+    def _structured_contact_info(self, records: List[ContactRecord]) -> Dict[str, str]:
+        """The page's contact details from its organization records: the first of each kind."""
+        contact_info = {}
+        for record in records:
+            if record.kind != "organization":
+                continue
+            for key, value in (("email", record.email), ("phone", record.phone), ("location", record.address)):
+                if value and key not in contact_info:
+                    contact_info[key] = value
+        return contact_info
+
+    def _structured_manager_info(self, records: List[ContactRecord]) -> List[Dict[str, str]]:
+        """The people a page declares, with their own contact details where given."""
+        return [
+            {
+                "name": record.name,
+                "title": record.job_title,
+                "company": record.organization,
+                "email": record.email,
+                "phone": record.phone,
+                "location": record.address
+            }
+            for record in records
+            if record.kind == "person"
+        ]
+
     def _extract_contact_info(self, soup: BeautifulSoup) -> Dict[str, str]:
-        """Extract contact information from webpage."""
+        """Extract contact information from webpage: the first candidate of each kind."""
         contact_info = {}
+        candidates = contact_extractor.extract(soup)
         
-        # Extract email addresses
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, soup.get_text())
-        if emails:
-            contact_info["email"] = emails[0]
+        email = contact_extractor.first(candidates, "email")
+        if email:
+            contact_info["email"] = email
         
-        # Extract phone numbers
-        phone_pattern = r'\+?1?\d{9,15}'
-        phones = re.findall(phone_pattern, soup.get_text())
-        if phones:
-            contact_info["phone"] = phones[0]
-        
-        # Extract location
-        location_patterns = [
-            r'\d+\s+[A-Za-z\s,]+(?:Avenue|Lane|Road|Boulevard|Drive|Street|Ave|Ln|Rd|Blvd|Dr|St)\.?',
-            r'[A-Za-z\s]+,\s*[A-Z]{2}',
-            r'[A-Za-z\s]+,\s*[A-Za-z\s]+,\s*[A-Z]{2}'
-        ]
+        phone = contact_extractor.first(candidates, "phone")
+        if phone:
+            contact_info["phone"] = phone
         
-        for pattern in location_patterns:
-            locations = re.findall(pattern, soup.get_text())
-            if locations:
-                contact_info["location"] = locations[0]
-                break
+        # Prefer a street address over a "City, ST" match
+        location = (
+            contact_extractor.first(candidates, "address", detail="street")
+            or contact_extractor.first(candidates, "address", detail="locality")
+        )
+        if location:
+            contact_info["location"] = location
         
         return contact_info
 
     def _extract_manager_info(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
-        """Extract property manager information from webpage."""
+        """
+        Extract property manager information from webpage.
+        The page text is indexed in one traversal and scanned once for all keywords;
+        results keep the keyword-by-keyword, document order of a per-keyword search.
+        """
         managers = []
+        index = build_text_index(soup, MANAGER_TAGS)
+        keyword_positions = self.keyword_automaton.positions(index.lowered)
         
         # Look for property manager information in various formats
-        for keyword in self.property_manager_keywords:
-            # Find text containing property manager keywords
-            manager_elements = soup.find_all(
-                lambda tag: tag.name in ['p', 'div', 'span', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
-                and keyword.lower() in tag.get_text().lower()
-            )
-            
-            for element in manager_elements:
+        for keyword_index, keyword in enumerate(self.property_manager_keywords):
+            # Elements whose text contains the keyword
+            for element_index in index.elements_containing(keyword_positions[keyword_index], len(keyword)):
                 # Extract name (assuming it's before the keyword)
-                text = element.get_text()
-                name_match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+' + keyword, text)
+                text = index.element_text(element_index)
+                name_match = self.name_patterns[keyword_index].search(text)
                 
                 if name_match:
                     name = name_match.group(1)
                     
                     # Look for company name
                     company = ""
-                    company_element = element.find_next(['p', 'div', 'span'])
-                    if company_element:
-                        company = company_element.get_text().strip()
+                    company_index = index.next_element(element_index, ['p', 'div', 'span'])
+                    if company_index is not None:
+                        company = index.element_text(company_index).strip()
                     
                     managers.append({
                         "name": name,
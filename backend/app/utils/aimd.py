@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_source_limits(value: Optional[str]) -> Dict[str, int]:
+    """Parse a "source=n,source=n" setting into a dictionary."""
+    limits = {}
+    for item in (value or "").split(','):
+        if '=' not in item:
+            continue
+        source, limit = item.split('=', 1)
+        try:
+            limits[source.strip().lower()] = int(limit)
+        except ValueError:
+            continue
+    return limits
+
+
+class AIMDWindow:
+    """
+    Additive-increase/multiplicative-decrease window for one source.
+    Each healthy response within the latency target grows the window by
+    increase / window, about increase per window's worth of requests. A 429,
+    5xx, timeout or challenge page multiplies it by decrease, at most once per
+    smoothed round trip so a burst of in-flight failures counts as one event.
+    Slow but successful responses hold the window where it is. Retry-After
+    blocks the source until it has passed.
+    """
+
+    def __init__(
+        self,
+        initial: float = 2,
+        minimum: float = 1,
+        maximum: float = 16,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_target: float = 5.0,
+        max_retry_after: float = 300.0
+    ):
+        self.minimum = max(1.0, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.window = min(self.maximum, max(self.minimum, float(initial)))
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.max_retry_after = max_retry_after
+        self.latency: Optional[float] = None
+        self.blocked_until = 0.0
+        self.last_cut = 0.0
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """Requests allowed in flight at once."""
+        return int(self.window)
+
+    def record(
+        self,
+        status: Optional[int] = None,
+        latency: Optional[float] = None,
+        error: bool = False,
+        captcha: bool = False,
+        retry_after: Optional[str] = None
+    ):
+        """Adjust the window for one response. error covers timeouts and connection failures."""
+        now = time.monotonic()
+        delay = parse_retry_after(retry_after)
+        if delay:
+            self.blocked_until = max(self.blocked_until, now + min(delay, self.max_retry_after))
+
+        if error or captcha or status == 429 or (status is not None and status >= 500):
+            if now - self.last_cut >= (self.latency or 1.0):
+                self.window = max(self.minimum, self.window * self.decrease)
+                self.last_cut = now
+                self.decreases += 1
+            return
+
+        if latency is not None:
+            self.latency = latency if self.latency is None else self.latency + 0.3 * (latency - self.latency)
+            if latency > self.latency_target:
+                return
+        if self.window < self.maximum:
+            self.window = min(self.maximum, self.window + self.increase / self.window)
+            self.increases += 1
+
+    def retry_wait(self) -> float:
+        """Seconds left before Retry-After allows the next request."""
+        return max(0.0, self.blocked_until - time.monotonic())
+
+    def pace(self, base_delay: float) -> float:
+        """
+        Delay before the next step of a sequential crawl: base_delay at the
+        smallest window, shrinking as the window grows, never before Retry-After.
+        """
+        return max(self.retry_wait(), base_delay / self.window)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window": round(self.window, 2),
+            "limit": self.limit,
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "retry_wait": round(self.retry_wait(), 1),
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+@dataclass
+class AIMDOutcome:
+    """What a request under AdaptiveConcurrency.slot() saw; filled in by the caller."""
+    status: Optional[int] = None
+    error: bool = False
+    captcha: bool = False
+    retry_after: Optional[str] = None
+
+
+class AdaptiveConcurrency:
+    """
+    Per-source concurrency limits that follow an AIMD window.
+    Requests wait for a free slot under their source's current window and for
+    any Retry-After to pass; each one reports its outcome on release.
+    """
+
+    def __init__(self, source_max: Optional[Dict[str, int]] = None, **window_options):
+        self.source_max = source_max or {}
+        self.window_options = window_options
+        self._windows: Dict[str, AIMDWindow] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._condition: Optional[asyncio.Condition] = None
+
+    def window(self, source: str) -> AIMDWindow:
+        if source not in self._windows:
+            options = dict(self.window_options)
+            if source in self.source_max:
+                options["maximum"] = self.source_max[source]
+            self._windows[source] = AIMDWindow(**options)
+        return self._windows[source]
+
+    async def acquire(self, source: str) -> float:
+        """Wait for a slot; returns the start time to pass to release()."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        window = self.window(source)
+        async with self._condition:
+            while True:
+                wait = window.retry_wait()
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self._in_flight.get(source, 0) < window.limit:
+                    self._in_flight[source] = self._in_flight.get(source, 0) + 1
+                    return time.monotonic()
+                await self._condition.wait()
+
+    async def release(self, source: str, started: float, **outcome):
+        """Free the slot and feed the outcome (status, error, captcha, retry_after) to the window."""
+        self.window(source).record(latency=time.monotonic() - started, **outcome)
+        async with self._condition:
+            self._in_flight[source] -= 1
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self, source: str):
+        """Hold a slot for one request; timeouts raised inside count as congestion."""
+        started = await self.acquire(source)
+        outcome = AIMDOutcome()
+        try:
+            yield outcome
+        except asyncio.TimeoutError:
+            outcome.error = True
+            raise
+        finally:
+            await self.release(
+                source,
+                started,
+                status=outcome.status,
+                error=outcome.error,
+                captcha=outcome.captcha,
+                retry_after=outcome.retry_after
+            )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            source: {**window.stats(), "in_flight": self._in_flight.get(source, 0)}
+            for source, window in self._windows.items()
+        }
+
+
+adaptive_concurrency = AdaptiveConcurrency(
+    source_max=parse_source_limits(settings.SCRAPER_AIMD_SOURCE_MAX),
+    initial=settings.SCRAPER_AIMD_INITIAL,
+    minimum=settings.SCRAPER_AIMD_MIN,
+    maximum=settings.SCRAPER_AIMD_MAX,
+    increase=settings.SCRAPER_AIMD_INCREASE,
+    decrease=settings.SCRAPER_AIMD_DECREASE,
+    latency_target=settings.SCRAPER_AIMD_LATENCY_TARGET,
+    max_retry_after=settings.SCRAPER_AIMD_MAX_RETRY_AFTER
+)
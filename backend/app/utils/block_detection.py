@@ -0,0 +1,34 @@
+from typing import Optional
+
+# Status codes sites answer with when they throttle or block a client
+BAN_STATUSES = frozenset({403, 429})
+
+# Phrases from interstitial challenge pages. Kept specific: plenty of ordinary
+# pages embed a reCAPTCHA widget in their contact form and are not blocks.
+CAPTCHA_MARKERS = (
+    "our systems have detected unusual traffic",
+    "detected unusual traffic from your computer",
+    "/sorry/index",
+    "px-captcha",
+    "captcha-delivery.com",
+    "cf-challenge",
+    "/cdn-cgi/challenge-platform/",
+    "are you a robot",
+    "please verify you are a human",
+)
+
+# Challenge pages are small; only the start of a page is searched
+_SCAN_CHARS = 64 * 1024
+
+
+def looks_like_captcha(text: Optional[str]) -> bool:
+    """Whether a page body looks like a bot challenge rather than content."""
+    if not text:
+        return False
+    head = text[:_SCAN_CHARS].lower()
+    return any(marker in head for marker in CAPTCHA_MARKERS)
+
+
+def is_block(status: Optional[int], text: Optional[str] = None) -> bool:
+    """Whether a response is a throttle or block signal: 403, 429 or a challenge page."""
+    return status in BAN_STATUSES or looks_like_captcha(text)
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Tuple
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for one source.
+    The outcomes of the last `window` calls are kept; once at least min_calls
+    are in, the breaker opens when the share of failures reaches error_rate or
+    the share of calls slower than slow_call_seconds reaches slow_rate. After
+    open_seconds one probe call is let through (half-open): success closes the
+    breaker, failure opens it again for twice as long, up to max_open_seconds.
+    acquire() tells the caller whether its call is that probe, and only the
+    probe's record() or cancel() ends the half-open state; calls that started
+    earlier cannot. Callers run on the event loop and in worker threads, so the
+    state is guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 30.0,
+        slow_rate: float = 0.5,
+        open_seconds: float = 60.0,
+        max_open_seconds: float = 900.0
+    ):
+        self.name = name
+        self.min_calls = max(1, min_calls)
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max(open_seconds, max_open_seconds)
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=max(self.min_calls, window))
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._open_for = open_seconds
+        self._probing = False
+        self._lock = threading.Lock()
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self._open_for:
+            return HALF_OPEN
+        return self._state
+
+    @property
+    def available(self) -> bool:
+        """Whether a call would be let through now; does not take the half-open probe."""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self._probing)
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        if self._state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_for - time.monotonic())
+
+    def acquire(self) -> bool:
+        """
+        Claim permission for one call, raising CircuitOpenError when the source is
+        skipped. Returns whether the call is the half-open probe; pass that on to
+        record() or cancel().
+        """
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return False
+            if state == HALF_OPEN and not self._probing:
+                self._state = HALF_OPEN
+                self._probing = True
+                return True
+            self.rejected += 1
+        raise CircuitOpenError(f"{self.name} circuit is open; retry in {self.retry_in():.0f}s")
+
+    def record(self, success: bool, latency: float = 0.0, probe: bool = False):
+        """Record the outcome of a call made after acquire(); probe is what acquire() returned."""
+        slow = latency > self.slow_call_seconds
+        with self._lock:
+            if probe:
+                if self._state != HALF_OPEN or not self._probing:
+                    return
+                self._probing = False
+                if success and not slow:
+                    logger.info(f"{self.name} circuit closed after a successful probe")
+                    self._state = CLOSED
+                    self._open_for = self.open_seconds
+                    self._outcomes.clear()
+                else:
+                    self._trip(min(self.max_open_seconds, self._open_for * 2), "probe failed")
+                return
+            if self._state != CLOSED:
+                # A call that started before the breaker opened; only the probe decides now
+                return
+            self._outcomes.append((success, slow))
+            if len(self._outcomes) < self.min_calls:
+                return
+            failures = sum(1 for ok, _ in self._outcomes if not ok) / len(self._outcomes)
+            slow_calls = sum(1 for _, was_slow in self._outcomes if was_slow) / len(self._outcomes)
+            if failures >= self.error_rate:
+                self._trip(self.open_seconds, f"{failures:.0%} of recent calls failed")
+            elif slow_calls >= self.slow_rate:
+                self._trip(self.open_seconds, f"{slow_calls:.0%} of recent calls took over {self.slow_call_seconds:.0f}s")
+
+    def cancel(self, probe: bool = False):
+        """
+        Give back a call claimed by acquire() that never got a verdict, e.g. one
+        that was cancelled. Only the probe holds anything to give back.
+        """
+        if not probe:
+            return
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+
+    def _trip(self, open_for: float, reason: str):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._open_for = open_for
+        self._outcomes.clear()
+        self.trips += 1
+        logger.warning(f"{self.name} circuit opened for {open_for:.0f}s: {reason}")
+
+    @asynccontextmanager
+    async def call(self):
+        """Run one call under the breaker; an exception raised inside counts as a failure."""
+        probe = self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record(False, time.monotonic() - started, probe)
+            raise
+        except BaseException:
+            self.cancel(probe)
+            raise
+        self.record(True, time.monotonic() - started, probe)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "recent_calls": len(self._outcomes),
+            "retry_in": round(self.retry_in(), 1),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakers:
+    """One breaker per source, created on first use with shared settings."""
+
+    def __init__(self, **options):
+        self.options = options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, source: str) -> CircuitBreaker:
+        if source not in self._breakers:
+            self._breakers[source] = CircuitBreaker(source, **self.options)
+        return self._breakers[source]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {source: breaker.stats() for source, breaker in self._breakers.items()}
+
+
+circuit_breakers = CircuitBreakers(
+    window=settings.CIRCUIT_WINDOW,
+    min_calls=settings.CIRCUIT_MIN_CALLS,
+    error_rate=settings.CIRCUIT_ERROR_RATE,
+    slow_call_seconds=settings.CIRCUIT_SLOW_CALL_SECONDS,
+    slow_rate=settings.CIRCUIT_SLOW_RATE,
+    open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+    max_open_seconds=settings.CIRCUIT_MAX_OPEN_SECONDS
+)
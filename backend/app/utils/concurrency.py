@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def host_of(url: str) -> str:
+    """Return the lower-cased hostname of a URL, or an empty string."""
+    return (urlparse(url).hostname or "").lower()
+
+
+class HostLimiter:
+    def __init__(self, max_concurrency: int, max_per_host: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_per_host = max(1, max_per_host)
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(self.max_per_host)
+        )
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """
+        Hold one global slot and one slot for the URL's host.
+        The host slot is taken first so that a busy host does not pin global slots
+        that requests to other hosts could be using.
+        """
+        async with self._hosts[host_of(url)]:
+            async with self._global:
+                yield
+
+    async def map(
+        self,
+        func: Callable[[Any], Awaitable[T]],
+        items: Iterable[Any],
+        key: Callable[[Any], str] = lambda item: item,
+        on_result: Optional[Callable[[int, T], None]] = None,
+    ) -> List[Optional[T]]:
+        """
+        Run func over items concurrently under the limits.
+        Results are returned in input order; on_result is called as each one completes.
+        Items whose call raised are logged with their traceback and returned as None.
+        """
+        items = list(items)
+        results: List[Optional[T]] = [None] * len(items)
+
+        async def run(index: int, item: Any):
+            async with self.slot(key(item)):
+                results[index] = await func(item)
+            if on_result is not None:
+                on_result(index, results[index])
+
+        outcomes = await asyncio.gather(
+            *(run(index, item) for index, item in enumerate(items)),
+            return_exceptions=True
+        )
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(
+                    f"{getattr(func, '__name__', 'call')} failed for {items[index]!r}: {str(outcome)}",
+                    exc_info=outcome
+                )
+                results[index] = None
+        return results
@@ -0,0 +1,174 @@
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+from urllib.parse import unquote
+
+from bs4 import CData, NavigableString, Tag
+
+# The string types Tag.get_text() returns by default (comments, scripts etc. are skipped)
+_TEXT_TYPES = (NavigableString, CData)
+
+
+@dataclass(frozen=True)
+class ContactPattern:
+    """
+    One alternative of the combined contact pattern.
+    run_start is a lookbehind that marks where a match can begin when scanning
+    inside text: patterns that open with a character-class run can only match
+    from the start of that run, so other positions are skipped cheaply.
+    """
+    name: str
+    kind: str
+    pattern: str
+    detail: Optional[str] = None
+    run_start: str = ""
+
+
+# Tried in this order at each position
+CONTACT_PATTERNS: List[ContactPattern] = [
+    ContactPattern("email", "email", r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'),
+    ContactPattern("phone_digits", "phone", r'\+?1?\d{9,15}'),
+    ContactPattern("phone_formatted", "phone", r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    ContactPattern(
+        "street", "address",
+        r'\d+\s+[A-Za-z\s,]+(?:Avenue|Lane|Road|Boulevard|Drive|Street|Ave|Ln|Rd|Blvd|Dr|St)\.?',
+        detail="street", run_start=r'(?<!\d)'
+    ),
+    ContactPattern(
+        "city_region_state", "address", r'[A-Za-z\s]+,\s*[A-Za-z\s]+,\s*[A-Z]{2}',
+        detail="locality", run_start=r'(?<![A-Za-z\s])'
+    ),
+    ContactPattern(
+        "city_state", "address", r'[A-Za-z\s]+,\s*[A-Z]{2}',
+        detail="locality", run_start=r'(?<![A-Za-z\s])'
+    ),
+]
+
+
+@dataclass
+class ContactCandidate:
+    """An email, phone or address found on a page, with its offset in the page text."""
+    kind: str
+    value: str
+    start: int
+    end: int
+    source: str = "text"
+    detail: Optional[str] = None
+
+
+class ContactExtractor:
+    """
+    Finds contact details in one pass over a page.
+    The page text and its mailto:/tel: links are collected in a single traversal,
+    then one combined, precompiled pattern is run over the text. Every candidate
+    is returned in page order, not just the first match of each kind.
+    """
+
+    def __init__(self, patterns: Optional[List[ContactPattern]] = None):
+        self.patterns = {pattern.name: pattern for pattern in (patterns or CONTACT_PATTERNS)}
+        # Tried exactly where the previous match ended
+        self._combined = re.compile(
+            "|".join(f"(?P<{p.name}>{p.pattern})" for p in self.patterns.values())
+        )
+        # Searched for beyond that point; run patterns only start at a run boundary there
+        self._combined_at_runs = re.compile(
+            "|".join(f"(?P<{p.name}>{p.run_start}{p.pattern})" for p in self.patterns.values())
+        )
+
+    def page_text(self, soup) -> Tuple[str, List[ContactCandidate]]:
+        """Return the text get_text() would give and the candidates from mailto:/tel: links."""
+        if not isinstance(soup, Tag):
+            return self._page_text_fallback(soup)
+        parts = []
+        links = []
+        offset = 0
+        for node in soup.descendants:
+            if type(node) in _TEXT_TYPES:
+                parts.append(node)
+                offset += len(node)
+            elif isinstance(node, Tag) and node.name == "a":
+                candidate = self._link_candidate(node.get("href"), offset)
+                if candidate:
+                    links.append(candidate)
+        return "".join(parts), links
+
+    def _page_text_fallback(self, soup) -> Tuple[str, List[ContactCandidate]]:
+        """For parser backends without a BeautifulSoup tree: locate links by their text."""
+        text = soup.get_text()
+        links = []
+        cursor = 0
+        for anchor in soup.find_all("a", href=True):
+            position = text.find(anchor.get_text(), cursor)
+            offset = position if position >= 0 else cursor
+            candidate = self._link_candidate(anchor.get("href"), offset)
+            if candidate:
+                links.append(candidate)
+            cursor = offset
+        return text, links
+
+    @staticmethod
+    def _link_candidate(href: Any, offset: int) -> Optional[ContactCandidate]:
+        if not isinstance(href, str):
+            return None
+        href = href.strip()
+        scheme = href[:7].lower()
+        if scheme == "mailto:":
+            kind, value = "email", href[7:]
+        elif scheme[:4] == "tel:":
+            kind, value = "phone", href[4:]
+        else:
+            return None
+        value = unquote(value.split("?", 1)[0]).strip()
+        if not value:
+            return None
+        return ContactCandidate(kind, value, offset, offset, source="link")
+
+    def extract_text(self, text: str) -> List[ContactCandidate]:
+        """
+        Every contact candidate in text, in order of position, scanning like
+        finditer over the combined pattern. A run pattern that fails where the
+        scan resumes cannot match later inside the same run, so past that point
+        only run boundaries are tried; this keeps long runs from being rescanned
+        from every character.
+        """
+        candidates = []
+        position = 0
+        while position <= len(text):
+            match = self._combined.match(text, position) or self._combined_at_runs.search(text, position + 1)
+            if not match:
+                break
+            pattern = self.patterns[match.lastgroup]
+            candidates.append(
+                ContactCandidate(pattern.kind, match.group(), match.start(), match.end(), detail=pattern.detail)
+            )
+            position = max(match.end(), match.start() + 1)
+        return candidates
+
+    def extract(self, soup) -> List[ContactCandidate]:
+        """Every contact candidate on a page or element, links included, in page order."""
+        text, links = self.page_text(soup)
+        candidates = self.extract_text(text) + links
+        # Links first where a link and its text start at the same offset
+        candidates.sort(key=lambda candidate: (candidate.start, candidate.source != "link"))
+        return candidates
+
+    @staticmethod
+    def first(
+        candidates: List[ContactCandidate],
+        kind: str,
+        detail: Optional[str] = None,
+        source: Optional[str] = None
+    ) -> Optional[str]:
+        """The value of the first candidate of a kind (and detail/source, if given)."""
+        for candidate in candidates:
+            if candidate.kind != kind:
+                continue
+            if detail is not None and candidate.detail != detail:
+                continue
+            if source is not None and candidate.source != source:
+                continue
+            return candidate.value
+        return None
+
+
+contact_extractor = ContactExtractor()
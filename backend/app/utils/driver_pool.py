@@ -0,0 +1,165 @@
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process instead of once per driver."""
+    return ChromeDriverManager().install()
+
+
+class PooledDriver:
+    """A WebDriver with its login state, its proxy and a count of pages served."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        # Set by the driver factory when the browser was started behind a proxy
+        self.proxy = getattr(driver, "proxy_url", None)
+        self.logged_in = False
+        self.pages_served = 0
+
+
+class DriverPool:
+    """
+    Bounded pool of long-lived Selenium drivers.
+    Drivers keep their logged-in session between jobs, are health checked before
+    every lease and are recycled after a page budget. Session cookies persist to
+    disk so a fresh driver (or a restarted process) can skip the login flow.
+    """
+
+    def __init__(
+        self,
+        max_drivers: int,
+        pages_per_driver: int,
+        cookie_path: Optional[str] = None
+    ):
+        self.max_drivers = max(1, max_drivers)
+        self.pages_per_driver = max(1, pages_per_driver)
+        self.cookie_path = cookie_path
+        self._idle: List[PooledDriver] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_use = 0
+        self._drivers_created = 0
+        self._drivers_recycled = 0
+        self._unhealthy = 0
+        self._cookie_restores = 0
+
+    def _healthy(self, pooled: PooledDriver) -> bool:
+        """A driver is healthy while its browser still answers commands."""
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, pooled: PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting driver: {str(e)}")
+
+    async def _checkout(self, factory: Callable[[], Any]) -> PooledDriver:
+        while self._idle:
+            pooled = self._idle.pop()
+            if await asyncio.to_thread(self._healthy, pooled):
+                return pooled
+            self._unhealthy += 1
+            await asyncio.to_thread(self._quit, pooled)
+        driver = await asyncio.to_thread(factory)
+        self._drivers_created += 1
+        return PooledDriver(driver)
+
+    @asynccontextmanager
+    async def driver(self, factory: Callable[[], Any]):
+        """
+        Lease a healthy driver, creating one with factory when none is idle.
+        At most max_drivers are leased at once; the driver goes back to the pool
+        afterwards unless its page budget is spent or the job broke it.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_drivers)
+        async with self._slots:
+            pooled = await self._checkout(factory)
+            self._in_use += 1
+            try:
+                yield pooled
+            finally:
+                self._in_use -= 1
+                if pooled.pages_served < self.pages_per_driver and await asyncio.to_thread(self._healthy, pooled):
+                    self._idle.append(pooled)
+                else:
+                    self._drivers_recycled += 1
+                    if pooled.logged_in:
+                        await asyncio.to_thread(self.save_cookies, pooled.driver)
+                    await asyncio.to_thread(self._quit, pooled)
+
+    def save_cookies(self, driver):
+        """Write the driver's cookies to disk, readable by the owner only."""
+        if not self.cookie_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cookie_path) or ".", exist_ok=True)
+            fd = os.open(self.cookie_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(driver.get_cookies(), f)
+        except Exception as e:
+            logger.warning(f"Could not save session cookies: {str(e)}")
+
+    def restore_cookies(self, driver, url: str) -> bool:
+        """
+        Load saved cookies into the driver. Selenium only accepts cookies for the
+        current domain, so url is opened first. Returns False when nothing was loaded.
+        """
+        if not (self.cookie_path and os.path.exists(self.cookie_path)):
+            return False
+        try:
+            with open(self.cookie_path) as f:
+                cookies = json.load(f)
+            driver.get(url)
+            for cookie in cookies:
+                if cookie.get("sameSite") not in ("Strict", "Lax", "None"):
+                    cookie.pop("sameSite", None)
+                driver.add_cookie(cookie)
+        except Exception as e:
+            logger.warning(f"Could not restore session cookies: {str(e)}")
+            return False
+        self._cookie_restores += 1
+        return True
+
+    async def close(self):
+        """Save the session cookies and quit every idle driver."""
+        for pooled in self._idle:
+            if pooled.logged_in:
+                await asyncio.to_thread(self.save_cookies, pooled.driver)
+            await asyncio.to_thread(self._quit, pooled)
+        self._idle = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, utilization and recycling counters."""
+        return {
+            "max_drivers": self.max_drivers,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "drivers_created": self._drivers_created,
+            "drivers_recycled": self._drivers_recycled,
+            "unhealthy": self._unhealthy,
+            "cookie_restores": self._cookie_restores,
+        }
+
+
+driver_pool = DriverPool(
+    max_drivers=settings.LINKEDIN_DRIVER_POOL_SIZE,
+    pages_per_driver=settings.LINKEDIN_PAGES_PER_DRIVER,
+    cookie_path=settings.LINKEDIN_COOKIE_FILE
+)
@@ -0,0 +1,418 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import Tag
+
+from ..core.config import settings
+from .contact_extractor import contact_extractor
+from .html_parser import SelectolaxNode
+
+logger = logging.getLogger(__name__)
+
+_ELEMENT_TYPES = (Tag, SelectolaxNode)
+
+# Built-in per-source specs; a spec file can replace any of them or add new ones.
+# A spec has an optional container selector (one record per match, or one record
+# for the whole page without it), fields and the fields a record must have.
+# A field reads the text, or an attribute, of the first element under the
+# container matching its selector (the container itself without one), narrows it
+# to the first match of pattern, then runs it through the post processors in
+# order. "each" extracts a list of records with another spec under that element.
+DEFAULT_SPECS: Dict[str, Dict[str, Any]] = {
+    # Google local results
+    "google": {
+        "container": "div.VkpGBb",
+        "fields": {
+            "name": {"selector": "div.dbg0pd"},
+            "website": {"selector": "a[href]", "attribute": "href"},
+            "phone": {"post": ["phone"]},
+            "location": {"selector": "div.address"},
+        },
+        "required": ["name"],
+    },
+    # Google organic results
+    "google_results": {
+        "container": "div.g",
+        "fields": {
+            "url": {"selector": "a", "attribute": "href"},
+        },
+        "required": ["url"],
+    },
+    # LinkedIn people search
+    "linkedin": {
+        "container": "li.reusable-search__result-container",
+        "fields": {
+            "name": {"selector": "span.actor-name"},
+            "title": {"selector": "div.entity-result__primary-subtitle"},
+            "company": {"selector": "div.entity-result__secondary-subtitle"},
+            "linkedin_url": {"selector": "a[href]", "attribute": "href"},
+        },
+        "required": ["name", "title"],
+    },
+    # LinkedIn Sales Navigator search results
+    "sales_navigator": {
+        "container": ".search-results__result-item",
+        "fields": {
+            "name": {"selector": "div.result-lockup__name"},
+            "title": {"selector": "div.result-lockup__highlight-keyword"},
+            "company": {"selector": "div.result-lockup__position-company"},
+            "location": {"selector": ".result-lockup__misc-list"},
+        },
+        "required": ["name", "title", "company", "location"],
+    },
+    # Airbnb search results
+    "airbnb_listing": {
+        "container": "div[itemprop=itemListElement]",
+        "fields": {
+            "title": {"selector": "meta[itemprop=name]", "attribute": "content"},
+            "price": {"selector": "span._tyxjp1"},
+            "average_rating": {"selector": "span.r1g2bVn", "post": ["float"]},
+            "host_url": {"selector": "a._1n81at5", "attribute": "href", "post": ["absolute_url"]},
+        },
+        "required": ["title", "price", "average_rating", "host_url"],
+    },
+    # Airbnb host profile, as much as a lead needs
+    "airbnb_host": {
+        "fields": {
+            "name": {"selector": "h1._1n81at5"},
+            "location": {"selector": "div._1n81at5"},
+            "property_count": {"selector": "div._1n81at5", "post": ["digits"]},
+        },
+        "required": ["name", "location", "property_count"],
+    },
+    # Airbnb host profile in full
+    "airbnb_host_details": {
+        "fields": {
+            "name": {"selector": "h1._1n81at5"},
+            "location": {"selector": "div._1n81at5"},
+            "response_rate": {"selector": "div._1n81at5"},
+            "response_time": {"selector": "div._1n81at5"},
+            "listings": {"selector": "div._1n81at5", "each": "airbnb_host_listing"},
+        },
+        "required": ["name", "location", "response_rate", "response_time"],
+    },
+    "airbnb_host_listing": {
+        "container": "div._1n81at5",
+        "fields": {
+            "title": {"selector": "div._1n81at5"},
+            "price": {"selector": "span._tyxjp1"},
+            "rating": {"selector": "span.r1g2bVn"},
+        },
+        "required": ["title", "price", "rating"],
+    },
+}
+
+
+def _digits(value: str, base_url: Optional[str]) -> Optional[int]:
+    digits = "".join(filter(str.isdigit, value))
+    return int(digits) if digits else None
+
+
+def _float(value: str, base_url: Optional[str]) -> Optional[float]:
+    match = re.search(r"\d+(?:[.,]\d+)?", value)
+    return float(match.group().replace(",", ".")) if match else None
+
+
+def _phone(value: str, base_url: Optional[str]) -> Optional[str]:
+    return contact_extractor.first(contact_extractor.extract_text(value), "phone")
+
+
+# Post processors take the value and the page's base URL
+POST_PROCESSORS: Dict[str, Callable[[Any, Optional[str]], Any]] = {
+    "digits": _digits,
+    "float": _float,
+    "phone": _phone,
+    "lower": lambda value, base_url: value.lower(),
+    "collapse": lambda value, base_url: " ".join(value.split()),
+    "absolute_url": lambda value, base_url: urljoin(base_url, value) if base_url else value,
+}
+
+_COMPOUND = re.compile(r"(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:[.#][\w-]+|\[[^\]]*\])*)")
+_PART = re.compile(
+    r"\.(?P<cls>[\w-]+)|#(?P<id>[\w-]+)"
+    r"|\[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>~?=)\s*(?:\"(?P<dq>[^\"]*)\"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]*))\s*)?\]"
+)
+
+
+class _Selector:
+    """A compound CSS selector (tag, classes, id, attributes) matched against one element."""
+
+    __slots__ = ("tag", "classes", "attrs")
+
+    def __init__(self, text: str):
+        match = _COMPOUND.fullmatch(text.strip())
+        if not match or not text.strip():
+            raise ValueError(f"Field selectors must be compound selectors without combinators: {text!r}")
+        self.tag = match.group("tag") if match.group("tag") not in (None, "*") else None
+        classes = []
+        self.attrs: List[Tuple[str, Optional[str], Optional[str]]] = []
+        for part in _PART.finditer(match.group("rest")):
+            if part.group("cls"):
+                classes.append(part.group("cls"))
+            elif part.group("id"):
+                self.attrs.append(("id", "=", part.group("id")))
+            else:
+                value = next((part.group(key) for key in ("dq", "sq", "bare") if part.group(key) is not None), None)
+                self.attrs.append((part.group("attr"), part.group("op"), value))
+        self.classes = frozenset(classes)
+
+    def matches(self, element) -> bool:
+        if self.tag is not None and element.name != self.tag:
+            return False
+        if self.classes:
+            classes = element.get("class") or ()
+            if isinstance(classes, str):
+                classes = classes.split()
+            if not self.classes.issubset(classes):
+                return False
+        for name, op, expected in self.attrs:
+            actual = element.get(name)
+            if actual is None:
+                return False
+            if isinstance(actual, list):
+                actual = " ".join(actual)
+            if op == "=" and actual != expected:
+                return False
+            if op == "~=" and expected not in actual.split():
+                return False
+        return True
+
+
+class _Field:
+    __slots__ = ("name", "selector", "selectors", "attribute", "pattern", "post", "each_name", "each")
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        self.name = name
+        self.selector = spec.get("selector")
+        self.selectors = [_Selector(part) for part in self.selector.split(",")] if self.selector else None
+        self.attribute = spec.get("attribute")
+        try:
+            self.pattern = re.compile(spec["pattern"]) if spec.get("pattern") else None
+        except re.error as e:
+            raise ValueError(f"Bad pattern for field {name}: {str(e)}")
+        post = spec.get("post") or []
+        post = [post] if isinstance(post, str) else post
+        unknown = [processor for processor in post if processor not in POST_PROCESSORS]
+        if unknown:
+            raise ValueError(f"Unknown post processors for field {name}: {', '.join(unknown)}")
+        self.post = [POST_PROCESSORS[processor] for processor in post]
+        self.each_name = spec.get("each")
+        self.each: Optional["RecordExtractor"] = None
+
+    def matches(self, element) -> bool:
+        return any(selector.matches(element) for selector in self.selectors)
+
+
+class RecordExtractor:
+    """
+    One compiled spec. Selectors are parsed and patterns compiled once; each
+    container is then walked once, every element being checked against the
+    fields still missing, and the walk stops when all of them have a value.
+    """
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        self.name = name
+        self.spec = spec
+        self.container = spec.get("container")
+        self.fields = [_Field(field, field_spec) for field, field_spec in (spec.get("fields") or {}).items()]
+        self.required = list(spec.get("required") or [])
+        names = {field.name for field in self.fields}
+        missing = [field for field in self.required if field not in names]
+        if missing:
+            raise ValueError(f"Spec {name} requires fields it does not define: {', '.join(missing)}")
+
+    def js_fields(self) -> Dict[str, Dict[str, Any]]:
+        """The field selectors for in-page extraction; post processing is left to finish()."""
+        return {
+            field.name: {
+                "selector": field.selector,
+                "attribute": field.attribute,
+                "pattern": field.pattern.pattern if field.pattern else None,
+            }
+            for field in self.fields
+            if field.each_name is None
+        }
+
+    def extract(self, root, base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """A record per container under root (a parsed page or element), complete ones only."""
+        containers = root.select(self.container) if self.container else [root]
+        records = []
+        for container in containers:
+            record = self._record(container, base_url)
+            if self._complete(record):
+                records.append(record)
+        return records
+
+    def extract_one(self, root, base_url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The first complete record under root, or None."""
+        records = self.extract(root, base_url)
+        return records[0] if records else None
+
+    def finish(self, raw_records: List[Dict[str, Any]], base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Post-process records extracted in the page with js_fields() and drop incomplete ones."""
+        records = []
+        for raw in raw_records:
+            record = {
+                field.name: self._post(field, raw.get(field.name), base_url)
+                for field in self.fields
+                if field.each_name is None
+            }
+            if self._complete(record):
+                records.append(record)
+        return records
+
+    def _complete(self, record: Dict[str, Any]) -> bool:
+        return all(record.get(field) not in (None, "") for field in self.required)
+
+    def _record(self, container, base_url: Optional[str]) -> Dict[str, Any]:
+        values = {}
+        pending = []
+        for field in self.fields:
+            if field.selectors is None:
+                values[field.name] = self._read(field, container, base_url)
+            else:
+                pending.append(field)
+        if pending:
+            for element in container.descendants:
+                if not isinstance(element, _ELEMENT_TYPES):
+                    continue
+                matched = [field for field in pending if field.matches(element)]
+                for field in matched:
+                    values[field.name] = self._read(field, element, base_url)
+                    pending.remove(field)
+                if not pending:
+                    break
+        for field in pending:
+            values[field.name] = [] if field.each is not None else None
+        return {field.name: values[field.name] for field in self.fields}
+
+    def _read(self, field: _Field, element, base_url: Optional[str]) -> Any:
+        if field.each is not None:
+            return field.each.extract(element, base_url)
+        value = element.get(field.attribute) if field.attribute else element.get_text()
+        if isinstance(value, list):
+            value = " ".join(value)
+        value = value.strip() if value else None
+        if value and field.pattern:
+            match = field.pattern.search(value)
+            value = match.group() if match else None
+        return self._post(field, value, base_url)
+
+    @staticmethod
+    def _post(field: _Field, value: Any, base_url: Optional[str]) -> Any:
+        for processor in field.post:
+            if value in (None, ""):
+                return None
+            try:
+                value = processor(value, base_url)
+            except (TypeError, ValueError):
+                return None
+        return value
+
+
+def compile_specs(specs: Dict[str, Dict[str, Any]]) -> Dict[str, RecordExtractor]:
+    """Compile every spec and link "each" fields; raises ValueError for an invalid spec."""
+    extractors = {name: RecordExtractor(name, spec) for name, spec in specs.items()}
+    for extractor in extractors.values():
+        for field in extractor.fields:
+            if field.each_name is None:
+                continue
+            if field.each_name not in extractors:
+                raise ValueError(f"Field {extractor.name}.{field.name} uses unknown spec {field.each_name}")
+            field.each = extractors[field.each_name]
+    return extractors
+
+
+class ExtractionSpecs:
+    """
+    The compiled specs, kept in step with a JSON spec file.
+    The file maps spec names to specs and replaces or extends the built-in
+    defaults. Its modification time is checked at most every check_interval
+    seconds on lookup; when it changes the whole file is compiled and swapped
+    in at once, so running workers pick it up on their next page. A file that
+    fails to load or compile is logged and the current specs stay in use.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        defaults: Optional[Dict[str, Dict[str, Any]]] = None,
+        check_interval: float = 5.0
+    ):
+        self.path = path
+        self.defaults = DEFAULT_SPECS if defaults is None else defaults
+        self.check_interval = check_interval
+        self._extractors = compile_specs(self.defaults)
+        self._mtime: Optional[int] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.reload_errors = 0
+
+    def get(self, name: str) -> RecordExtractor:
+        """The compiled spec for name; raises KeyError for an unknown spec."""
+        self._check()
+        return self._extractors[name]
+
+    def _check(self):
+        if not self.path:
+            return
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        if not self._lock.acquire(blocking=False):
+            # Another worker is checking; use the specs we have
+            return
+        try:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self.reload()
+        finally:
+            self._lock.release()
+
+    def reload(self) -> bool:
+        """Load the spec file now; returns whether the new specs were swapped in."""
+        specs = dict(self.defaults)
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    overrides = json.load(f)
+                if not isinstance(overrides, dict):
+                    raise ValueError("the file must hold an object of specs")
+                specs.update(overrides)
+                extractors = compile_specs(specs)
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                self.reload_errors += 1
+                logger.warning(f"Keeping the current extraction specs; could not load {self.path}: {str(e)}")
+                return False
+        else:
+            extractors = compile_specs(specs)
+        self._extractors = extractors
+        self.reloads += 1
+        logger.info(f"Loaded {len(extractors)} extraction specs")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "specs": len(self._extractors),
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+        }
+
+
+extraction_specs = ExtractionSpecs(
+    path=settings.SCRAPER_EXTRACTION_SPECS_FILE,
+    check_interval=settings.SCRAPER_EXTRACTION_SPECS_CHECK_INTERVAL
+)
@@ -0,0 +1,253 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track the visit and never change the page
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "igshid", "ref_src", "srsltid",
+}
+TRACKING_PREFIXES = ("utm_", "hsa_", "pk_")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to the form used for de-duplication: lower-case scheme and host,
+    no default port, no fragment, no tracking parameters, remaining parameters
+    sorted and an empty path written as "/".
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    host = (parts.hostname or "").rstrip(".")
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host
+    if parts.username:
+        netloc = f"{parts.username}@{netloc}"
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(sorted(query)), ""))
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    Membership tests can give false positives at about error_rate once capacity
+    items are added, never false negatives. The number of set bits is kept as
+    bits are set, so the fill ratio costs nothing to read.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytearray] = None):
+        capacity = max(1, capacity)
+        error_rate = min(max(error_rate, 1e-9), 0.5)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.bits_set = bin(int.from_bytes(self.bits, "little")).count("1") if bits is not None else 0
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                self.bits_set += 1
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def fill_ratio(self) -> float:
+        return self.bits_set / self.size
+
+
+class FrontierJob:
+    """
+    The URLs admitted during one scraping job.
+    Within the job every canonical URL is admitted once; the shared frontier
+    additionally rejects URLs visited by earlier jobs within its TTL. The
+    canonical form is only the de-duplication key: admitted URLs are returned
+    as given, since sites may route on what canonicalization drops.
+    """
+
+    def __init__(self, frontier: "CrawlFrontier"):
+        self.frontier = frontier
+        self.seen: Set[str] = set()
+
+    def admit(self, url: str) -> Optional[str]:
+        """Return url if it should be fetched, or None if its canonical form is a repeat."""
+        canonical = canonicalize_url(url)
+        if canonical in self.seen:
+            self.frontier.duplicates += 1
+            return None
+        self.seen.add(canonical)
+        if self.frontier.recently_visited(canonical):
+            self.frontier.recent += 1
+            return None
+        self.frontier.admitted += 1
+        return url
+
+    def admit_all(self, urls: Iterable[str]) -> List[str]:
+        """Admit URLs in order, keeping the first of each canonical URL that passes."""
+        return [url for url in urls if self.admit(url)]
+
+
+class CrawlFrontier:
+    """
+    De-duplicates fetched URLs within and across scraping jobs.
+    Visits across jobs are kept in two Bloom filter generations, each ttl seconds
+    long: when the current generation is older than ttl it becomes the previous
+    one and the older one is dropped, so a visit is remembered for between ttl
+    and twice ttl. The filters can be saved to disk and survive restarts.
+    A ttl of 0 disables the cross-job check; each job still fetches a URL once.
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        path: Optional[str] = None,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001
+    ):
+        self.ttl = ttl
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.current: Optional[BloomFilter] = None
+        self.previous: Optional[BloomFilter] = None
+        self.started_at = 0.0
+        self.admitted = 0
+        self.duplicates = 0
+        self.recent = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def job(self) -> FrontierJob:
+        return FrontierJob(self)
+
+    def _new_filter(self, bits: Optional[bytearray] = None) -> BloomFilter:
+        return BloomFilter(self.capacity, self.error_rate, bits)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        self.current = self._new_filter()
+        self.started_at = time.time()
+        if self.path and os.path.exists(self.path):
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                header = json.loads(f.readline())
+                data = f.read()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read crawl frontier {self.path}: {str(e)}")
+            return
+        template = self._new_filter()
+        length = len(template.bits)
+        if header.get("size") != template.size or header.get("hashes") != template.hashes or len(data) != 2 * length:
+            logger.info(f"Crawl frontier {self.path} was built with other settings; starting fresh")
+            return
+        self.current = self._new_filter(bytearray(data[:length]))
+        self.previous = self._new_filter(bytearray(data[length:])) if header.get("has_previous") else None
+        self.started_at = header.get("started_at", self.started_at)
+
+    def _rotate(self):
+        age = time.time() - self.started_at
+        if age < self.ttl:
+            return
+        self.previous = self.current if age < 2 * self.ttl else None
+        self.current = self._new_filter()
+        self.started_at = time.time()
+
+    def recently_visited(self, canonical: str) -> bool:
+        if self.ttl <= 0:
+            return False
+        with self._lock:
+            self._ensure_loaded()
+            self._rotate()
+            return canonical in self.current or (self.previous is not None and canonical in self.previous)
+
+    def mark_visited(self, url: str):
+        """Record a fetched URL so later jobs skip it until the TTL runs out."""
+        if self.ttl <= 0:
+            return
+        canonical = canonicalize_url(url)
+        with self._lock:
+            self._ensure_loaded()
+            self._rotate()
+            self.current.add(canonical)
+
+    def save(self):
+        """Write both generations to disk, replacing the previous file atomically."""
+        if self.ttl <= 0 or not self.path:
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            header = {
+                "size": self.current.size,
+                "hashes": self.current.hashes,
+                "started_at": self.started_at,
+                "has_previous": self.previous is not None,
+            }
+            previous = self.previous.bits if self.previous is not None else bytearray(len(self.current.bits))
+            data = json.dumps(header).encode() + b"\n" + bytes(self.current.bits) + bytes(previous)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "wb") as f:
+                f.write(data)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write crawl frontier {self.path}: {str(e)}")
+
+    def stats(self) -> Dict[str, float]:
+        stats = {
+            "ttl": self.ttl,
+            "admitted": self.admitted,
+            "duplicates": self.duplicates,
+            "recently_visited": self.recent,
+        }
+        with self._lock:
+            if self.current is not None:
+                stats["bloom_bytes"] = len(self.current.bits) * (2 if self.previous is not None else 1)
+                stats["bloom_fill_ratio"] = round(self.current.fill_ratio(), 4)
+        return stats
+
+
+crawl_frontier = CrawlFrontier(
+    ttl=settings.SCRAPER_FRONTIER_TTL,
+    path=settings.SCRAPER_FRONTIER_FILE,
+    capacity=settings.SCRAPER_FRONTIER_CAPACITY,
+    error_rate=settings.SCRAPER_FRONTIER_ERROR_RATE
+)
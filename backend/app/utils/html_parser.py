@@ -0,0 +1,345 @@
+import codecs
+import logging
+import re
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from bs4 import BeautifulSoup
+
+if __package__:
+    from ..core.config import settings
+else:
+    # The standalone scripts in backend/ load this file as a top-level module
+    settings = None
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("lxml", "selectolax", "html.parser")
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.I)
+_RAW_TEXT_TAGS = ("script", "style", "template")
+_SNIFF_BYTES = 4096
+_UTF8_PROBE_BYTES = 65536
+
+
+def available_backends() -> List[str]:
+    """Return the parser backends that can be used in this environment."""
+    backends = []
+    if HAS_LXML:
+        backends.append("lxml")
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    backends.append("html.parser")
+    return backends
+
+
+def _codec_name(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().strip('"\'')).name
+    except LookupError:
+        return None
+
+
+def sniff_encoding(data: bytes, declared: Optional[str] = None) -> str:
+    """
+    Pick the charset for a raw HTML body: byte order mark, then the charset the
+    server declared in Content-Type, then a <meta> charset near the top of the
+    document, then UTF-8 if the start of the body decodes cleanly, else cp1252.
+    """
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    encoding = _codec_name(declared)
+    if encoding:
+        return encoding
+    match = _META_CHARSET.search(data[:_SNIFF_BYTES])
+    encoding = _codec_name(match.group(1).decode("ascii", "ignore")) if match else None
+    if encoding:
+        return encoding
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(data[:_UTF8_PROBE_BYTES], final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+
+class HTMLParser:
+    """
+    Parses HTML with a configurable backend.
+    "lxml" and "html.parser" return a BeautifulSoup tree; "selectolax" returns a
+    SelectolaxSoup, which answers the same find/find_all/get_text calls the
+    scrapers use. "auto" picks lxml when it is installed.
+    """
+
+    def __init__(self, backend: str = "auto"):
+        self.backend = self.resolve(backend)
+
+    @staticmethod
+    def resolve(backend: str) -> str:
+        backend = (backend or "auto").lower()
+        available = available_backends()
+        if backend == "auto":
+            return available[0] if available[0] != "selectolax" else "html.parser"
+        if backend not in available:
+            logger.warning(f"HTML parser backend {backend} is not available, using html.parser")
+            return "html.parser"
+        return backend
+
+    def parse(self, markup: Union[str, bytes], charset: Optional[str] = None):
+        """
+        Parse a document from text or from the raw response bytes.
+        For bytes, charset is the Content-Type charset if known; the encoding is
+        sniffed from the body and handed to the parser, which decodes natively.
+        """
+        if self.backend == "selectolax":
+            if isinstance(markup, bytes):
+                markup = markup.decode(sniff_encoding(markup, charset), errors="replace")
+            return SelectolaxSoup(LexborHTMLParser(markup))
+        if isinstance(markup, bytes):
+            return BeautifulSoup(markup, self.backend, from_encoding=sniff_encoding(markup, charset))
+        return BeautifulSoup(markup, self.backend)
+
+
+def _is_element(node) -> bool:
+    return node is not None and not node.tag.startswith(("-", "_"))
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _match_value(key: str, actual: Optional[str], expected: Any) -> bool:
+    """Match one attribute the way BeautifulSoup does for the filters we use."""
+    if expected is True:
+        return actual is not None
+    if expected is None or expected is False:
+        return actual is None
+    if isinstance(expected, (list, tuple, set)):
+        return any(_match_value(key, actual, item) for item in expected)
+    if callable(expected) and not hasattr(expected, "search"):
+        return bool(expected(actual))
+    if actual is None:
+        return False
+    candidates = [actual] + (actual.split() if key == "class" else [])
+    if hasattr(expected, "search"):
+        return any(expected.search(candidate) for candidate in candidates)
+    return expected in candidates
+
+
+class SelectolaxNode:
+    """BeautifulSoup-compatible view of a selectolax node for the calls the scrapers make."""
+
+    def __init__(self, node):
+        self._node = node
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SelectolaxNode) and other._node.mem_id == self._node.mem_id
+
+    def __hash__(self) -> int:
+        return self._node.mem_id
+
+    def __repr__(self) -> str:
+        return self._node.html or ""
+
+    __str__ = __repr__
+
+    @property
+    def name(self) -> str:
+        return self._node.tag
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        attrs = {key: value if value is not None else "" for key, value in self._node.attributes.items()}
+        if "class" in attrs:
+            attrs["class"] = attrs["class"].split()
+        return attrs
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attrs.get(key, default)
+
+    def has_attr(self, key: str) -> bool:
+        return key in self._node.attributes
+
+    def __getitem__(self, key: str) -> Any:
+        return self.attrs[key]
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        """Like BeautifulSoup, leave out script/style contents unless called on those tags."""
+        node = self._node
+        if node.tag in _RAW_TEXT_TAGS or node.css_first(", ".join(_RAW_TEXT_TAGS)) is None:
+            return node.text(deep=True, separator=separator, strip=strip)
+        parts = []
+        stack = list(node.iter(include_text=True))[::-1]
+        while stack:
+            child = stack.pop()
+            if child.tag == "-text":
+                parts.append(child.text(deep=False))
+            elif _is_element(child) and child.tag not in _RAW_TEXT_TAGS:
+                stack.extend(list(child.iter(include_text=True))[::-1])
+        if strip:
+            parts = [part.strip() for part in parts if part.strip()]
+        return separator.join(parts)
+
+    @property
+    def parent(self) -> Optional["SelectolaxNode"]:
+        parent = self._node.parent
+        return SelectolaxNode(parent) if _is_element(parent) else None
+
+    def _descendants(self) -> Iterator[Any]:
+        nodes = self._node.traverse()
+        next(nodes, None)
+        return nodes
+
+    @property
+    def descendants(self) -> Iterator["SelectolaxNode"]:
+        """The elements under this one in document order; unlike BeautifulSoup, no text nodes."""
+        return (SelectolaxNode(node) for node in self._descendants() if _is_element(node))
+
+    def _following(self) -> Iterator[Any]:
+        """Every node after this one in document order, starting with its children."""
+        yield from self._descendants()
+        node = self._node
+        while node is not None:
+            sibling = node.next
+            while sibling is not None:
+                yield from sibling.traverse()
+                sibling = sibling.next
+            node = node.parent
+
+    def _matches(self, node, name: Any, attrs: Dict[str, Any]) -> bool:
+        if not _is_element(node):
+            return False
+        if isinstance(name, str) and node.tag != name:
+            return False
+        if isinstance(name, (list, tuple, set)) and node.tag not in name:
+            return False
+        if callable(name) and not isinstance(name, str):
+            if not name(SelectolaxNode(node)):
+                return False
+        node_attrs = node.attributes
+        for key, expected in attrs.items():
+            actual = (node_attrs[key] or "") if key in node_attrs else None
+            if not _match_value(key, actual, expected):
+                return False
+        return True
+
+    @staticmethod
+    def _filters(name: Any, attrs: Any, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if kwargs.keys() & {"string", "text"}:
+            raise TypeError("string/text filters are not supported by the selectolax backend")
+        if isinstance(attrs, str):
+            attrs = {"class": attrs}
+        filters = dict(attrs or {})
+        for key, value in kwargs.items():
+            filters["class" if key == "class_" else key] = value
+        return filters
+
+    @staticmethod
+    def _css_for(name: Any, filters: Dict[str, Any]) -> Optional[str]:
+        """A CSS selector equivalent to the filters, or None when only a scan can express them."""
+        if name is not None and not isinstance(name, str):
+            return None
+        selector = name or "*"
+        for key, value in filters.items():
+            if value is True:
+                selector += f"[{key}]"
+            elif isinstance(value, str) and not (key == "class" and " " in value):
+                operator = "~=" if key == "class" else "="
+                selector += f"[{key}{operator}{_css_string(value)}]"
+            else:
+                return None
+        return selector
+
+    def _css(self, selector: str) -> List[Any]:
+        own_id = self._node.mem_id
+        return [node for node in self._node.css(selector) if node.mem_id != own_id]
+
+    def find_all(
+        self,
+        name: Any = None,
+        attrs: Any = None,
+        recursive: bool = True,
+        limit: Optional[int] = None,
+        **kwargs
+    ) -> List["SelectolaxNode"]:
+        filters = self._filters(name, attrs, kwargs)
+        if recursive:
+            selector = self._css_for(name, filters)
+            if selector is not None:
+                found = self._css(selector)
+            else:
+                found = [node for node in self._descendants() if self._matches(node, name, filters)]
+        else:
+            found = [node for node in self._node.iter() if self._matches(node, name, filters)]
+        if limit:
+            found = found[:limit]
+        return [SelectolaxNode(node) for node in found]
+
+    def find(self, name: Any = None, attrs: Any = None, recursive: bool = True, **kwargs) -> Optional["SelectolaxNode"]:
+        found = self.find_all(name, attrs, recursive=recursive, limit=1, **kwargs)
+        return found[0] if found else None
+
+    def find_next(self, name: Any = None, attrs: Any = None, **kwargs) -> Optional["SelectolaxNode"]:
+        filters = self._filters(name, attrs, kwargs)
+        for node in self._following():
+            if self._matches(node, name, filters):
+                return SelectolaxNode(node)
+        return None
+
+    def find_parent(self, name: Any = None, attrs: Any = None, **kwargs) -> Optional["SelectolaxNode"]:
+        filters = self._filters(name, attrs, kwargs)
+        node = self._node.parent
+        while _is_element(node):
+            if self._matches(node, name, filters):
+                return SelectolaxNode(node)
+            node = node.parent
+        return None
+
+    def select(self, selector: str) -> List["SelectolaxNode"]:
+        return [SelectolaxNode(node) for node in self._css(selector)]
+
+    def select_one(self, selector: str) -> Optional["SelectolaxNode"]:
+        found = self.select(selector)
+        return found[0] if found else None
+
+
+class SelectolaxSoup(SelectolaxNode):
+    """The document: like BeautifulSoup, its searches include the <html> element itself."""
+
+    def __init__(self, tree):
+        super().__init__(tree.root)
+        self.tree = tree
+
+    def _descendants(self) -> Iterator[Any]:
+        return self._node.traverse()
+
+    def _css(self, selector: str) -> List[Any]:
+        return self.tree.css(selector)
+
+    @property
+    def parent(self) -> None:
+        return None
+
+
+html_parser = HTMLParser(settings.HTML_PARSER_BACKEND) if settings else HTMLParser()
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SharedHTTPClient:
+    """Process-wide aiohttp session with a tuned, reusable connection pool."""
+
+    def __init__(
+        self,
+        limit: int,
+        limit_per_host: int,
+        dns_cache_ttl: int,
+        keepalive_timeout: float,
+        timeout: float
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._counters = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+        }
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Count requests, connection reuse and DNS cache behaviour."""
+        trace_config = aiohttp.TraceConfig()
+
+        def count(name: str):
+            async def handler(session, context, params):
+                self._counters[name] += 1
+            return handler
+
+        trace_config.on_request_start.append(count("requests"))
+        trace_config.on_connection_create_end.append(count("connections_created"))
+        trace_config.on_connection_reuseconn.append(count("connections_reused"))
+        trace_config.on_dns_cache_hit.append(count("dns_cache_hits"))
+        trace_config.on_dns_cache_miss.append(count("dns_cache_misses"))
+        return trace_config
+
+    async def start(self):
+        """Open the pool. Called once from application startup."""
+        if self.session and not self.session.closed:
+            return
+        self._connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self.session = aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[self._trace_config()]
+        )
+        self._loop = asyncio.get_running_loop()
+        logger.info("HTTP client pool started")
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Borrow the shared session, opening the pool on first use.
+        A session left over from a different event loop (e.g. a previous asyncio.run
+        in a script) is replaced, since aiohttp sessions cannot cross loops.
+        """
+        if self.session and not self.session.closed and self._loop is not asyncio.get_running_loop():
+            self.session = None
+        await self.start()
+        return self.session
+
+    async def close(self):
+        """Close the pool. Called once from application shutdown."""
+        if self.session and not self.session.closed:
+            await self.session.close()
+            logger.info("HTTP client pool closed")
+        self.session = None
+        self._connector = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool limits, current usage and reuse counters."""
+        in_use = idle = 0
+        if self._connector and not self._connector.closed:
+            in_use = len(getattr(self._connector, "_acquired", ()))
+            idle = sum(len(conns) for conns in getattr(self._connector, "_conns", {}).values())
+        return {
+            "open": bool(self.session and not self.session.closed),
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "dns_cache_ttl": self.dns_cache_ttl,
+            "in_use": in_use,
+            "idle": idle,
+            **self._counters,
+        }
+
+
+http_client = SharedHTTPClient(
+    limit=settings.HTTP_POOL_LIMIT,
+    limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+    dns_cache_ttl=settings.HTTP_DNS_CACHE_TTL,
+    keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+    timeout=settings.HTTP_TIMEOUT
+)
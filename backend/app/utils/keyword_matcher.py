@@ -0,0 +1,76 @@
+import re
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed keyword list.
+    Compile it once and reuse it: each scan finds every occurrence of every
+    keyword, overlapping ones included, in a single pass over the text.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for index, keyword in enumerate(self.keywords):
+            if keyword:
+                self._add(keyword, index)
+        self._build_failure_links()
+        # From the root state, skip straight to the next character that can start a keyword
+        first_chars = sorted({keyword[0] for keyword in self.keywords if keyword})
+        self._start = re.compile("|".join(re.escape(char) for char in first_chars)) if first_chars else None
+
+    def _add(self, keyword: str, index: int):
+        state = 0
+        for char in keyword:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._out[state].append(index)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start position, keyword index) for every keyword occurrence in text."""
+        if self._start is None:
+            return
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        state = 0
+        position = 0
+        length = len(text)
+        while position < length:
+            if state == 0:
+                match = self._start.search(text, position)
+                if not match:
+                    return
+                position = match.start()
+            char = text[position]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                yield position - len(keywords[index]) + 1, index
+            position += 1
+
+    def positions(self, text: str) -> List[List[int]]:
+        """Return the sorted start positions of each keyword, indexed like the keyword list."""
+        found: List[List[int]] = [[] for _ in self.keywords]
+        for start, index in self.iter_matches(text):
+            found[index].append(start)
+        return found
@@ -0,0 +1,109 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+if __package__:
+    from ..core.config import settings
+else:
+    # The standalone scripts in backend/ load this file as a top-level module
+    settings = None
+
+logger = logging.getLogger(__name__)
+
+_BODY_END = b"</body"
+
+
+@dataclass
+class DownloadResult:
+    """A page body read under the size cap, or the reason it was not read."""
+    body: bytes
+    truncated: bool = False
+    skipped: Optional[str] = None
+
+
+class PageDownloader:
+    """
+    Streams response bodies with a byte cap.
+    Headers are checked first: non-HTML content types are skipped without
+    reading the body. The body is read in chunks and reading stops at the cap
+    or as soon as </body> has arrived, since nothing after it is extracted.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        chunk_size: int = 64 * 1024,
+        allowed_types: Iterable[str] = ("text/html", "application/xhtml+xml", "text/plain")
+    ):
+        self.max_bytes = max(1, max_bytes)
+        self.chunk_size = max(1, chunk_size)
+        self.allowed_types = tuple(content_type.strip().lower() for content_type in allowed_types)
+        self.pages = 0
+        self.truncated = 0
+        self.skipped = 0
+        self.stopped_at_body_end = 0
+        self.bytes_read = 0
+
+    def skip_reason(self, response) -> Optional[str]:
+        """Why a response should not be read, judged from its headers alone."""
+        content_type = (response.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+        if content_type and self.allowed_types and content_type not in self.allowed_types:
+            return f"content type {content_type}"
+        return None
+
+    async def read(self, response) -> DownloadResult:
+        """Read the body of an aiohttp response, stopping at the cap or at </body>."""
+        reason = self.skip_reason(response)
+        if reason:
+            self.skipped += 1
+            logger.info(f"Skipped {response.url}: {reason}")
+            return DownloadResult(b"", skipped=reason)
+
+        content_length = response.headers.get("Content-Length")
+        expected = int(content_length) if content_length and content_length.isdigit() else None
+        if expected is not None and expected > self.max_bytes:
+            logger.info(f"{response.url} is {expected} bytes; reading the first {self.max_bytes}")
+
+        body = bytearray()
+        truncated = False
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            # Look for </body> across the boundary with the previous chunk
+            search_from = max(0, len(body) - len(_BODY_END))
+            room = self.max_bytes - len(body)
+            body += chunk[:room]
+            if _BODY_END in body[search_from:].lower():
+                self.stopped_at_body_end += 1
+                break
+            if len(body) >= self.max_bytes:
+                truncated = len(chunk) > room or not response.content.at_eof()
+                break
+
+        self.pages += 1
+        self.bytes_read += len(body)
+        if truncated:
+            self.truncated += 1
+        return DownloadResult(bytes(body), truncated=truncated)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_bytes": self.max_bytes,
+            "pages": self.pages,
+            "bytes_read": self.bytes_read,
+            "truncated": self.truncated,
+            "skipped": self.skipped,
+            "stopped_at_body_end": self.stopped_at_body_end,
+        }
+
+
+if settings:
+    page_downloader = PageDownloader(
+        max_bytes=settings.SCRAPER_MAX_PAGE_BYTES,
+        chunk_size=settings.SCRAPER_DOWNLOAD_CHUNK_BYTES,
+        allowed_types=[
+            content_type for content_type in settings.SCRAPER_ALLOWED_CONTENT_TYPES.split(',')
+            if content_type.strip()
+        ]
+    )
+else:
+    # Page bodies are read up to 2 MB, stopping at </body>
+    page_downloader = PageDownloader(max_bytes=2 * 1024 * 1024)
@@ -0,0 +1,52 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def crawl_pages(
+    fetch: Callable[[int], Awaitable[Optional[T]]],
+    parse: Callable[[T], List[R]],
+    total_pages: int,
+    window: int = 2,
+    first_page: int = 1
+) -> AsyncIterator[Tuple[int, List[R]]]:
+    """
+    Yield (page, results) in page order while up to window later pages are fetched.
+    parse runs in a worker thread so the prefetches keep progressing meanwhile.
+    A page fetch returns None for could not be loaded and is skipped; a source
+    that keeps refusing is stopped by the exception its circuit breaker raises.
+    The crawl stops after total_pages, at the first page that parses to no
+    results or at an exception, and cancels whatever was prefetched beyond it.
+    """
+    window = max(0, window)
+    pending: Dict[int, asyncio.Task] = {}
+    next_page = first_page
+
+    def fill_window():
+        nonlocal next_page
+        while next_page <= total_pages and len(pending) <= window:
+            pending[next_page] = asyncio.ensure_future(fetch(next_page))
+            next_page += 1
+
+    try:
+        for page in range(first_page, total_pages + 1):
+            fill_window()
+            raw = await pending.pop(page)
+            fill_window()
+            if raw is None:
+                logger.warning(f"Page {page} could not be loaded; skipping it")
+                continue
+            results = await asyncio.to_thread(parse, raw)
+            if not results:
+                logger.info(f"Page {page} returned no results; stopping pagination")
+                break
+            yield page, results
+    finally:
+        for task in pending.values():
+            task.cancel()
+        await asyncio.gather(*pending.values(), return_exceptions=True)
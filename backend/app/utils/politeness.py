@@ -0,0 +1,58 @@
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+
+from ..core.config import settings
+from .concurrency import host_of
+
+
+def parse_crawl_delays(value: Optional[str]) -> Dict[str, float]:
+    """Parse a "host=seconds,host=seconds" setting into a dictionary."""
+    delays = {}
+    for item in (value or "").split(','):
+        if '=' not in item:
+            continue
+        host, delay = item.split('=', 1)
+        try:
+            delays[host.strip().lower()] = float(delay)
+        except ValueError:
+            continue
+    return delays
+
+
+class PolitenessScheduler:
+    def __init__(self, min_delay: float, max_delay: float, crawl_delays: Optional[Dict[str, float]] = None):
+        self.min_delay = min_delay
+        self.max_delay = max(min_delay, max_delay)
+        self.crawl_delays: Dict[str, float] = dict(crawl_delays or {})
+        self._next_slot: Dict[str, float] = {}
+
+    def set_crawl_delay(self, host: str, delay: float):
+        """Set the minimum spacing for a host, e.g. from robots.txt."""
+        self.crawl_delays[host.lower()] = delay
+
+    def spacing(self, host: str) -> float:
+        """Return the jittered spacing to keep before the next request to a host."""
+        jitter = random.uniform(self.min_delay, self.max_delay)
+        return max(jitter, self.crawl_delays.get(host, 0.0))
+
+    async def wait(self, url: str):
+        """
+        Wait until a request to the URL's host is allowed.
+        Each caller reserves its start time before sleeping, so concurrent callers for
+        the same host queue up one spacing apart while other hosts are not held back.
+        """
+        host = host_of(url)
+        now = time.monotonic()
+        start = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = start + self.spacing(host)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+scheduler = PolitenessScheduler(
+    min_delay=settings.SCRAPER_MIN_DELAY,
+    max_delay=settings.SCRAPER_MAX_DELAY,
+    crawl_delays=parse_crawl_delays(settings.SCRAPER_CRAWL_DELAYS)
+)
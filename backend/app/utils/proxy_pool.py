@@ -0,0 +1,168 @@
+import logging
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from ..core.config import settings
+from .block_detection import BAN_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+def parse_proxy_list(value: Optional[str]) -> List[str]:
+    """Parse a comma-separated PROXY_LIST into proxy URLs, defaulting to http://."""
+    proxies = []
+    for item in (value or "").split(','):
+        item = item.strip()
+        if not item:
+            continue
+        proxies.append(item if "://" in item else f"http://{item}")
+    return list(dict.fromkeys(proxies))
+
+
+def proxy_label(proxy: str) -> str:
+    """host:port of a proxy URL, without credentials, for logs and stats."""
+    parts = urlsplit(proxy)
+    return f"{parts.hostname}:{parts.port}" if parts.port else str(parts.hostname)
+
+
+@dataclass
+class ProxyHealth:
+    """Outcome counters and smoothed latency for one proxy."""
+    url: str
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    bans: int = 0
+    consecutive_failures: int = 0
+    cooldowns: int = 0
+    latency: Optional[float] = None
+    cooldown_until: float = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        # One assumed success and failure, so untried proxies still get picked
+        return (self.successes + 1) / (self.requests + 2)
+
+    def score(self, default_latency: float) -> float:
+        latency = self.latency if self.latency is not None else default_latency
+        return self.success_rate ** 2 / max(latency, 0.05)
+
+
+class ProxyPool:
+    """
+    Rotates proxies per request, weighted by health.
+    Each request reports its status, latency and whether it hit a block; proxies
+    are picked at random with weight success_rate² / latency, so fast healthy
+    proxies carry most of the traffic while the others are still sampled.
+    A block (403, 429, challenge page) or failure_threshold consecutive errors
+    put a proxy on cooldown, doubling with each repeat up to max_cooldown.
+    """
+
+    def __init__(
+        self,
+        proxies: List[str],
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+        ban_cooldown: float = 600.0,
+        max_cooldown: float = 3600.0,
+        latency_alpha: float = 0.3
+    ):
+        self.proxies: Dict[str, ProxyHealth] = {proxy: ProxyHealth(proxy) for proxy in proxies}
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.ban_cooldown = ban_cooldown
+        self.max_cooldown = max_cooldown
+        self.latency_alpha = latency_alpha
+        self.exhausted = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.proxies)
+
+    def acquire(self) -> Optional[str]:
+        """
+        Pick a proxy for one request, or None when no proxies are configured.
+        When every proxy is cooling down the one that recovers first is used,
+        rather than falling back to a direct connection.
+        """
+        if not self.proxies:
+            return None
+        now = time.monotonic()
+        ready = [health for health in self.proxies.values() if health.cooldown_until <= now]
+        if not ready:
+            self.exhausted += 1
+            return min(self.proxies.values(), key=lambda health: health.cooldown_until).url
+        latencies = [health.latency for health in ready if health.latency is not None]
+        default_latency = statistics.median(latencies) if latencies else 1.0
+        weights = [health.score(default_latency) for health in ready]
+        return random.choices(ready, weights=weights)[0].url
+
+    def report(
+        self,
+        proxy: Optional[str],
+        status: Optional[int] = None,
+        latency: Optional[float] = None,
+        error: bool = False,
+        blocked: bool = False
+    ):
+        """Record the outcome of a request made through proxy."""
+        health = self.proxies.get(proxy) if proxy else None
+        if health is None:
+            return
+        health.requests += 1
+        if latency is not None and not error:
+            if health.latency is None:
+                health.latency = latency
+            else:
+                health.latency += self.latency_alpha * (latency - health.latency)
+
+        if blocked or status in BAN_STATUSES:
+            health.bans += 1
+            health.consecutive_failures += 1
+            self._cool_down(health, self.ban_cooldown, f"blocked (status {status})")
+        elif error or (status is not None and status >= 500):
+            health.failures += 1
+            health.consecutive_failures += 1
+            if health.consecutive_failures >= self.failure_threshold:
+                self._cool_down(health, self.cooldown, f"{health.consecutive_failures} failures in a row")
+        else:
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.cooldowns = 0
+
+    def _cool_down(self, health: ProxyHealth, base: float, reason: str):
+        duration = min(self.max_cooldown, base * 2 ** min(health.cooldowns, 10))
+        health.cooldowns += 1
+        health.cooldown_until = time.monotonic() + duration
+        logger.warning(f"Proxy {proxy_label(health.url)} {reason}; cooling down for {duration:.0f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "proxies": len(self.proxies),
+            "available": sum(1 for health in self.proxies.values() if health.cooldown_until <= now),
+            "exhausted": self.exhausted,
+            "by_proxy": {
+                proxy_label(health.url): {
+                    "requests": health.requests,
+                    "success_rate": round(health.successes / health.requests, 3) if health.requests else None,
+                    "bans": health.bans,
+                    "failures": health.failures,
+                    "latency": round(health.latency, 3) if health.latency is not None else None,
+                    "cooldown_remaining": round(max(0.0, health.cooldown_until - now), 1),
+                }
+                for health in self.proxies.values()
+            },
+        }
+
+
+proxy_pool = ProxyPool(
+    parse_proxy_list(settings.PROXY_LIST),
+    failure_threshold=settings.PROXY_FAILURE_THRESHOLD,
+    cooldown=settings.PROXY_COOLDOWN,
+    ban_cooldown=settings.PROXY_BAN_COOLDOWN,
+    max_cooldown=settings.PROXY_MAX_COOLDOWN
+)
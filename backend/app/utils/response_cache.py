@@ -0,0 +1,246 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from ..core.config import settings
+from .html_parser import sniff_encoding
+from .page_download import PageDownloader, page_downloader
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """A cached GET response body with the validators needed to revalidate it."""
+    url: str
+    status: int
+    text: str
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    from_cache: bool = False
+    truncated: bool = False
+    skipped: Optional[str] = None
+    retry_after: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+def parse_source_ttls(value: Optional[str]) -> Dict[str, int]:
+    """Parse a "source=seconds,source=seconds" setting into a dictionary."""
+    ttls = {}
+    for item in (value or "").split(','):
+        if '=' not in item:
+            continue
+        source, ttl = item.split('=', 1)
+        try:
+            ttls[source.strip().lower()] = int(ttl)
+        except ValueError:
+            continue
+    return ttls
+
+
+class ResponseCache:
+    """
+    Size-bounded on-disk cache for scraped pages.
+    Each entry is one JSON file; file modification time doubles as the LRU clock,
+    so the LRU order survives restarts.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        default_ttl: int,
+        source_ttls: Optional[Dict[str, int]] = None,
+        downloader: Optional[PageDownloader] = None
+    ):
+        self.directory = directory
+        self.downloader = downloader
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.source_ttls = source_ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load_index(self):
+        """Build the LRU index from the entries already on disk."""
+        self._loaded = True
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def ttl_for(self, source: str, cache_control: Optional[str]) -> Optional[int]:
+        """
+        Return how long a response stays fresh, or None if it must not be stored.
+        A per-source TTL override wins over the server's max-age.
+        """
+        directives = (cache_control or "").lower()
+        if "no-store" in directives:
+            return None
+        if source in self.source_ttls:
+            return self.source_ttls[source]
+        if "no-cache" in directives:
+            return 0
+        match = re.search(r"max-age=(\d+)", directives)
+        if match:
+            return int(match.group(1))
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Read an entry and mark it as recently used."""
+        with self._lock:
+            return self._get(url)
+
+    def _get(self, url: str) -> Optional[CachedResponse]:
+        if not self._loaded:
+            self._load_index()
+        key = hashlib.sha256(url.encode()).hexdigest()
+        if key not in self._index:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = CachedResponse(**json.load(f))
+            os.utime(self._path(key))
+        except (OSError, ValueError, TypeError):
+            self._discard(key)
+            return None
+        self._index.move_to_end(key)
+        entry.from_cache = True
+        return entry
+
+    def put(self, entry: CachedResponse):
+        """Write an entry, then evict least recently used entries over the size bound."""
+        with self._lock:
+            self._put(entry)
+
+    def _put(self, entry: CachedResponse):
+        if not self._loaded:
+            self._load_index()
+        key = hashlib.sha256(entry.url.encode()).hexdigest()
+        data = json.dumps({**asdict(entry), "from_cache": False})
+        try:
+            with open(self._path(key), "w", encoding="utf-8") as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry for {entry.url}: {str(e)}")
+            return
+        self._total_bytes += len(data.encode()) - self._index.pop(key, 0)
+        self._index[key] = len(data.encode())
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            self._discard(next(iter(self._index)))
+
+    def _discard(self, key: str):
+        self._total_bytes -= self._index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    async def fetch(
+        self,
+        session,
+        url: str,
+        source: str = "web",
+        before_request: Optional[Callable[[], Awaitable]] = None,
+        **kwargs
+    ) -> CachedResponse:
+        """
+        GET a URL through the cache.
+        Fresh entries are returned without a request; stale entries are revalidated
+        with If-None-Match / If-Modified-Since and reused on 304 Not Modified.
+        before_request (rate limiting, politeness) only runs when the network is used.
+        Only 200 responses are stored. With a downloader the body is streamed
+        under its size cap; responses it skips are returned empty, and neither they
+        nor bodies cut at the cap are stored, so the next fetch reads the page again.
+        """
+        entry = await asyncio.to_thread(self.get, url)
+        if entry and entry.fresh:
+            self.hits += 1
+            return entry
+        if before_request is not None:
+            await before_request()
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        async with session.get(url, headers=headers, **kwargs) as response:
+            ttl = self.ttl_for(source, response.headers.get("Cache-Control"))
+            if response.status == 304 and entry:
+                self.revalidated += 1
+                if ttl is not None:
+                    entry.expires_at = time.time() + ttl
+                    entry.etag = response.headers.get("ETag", entry.etag)
+                    entry.last_modified = response.headers.get("Last-Modified", entry.last_modified)
+                    await asyncio.to_thread(self.put, entry)
+                return entry
+
+            self.misses += 1
+            truncated = False
+            skipped = None
+            if self.downloader is None:
+                text = await response.text()
+            else:
+                download = await self.downloader.read(response)
+                text = download.body.decode(sniff_encoding(download.body, response.charset), errors="replace")
+                truncated, skipped = download.truncated, download.skipped
+            result = CachedResponse(
+                url=url,
+                status=response.status,
+                text=text,
+                expires_at=time.time() + (ttl or 0),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                truncated=truncated,
+                skipped=skipped,
+                retry_after=response.headers.get("Retry-After")
+            )
+            if response.status == 200 and ttl is not None and skipped is None and not truncated:
+                await asyncio.to_thread(self.put, result)
+            return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+
+
+response_cache = ResponseCache(
+    directory=settings.SCRAPER_CACHE_DIR,
+    max_bytes=settings.SCRAPER_CACHE_MAX_BYTES,
+    default_ttl=settings.SCRAPER_CACHE_TTL,
+    source_ttls=parse_source_ttls(settings.SCRAPER_CACHE_SOURCE_TTLS),
+    downloader=page_downloader
+)
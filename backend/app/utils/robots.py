@@ -0,0 +1,313 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..core.config import settings
+from .concurrency import host_of
+from .politeness import PolitenessScheduler, scheduler
+
+logger = logging.getLogger(__name__)
+
+# Robots files are cut off here, as RFC 9309 allows
+MAX_ROBOTS_BYTES = 500 * 1024
+ROBOTS_CHUNK_BYTES = 64 * 1024
+
+
+class _TrieNode:
+    __slots__ = ("children", "allow")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.allow: Optional[bool] = None
+
+
+class RobotsRules:
+    """
+    The Allow/Disallow rules of one robots.txt group.
+    Plain path prefixes live in a character trie, so a check walks the path once
+    and the deepest rule on the way is the longest match. Rules with * or $ are
+    matched as regular expressions; sites rarely have more than a handful.
+    The longest matching rule wins and Allow wins a tie.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, bool]] = (), crawl_delay: Optional[float] = None):
+        self.crawl_delay = crawl_delay
+        self._root = _TrieNode()
+        self._patterns: List[Tuple[int, bool, "re.Pattern"]] = []
+        for pattern, allow in rules:
+            if not pattern:
+                # "Disallow:" with no path allows everything
+                continue
+            if "*" in pattern or pattern.endswith("$"):
+                anchored = pattern.endswith("$")
+                regex = "".join(".*" if char == "*" else re.escape(char) for char in pattern.rstrip("$"))
+                self._patterns.append((len(pattern), allow, re.compile(regex + ("$" if anchored else ""))))
+                continue
+            node = self._root
+            for char in pattern:
+                node = node.children.setdefault(char, _TrieNode())
+            node.allow = allow if node.allow is None else (node.allow or allow)
+
+    @classmethod
+    def allow_all(cls) -> "RobotsRules":
+        return cls()
+
+    @classmethod
+    def disallow_all(cls) -> "RobotsRules":
+        return cls([("/", False)])
+
+    def allowed(self, path: str) -> bool:
+        best_length = 0
+        best_allow = True
+        node = self._root
+        for depth, char in enumerate(path, 1):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.allow is not None:
+                best_length, best_allow = depth, node.allow
+        for length, allow, regex in self._patterns:
+            if length > best_length or (length == best_length and allow and not best_allow):
+                if regex.match(path):
+                    best_length, best_allow = length, allow
+        return best_allow
+
+
+@dataclass
+class _Group:
+    agents: List[str] = field(default_factory=list)
+    rules: List[Tuple[str, bool]] = field(default_factory=list)
+    crawl_delay: Optional[float] = None
+    closed: bool = False
+
+
+def parse_robots(text: str, user_agent: str = "*") -> RobotsRules:
+    """
+    Parse robots.txt and return the rules for user_agent: the groups naming our
+    product token if any do, otherwise the "*" groups. Matching groups are merged.
+    """
+    groups: List[_Group] = []
+    group: Optional[_Group] = None
+    for raw_line in text.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        name, value = line.split(":", 1)
+        name, value = name.strip().lower(), value.strip()
+        if name == "user-agent":
+            if group is None or group.closed:
+                group = _Group()
+                groups.append(group)
+            group.agents.append(value.lower())
+        elif group is None:
+            continue
+        elif name in ("allow", "disallow"):
+            group.rules.append((value, name == "allow"))
+            group.closed = True
+        elif name == "crawl-delay":
+            try:
+                group.crawl_delay = float(value)
+            except ValueError:
+                pass
+            group.closed = True
+
+    token = user_agent.lower()
+    selected = [
+        group for group in groups
+        if token != "*" and any(agent != "*" and agent in token for agent in group.agents)
+    ] or [group for group in groups if "*" in group.agents]
+    rules = [rule for group in selected for rule in group.rules]
+    delays = [group.crawl_delay for group in selected if group.crawl_delay is not None]
+    return RobotsRules(rules, max(delays) if delays else None)
+
+
+class RobotsPolicy:
+    """
+    Answers whether a URL may be fetched according to its site's robots.txt.
+    robots.txt is fetched once per origin, even when many checks for it run at
+    once, and kept in memory and on disk for ttl seconds. Per RFC 9309, a 4xx
+    means no restrictions, while a 5xx or an unreachable site means everything
+    is disallowed until error_ttl runs out. Crawl-delay is passed to the
+    politeness scheduler, capped at max_crawl_delay.
+    When checks are given a proxy pool, every robots.txt fetch goes through a
+    proxy of its own and its outcome is reported back to the pool.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str],
+        ttl: int,
+        error_ttl: int,
+        user_agent: str = "*",
+        max_crawl_delay: float = 30.0,
+        enabled: bool = True,
+        politeness: Optional[PolitenessScheduler] = None
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.user_agent = user_agent
+        self.max_crawl_delay = max_crawl_delay
+        self.enabled = enabled
+        self.politeness = politeness or scheduler
+        self._rules: Dict[str, Tuple[RobotsRules, float]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.fetched = 0
+        self.disk_hits = 0
+        self.allowed_urls = 0
+        self.disallowed_urls = 0
+
+    @staticmethod
+    def origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+    def _path(self, origin: str) -> str:
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(origin.encode()).hexdigest()}.json")
+
+    def _read_disk(self, origin: str) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(origin), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("expires_at", 0) > time.time() else None
+
+    def _write_disk(self, entry: Dict):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._path(entry["origin"]), "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+        except OSError as e:
+            logger.warning(f"Could not cache robots.txt for {entry['origin']}: {str(e)}")
+
+    def _rules_from_entry(self, entry: Dict) -> RobotsRules:
+        status = entry.get("status")
+        if status is None or status == 429 or status >= 500:
+            return RobotsRules.disallow_all()
+        if status >= 400:
+            return RobotsRules.allow_all()
+        return parse_robots(entry.get("text", ""), self.user_agent)
+
+    async def _download(self, session, origin: str, proxies=None, **kwargs) -> Dict:
+        robots_url = f"{origin}/robots.txt"
+        status = None
+        text = ""
+        await self.politeness.wait(robots_url)
+        proxy = proxies.acquire() if proxies else None
+        if proxy:
+            kwargs["proxy"] = proxy
+        started = time.monotonic()
+        try:
+            async with session.get(robots_url, **kwargs) as response:
+                status = response.status
+                if proxies:
+                    proxies.report(proxy, status=status, latency=time.monotonic() - started)
+                if 200 <= status < 300:
+                    text = (await self._read_capped(response)).decode("utf-8", errors="replace")
+        except Exception as e:
+            if proxies and status is None:
+                proxies.report(proxy, error=True)
+            logger.info(f"Could not fetch {robots_url}: {str(e)}")
+        self.fetched += 1
+        failed = status is None or status == 429 or status >= 500
+        ttl = self.error_ttl if failed else self.ttl
+        return {"origin": origin, "status": status, "text": text, "expires_at": time.time() + ttl}
+
+    @staticmethod
+    async def _read_capped(response) -> bytes:
+        """
+        Read the body up to MAX_ROBOTS_BYTES. A single content.read(n) only returns
+        what is already buffered, so the chunks are read until EOF or the cap.
+        """
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(ROBOTS_CHUNK_BYTES):
+            body += chunk
+            if len(body) >= MAX_ROBOTS_BYTES:
+                break
+        return bytes(body[:MAX_ROBOTS_BYTES])
+
+    async def _load(self, session, origin: str, proxies=None, **kwargs) -> RobotsRules:
+        entry = await asyncio.to_thread(self._read_disk, origin)
+        if entry:
+            self.disk_hits += 1
+        else:
+            entry = await self._download(session, origin, proxies, **kwargs)
+            await asyncio.to_thread(self._write_disk, entry)
+        rules = self._rules_from_entry(entry)
+        self._rules[origin] = (rules, entry["expires_at"])
+        if rules.crawl_delay:
+            host = host_of(origin)
+            delay = min(rules.crawl_delay, self.max_crawl_delay)
+            if delay > self.politeness.crawl_delays.get(host, 0.0):
+                self.politeness.set_crawl_delay(host, delay)
+        return rules
+
+    async def rules_for(self, session, url: str, proxies=None, **kwargs) -> RobotsRules:
+        """The robots rules for a URL's origin, fetching robots.txt at most once at a time."""
+        origin = self.origin(url)
+        cached = self._rules.get(origin)
+        if cached and cached[1] > time.time():
+            return cached[0]
+        pending = self._pending.get(origin)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(session, origin, proxies, **kwargs))
+            self._pending[origin] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(origin, None))
+        return await asyncio.shield(pending)
+
+    async def allowed(self, session, url: str, proxies=None, **kwargs) -> bool:
+        """
+        Whether robots.txt allows fetching url. robots.txt is fetched through a
+        proxy from proxies, if given; kwargs go to the robots.txt request.
+        """
+        if not self.enabled:
+            return True
+        rules = await self.rules_for(session, url, proxies, **kwargs)
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        if rules.allowed(path):
+            self.allowed_urls += 1
+            return True
+        self.disallowed_urls += 1
+        logger.info(f"robots.txt disallows {url}")
+        return False
+
+    async def filter(self, session, urls: Iterable[str], proxies=None, **kwargs) -> List[str]:
+        """Drop the URLs robots.txt disallows, keeping the order of the rest."""
+        urls = list(urls)
+        if not self.enabled:
+            return urls
+        checks = await asyncio.gather(*(self.allowed(session, url, proxies, **kwargs) for url in urls))
+        return [url for url, allowed in zip(urls, checks) if allowed]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "enabled": self.enabled,
+            "origins": len(self._rules),
+            "fetched": self.fetched,
+            "disk_hits": self.disk_hits,
+            "allowed": self.allowed_urls,
+            "disallowed": self.disallowed_urls,
+        }
+
+
+robots_policy = RobotsPolicy(
+    cache_dir=settings.ROBOTS_CACHE_DIR,
+    ttl=settings.ROBOTS_CACHE_TTL,
+    error_ttl=settings.ROBOTS_ERROR_TTL,
+    user_agent=settings.ROBOTS_USER_AGENT,
+    max_crawl_delay=settings.ROBOTS_MAX_CRAWL_DELAY,
+    enabled=settings.ROBOTS_ENABLED
+)
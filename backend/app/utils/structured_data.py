@@ -0,0 +1,331 @@
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# schema.org types read as contact records; other types are walked for nested ones
+PERSON_TYPES = frozenset({"Person"})
+ORGANIZATION_TYPES = frozenset({
+    "Organization",
+    "Corporation",
+    "LocalBusiness",
+    "ProfessionalService",
+    "RealEstateAgent",
+})
+
+# Organization properties that hold the people working there
+_PEOPLE_PROPERTIES = ("employee", "employees", "member", "members", "founder", "founders")
+
+_JSON_LD = re.compile(
+    r'<script[^>]*type\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.I | re.S
+)
+_META_TAG = re.compile(r'<meta\s[^>]*>', re.I)
+_ATTRIBUTE = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+_HEAD_END = re.compile(r'</head\s*>', re.I)
+_MICRODATA = re.compile(r'itemtype\s*=\s*["\']?https?://schema\.org/', re.I)
+
+# Microdata elements whose property value is an attribute rather than their text
+_MICRODATA_VALUE_ATTRIBUTES = {
+    "meta": "content",
+    "a": "href",
+    "link": "href",
+    "area": "href",
+    "img": "src",
+    "audio": "src",
+    "video": "src",
+    "source": "src",
+    "iframe": "src",
+    "object": "data",
+    "time": "datetime",
+    "data": "value",
+    "meter": "value",
+}
+
+
+@dataclass
+class ContactRecord:
+    """A person or organization a page describes in schema.org structured data."""
+    kind: str
+    schema_type: str
+    name: str = ""
+    job_title: str = ""
+    organization: str = ""
+    email: str = ""
+    phone: str = ""
+    address: str = ""
+    url: str = ""
+    same_as: List[str] = field(default_factory=list)
+    source: str = "json-ld"
+
+    @property
+    def has_contact(self) -> bool:
+        return bool(self.email or self.phone or self.address)
+
+
+def _schema_types(node: Dict[str, Any]) -> List[str]:
+    """Bare type names of a node: "https://schema.org/Person" and "schema:Person" become "Person"."""
+    types = node.get("@type") or []
+    if isinstance(types, str):
+        types = [types]
+    return [re.split(r"[/:#]", value)[-1] for value in types if isinstance(value, str)]
+
+
+def _text(value: Any) -> str:
+    """The first plain value of a property: lists give their first item, nodes their name."""
+    if isinstance(value, list):
+        for item in value:
+            text = _text(item)
+            if text:
+                return text
+        return ""
+    if isinstance(value, dict):
+        return _text(value.get("name") or value.get("@value") or "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _address(value: Any) -> str:
+    """A PostalAddress node or a plain address as one line."""
+    if isinstance(value, list):
+        value = next((item for item in value if item), "")
+    if isinstance(value, dict):
+        parts = [
+            _text(value.get(key))
+            for key in ("streetAddress", "addressLocality", "addressRegion", "postalCode")
+        ]
+        return ", ".join(part for part in parts if part)
+    return _text(value)
+
+
+def _strip_scheme(value: str, scheme: str) -> str:
+    return value[len(scheme):].strip() if value.lower().startswith(scheme) else value
+
+
+def _urls(value: Any) -> List[str]:
+    values = value if isinstance(value, list) else [value]
+    return [text for text in (_text(item) for item in values) if text]
+
+
+class StructuredDataExtractor:
+    """
+    Reads the contacts a page declares in JSON-LD, schema.org microdata and
+    OpenGraph, so heuristic extraction only runs on pages that declare none.
+    JSON-LD and OpenGraph are found with a scan of the raw HTML and need no
+    parse tree; microdata is read from the tree only when the page has any.
+    Organizations give their people an employer, and nested nodes (@graph,
+    employees, worksFor) become records of their own.
+    """
+
+    def __init__(self):
+        self.pages = 0
+        self.pages_with_records = 0
+        self.records = {"json-ld": 0, "microdata": 0, "opengraph": 0}
+
+    @staticmethod
+    def has_microdata(html: str) -> bool:
+        """Whether the page has schema.org microdata, which needs a parse tree to read."""
+        return bool(html) and _MICRODATA.search(html) is not None
+
+    def extract(self, html: str, soup=None) -> List[ContactRecord]:
+        """
+        Every person and organization record on a page, JSON-LD first. Pass the
+        parsed page as soup to include microdata. Duplicates across formats are
+        dropped.
+        """
+        self.pages += 1
+        records: List[ContactRecord] = []
+        for document in self.json_ld(html):
+            records.extend(self._records(document, "json-ld"))
+        if soup is not None:
+            for item in self.microdata(soup):
+                records.extend(self._records(item, "microdata"))
+
+        opengraph = self.opengraph(html)
+        og_record = self._opengraph_record(opengraph)
+        if og_record:
+            records.append(og_record)
+        site_name = opengraph.get("site_name", "")
+
+        # People without an employer of their own work for the page's organization
+        employer = next((record.name for record in records if record.kind == "organization" and record.name), site_name)
+        unique = []
+        seen = set()
+        for record in records:
+            if record.kind == "person" and not record.organization:
+                record.organization = employer
+            key = (record.kind, record.name.lower(), record.email.lower(), record.phone)
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(record)
+            self.records[record.source] += 1
+        if unique:
+            self.pages_with_records += 1
+        return unique
+
+    @staticmethod
+    def json_ld(html: str) -> List[Any]:
+        """The parsed JSON-LD blocks of a page; blocks that are not valid JSON are skipped."""
+        documents = []
+        for match in _JSON_LD.finditer(html or ""):
+            block = match.group(1).strip()
+            # Some sites wrap the JSON in HTML comments or CDATA markers
+            block = re.sub(r'^\s*(?:<!--|//\s*<!\[CDATA\[)|(?:-->|//\s*\]\]>)\s*$', "", block).strip()
+            if not block:
+                continue
+            try:
+                documents.append(json.loads(block))
+            except ValueError:
+                logger.debug("Skipping a JSON-LD block that is not valid JSON")
+        return documents
+
+    @staticmethod
+    def opengraph(html: str) -> Dict[str, str]:
+        """og:* meta properties from the document head, without the og: prefix."""
+        html = html or ""
+        head_end = _HEAD_END.search(html)
+        head = html[:head_end.start()] if head_end else html
+        properties = {}
+        for tag in _META_TAG.finditer(head):
+            attributes = {
+                # Only one of the quoted, single-quoted and bare value groups matched
+                name.lower(): "".join(values)
+                for name, *values in _ATTRIBUTE.findall(tag.group())
+            }
+            prop = attributes.get("property") or attributes.get("name") or ""
+            if prop.lower().startswith("og:") and "content" in attributes:
+                properties.setdefault(prop[3:].lower(), attributes["content"].strip())
+        return properties
+
+    def microdata(self, soup) -> List[Dict[str, Any]]:
+        """Top-level microdata items as JSON-LD-shaped dictionaries."""
+        items = []
+        for element in soup.find_all(attrs={"itemscope": True}):
+            if element.has_attr("itemprop"):
+                # A property of an enclosing item; read as part of that item
+                continue
+            items.append(self._microdata_item(element))
+        return items
+
+    def _microdata_item(self, element) -> Dict[str, Any]:
+        item: Dict[str, Any] = {"@type": (element.get("itemtype") or "").split()}
+        stack = element.find_all(recursive=False)[::-1]
+        while stack:
+            child = stack.pop()
+            names = child.get("itemprop")
+            nested = child.has_attr("itemscope")
+            if names:
+                value = self._microdata_item(child) if nested else self._microdata_value(child)
+                for name in (names if isinstance(names, list) else names.split()):
+                    item.setdefault(name, []).append(value)
+            if not nested:
+                stack.extend(child.find_all(recursive=False)[::-1])
+        return item
+
+    @staticmethod
+    def _microdata_value(element) -> str:
+        attribute = _MICRODATA_VALUE_ATTRIBUTES.get(element.name)
+        if attribute and element.has_attr(attribute):
+            return (element.get(attribute) or "").strip()
+        return element.get_text(" ", strip=True)
+
+    def _records(self, document: Any, source: str) -> List[ContactRecord]:
+        records = []
+        for node, employer in self._nodes(document, ""):
+            types = _schema_types(node)
+            if PERSON_TYPES.intersection(types):
+                kind = "person"
+            elif ORGANIZATION_TYPES.intersection(types):
+                kind = "organization"
+            else:
+                continue
+            record = self._record(node, kind, types, source)
+            if kind == "person":
+                record.organization = record.organization or employer
+                # Article authors and reviewers come with a name and nothing else
+                if not (record.name and (record.job_title or record.organization or record.has_contact)):
+                    continue
+            if record.name or record.has_contact:
+                records.append(record)
+        return records
+
+    def _nodes(self, value: Any, employer: str) -> Iterator[tuple]:
+        """Every node under value with the organization it is nested under, depth first."""
+        if isinstance(value, list):
+            for item in value:
+                yield from self._nodes(item, employer)
+            return
+        if not isinstance(value, dict):
+            return
+        yield value, employer
+        if ORGANIZATION_TYPES.intersection(_schema_types(value)):
+            employer = _text(value.get("name")) or employer
+        for key, child in value.items():
+            if isinstance(child, (dict, list)) and key != "@context":
+                # Only people listed by the organization work for it
+                yield from self._nodes(child, employer if key in _PEOPLE_PROPERTIES else "")
+
+    @staticmethod
+    def _record(node: Dict[str, Any], kind: str, types: List[str], source: str) -> ContactRecord:
+        schema_type = next(
+            (name for name in types if name in PERSON_TYPES or name in ORGANIZATION_TYPES),
+            types[0]
+        )
+        name = _text(node.get("name"))
+        if not name and kind == "person":
+            name = " ".join(filter(None, (_text(node.get("givenName")), _text(node.get("familyName")))))
+        contact_point = node.get("contactPoint")
+        if isinstance(contact_point, list):
+            contact_point = next((item for item in contact_point if isinstance(item, dict)), None)
+        contact_point = contact_point if isinstance(contact_point, dict) else {}
+        email = _text(node.get("email")) or _text(contact_point.get("email"))
+        phone = _text(node.get("telephone")) or _text(contact_point.get("telephone"))
+        return ContactRecord(
+            kind=kind,
+            schema_type=schema_type,
+            name=name,
+            job_title=_text(node.get("jobTitle")),
+            organization=_text(node.get("worksFor") or node.get("affiliation")) if kind == "person" else name,
+            email=_strip_scheme(email, "mailto:"),
+            phone=_strip_scheme(phone, "tel:"),
+            address=_address(node.get("address") or node.get("workLocation")),
+            url=_text(node.get("url")),
+            same_as=_urls(node.get("sameAs")),
+            source=source
+        )
+
+    @staticmethod
+    def _opengraph_record(properties: Dict[str, str]) -> Optional[ContactRecord]:
+        """The site's organization from the OpenGraph contact properties, if it sets any."""
+        email = properties.get("email", "")
+        phone = properties.get("phone_number", "")
+        if not (email or phone):
+            return None
+        parts = [properties.get(key, "") for key in ("street-address", "locality", "region", "postal-code")]
+        name = properties.get("site_name", "")
+        return ContactRecord(
+            kind="organization",
+            schema_type="Organization",
+            name=name,
+            organization=name,
+            email=email,
+            phone=phone,
+            address=", ".join(part for part in parts if part),
+            url=properties.get("url", ""),
+            source="opengraph"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "pages_with_records": self.pages_with_records,
+            "records": dict(self.records),
+        }
+
+
+structured_data_extractor = StructuredDataExtractor()
@@ -0,0 +1,93 @@
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bs4 import CData, NavigableString, Tag
+
+# The string types Tag.get_text() returns by default (comments, scripts etc. are skipped)
+_TEXT_TYPES = (NavigableString, CData)
+
+
+class TextIndex:
+    """
+    The text of a document with the span each element's get_text() occupies in it,
+    built in one traversal. Element text is sliced out on demand instead of being
+    re-collected from the subtree for every lookup.
+    """
+
+    def __init__(self, text: str, spans: List[Tuple[Any, int, int]]):
+        self.text = text
+        self.spans = spans
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lower-case to more than one; keep offsets aligned
+            lowered = "".join(char.lower()[:1] for char in text)
+        self.lowered = lowered
+        self._next_by_names: Dict[Tuple[str, ...], List[Optional[int]]] = {}
+
+    def element_text(self, index: int) -> str:
+        _, start, end = self.spans[index]
+        return self.text[start:end]
+
+    def next_element(self, index: int, names: Iterable[str]) -> Optional[int]:
+        """
+        Index of the first indexed element after element index (its descendants
+        included, as with find_next) whose name is in names.
+        """
+        key = tuple(sorted(names))
+        if key not in self._next_by_names:
+            following: List[Optional[int]] = [None] * len(self.spans)
+            next_index = None
+            for position in range(len(self.spans) - 1, -1, -1):
+                following[position] = next_index
+                if self.spans[position][0].name in key:
+                    next_index = position
+            self._next_by_names[key] = following
+        return self._next_by_names[key][index]
+
+    def elements_containing(self, positions: List[int], length: int) -> Iterable[int]:
+        """Indexes of the elements whose text contains a match of the given length at one of positions."""
+        if not positions:
+            return
+        for index, (_, start, end) in enumerate(self.spans):
+            first = bisect_left(positions, start)
+            if first < len(positions) and positions[first] + length <= end:
+                yield index
+
+
+def build_text_index(soup, tag_names: Iterable[str]) -> TextIndex:
+    """
+    Index the text of every element named in tag_names, in document order.
+    BeautifulSoup trees are walked once; other parser backends fall back to one
+    get_text() call per element.
+    """
+    tag_names = set(tag_names)
+    if not isinstance(soup, Tag):
+        parts = []
+        spans = []
+        offset = 0
+        for element in soup.find_all(list(tag_names)):
+            text = element.get_text()
+            spans.append((element, offset, offset + len(text)))
+            parts.append(text)
+            offset += len(text) + 1
+        return TextIndex("\0".join(parts), spans)
+
+    parts = []
+    open_spans = []
+    offset = 0
+    stack: List[Any] = [soup]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, int):
+            # Leaving the element: its text ends here
+            element, start = open_spans[node]
+            open_spans[node] = (element, start, offset)
+        elif isinstance(node, Tag):
+            if node.name in tag_names and node is not soup:
+                open_spans.append((node, offset))
+                stack.append(len(open_spans) - 1)
+            stack.extend(reversed(node.contents))
+        elif type(node) in _TEXT_TYPES:
+            parts.append(node)
+            offset += len(node)
+    return TextIndex("".join(parts), open_spans)
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+def parse_rate_limits(value: Optional[str]) -> Dict[str, Tuple[float, int]]:
+    """Parse a "source=calls_per_minute:burst,..." setting into a dictionary."""
+    limits = {}
+    for item in (value or "").split(','):
+        if '=' not in item:
+            continue
+        source, spec = item.split('=', 1)
+        rate, _, burst = spec.partition(':')
+        try:
+            limits[source.strip().lower()] = (float(rate), int(burst or 1))
+        except ValueError:
+            continue
+    return limits
+
+
+class TokenBucket:
+    """Asyncio token bucket: refills at a steady rate up to a burst capacity."""
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: int = 1):
+        """
+        Wait until the requested tokens are available, then take them.
+        Waiters are served in arrival order and sleep with asyncio, so a drained
+        bucket never blocks the event loop.
+        """
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= tokens
+
+
+class TokenBucketLimiter:
+    """Per-source and per-host token buckets; a request must pass both."""
+
+    def __init__(
+        self,
+        source_rate_per_minute: float,
+        source_burst: int,
+        host_rate_per_minute: float,
+        host_burst: int,
+        source_limits: Optional[Dict[str, Tuple[float, int]]] = None
+    ):
+        self.source_rate_per_minute = source_rate_per_minute
+        self.source_burst = source_burst
+        self.host_rate_per_minute = host_rate_per_minute
+        self.host_burst = host_burst
+        self.source_limits = source_limits or {}
+        self._sources: Dict[str, TokenBucket] = {}
+        self._hosts: Dict[str, TokenBucket] = {}
+
+    def source_bucket(self, source: str) -> TokenBucket:
+        if source not in self._sources:
+            rate, burst = self.source_limits.get(
+                source, (self.source_rate_per_minute, self.source_burst)
+            )
+            self._sources[source] = TokenBucket(rate, burst)
+        return self._sources[source]
+
+    def host_bucket(self, host: str) -> TokenBucket:
+        if host not in self._hosts:
+            self._hosts[host] = TokenBucket(self.host_rate_per_minute, self.host_burst)
+        return self._hosts[host]
+
+    async def acquire(self, url: str, source: str = "web"):
+        """Take one token from the source bucket and one from the URL's host bucket."""
+        host = (urlparse(url).hostname or "").lower()
+        await self.source_bucket(source).acquire()
+        await self.host_bucket(host).acquire()
@@ -0,0 +1 @@
+app/utils/contact_extractor.py
\ No newline at end of file
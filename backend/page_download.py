@@ -0,0 +1 @@
+app/utils/page_download.py
\ No newline at end of file
@@ -0,0 +1 @@
+app/utils/structured_data.py
\ No newline at end of file
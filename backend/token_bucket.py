@@ -0,0 +1 @@
+app/utils/token_bucket.py
\ No newline at end of file
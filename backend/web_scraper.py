@@ -1,15 +1,18 @@
 import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from fake_useragent import UserAgent
 from tenacity import retry, stop_after_attempt, wait_exponential
-from ratelimit import limits, sleep_and_retry
+from token_bucket import TokenBucketLimiter
+from html_parser import html_parser, sniff_encoding
+from contact_extractor import contact_extractor
+from structured_data import structured_data_extractor
+from page_download import page_downloader
 import aiohttp
 import pandas as pd
 
@@ -17,6 +20,14 @@ import pandas as pd
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rate limit: 10 requests per minute, bursts of up to 10
+rate_limiter = TokenBucketLimiter(
+    source_rate_per_minute=10,
+    source_burst=10,
+    host_rate_per_minute=10,
+    host_burst=10
+)
+
 @dataclass
 class Lead:
     firstName: str
@@ -45,14 +56,19 @@ class WebScraper:
         if not self.session:
             self.session = aiohttp.ClientSession(headers={"User-Agent": self.ua.random})
 
-    @sleep_and_retry
-    @limits(calls=10, period=60)  # Rate limit: 10 requests per minute
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    async def fetch_page(self, url: str) -> str:
+    async def fetch_raw(self, url: str) -> Tuple[bytes, Optional[str]]:
+        # Each retry attempt takes its own token
+        await rate_limiter.acquire(url)
         await self.create_session()
         async with self.session.get(url) as response:
             response.raise_for_status()
-            return await response.text()
+            download = await page_downloader.read(response)
+            return download.body, response.charset
+
+    async def fetch_page(self, url: str) -> str:
+        body, charset = await self.fetch_raw(url)
+        return body.decode(sniff_encoding(body, charset), errors="replace")
 
     async def scrape_linkedin(self, query: str, location: Optional[str] = None) -> List[Lead]:
         # Implementation would require LinkedIn API credentials
@@ -65,7 +81,7 @@ class WebScraper:
         try:
             # Use Selenium for Airbnb as it requires JavaScript
             self.driver.get(f"https://www.airbnb.com/s/{location or ''}/homes?query={query}")
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = html_parser.parse(self.driver.page_source)
             
             # Extract host information (simplified example)
             host_elements = soup.find_all("div", {"class": "host-profile"})
@@ -89,18 +105,38 @@ class WebScraper:
     async def scrape_custom_website(self, url: str) -> List[Lead]:
         leads = []
         try:
-            html = await self.fetch_page(url)
-            soup = BeautifulSoup(html, 'html.parser')
+            body, charset = await self.fetch_raw(url)
+            soup = html_parser.parse(body, charset)
+            
+            # Contacts the site declares as schema.org structured data come first
+            html = body.decode(sniff_encoding(body, charset), errors="replace")
+            records = [
+                record for record in structured_data_extractor.extract(html, soup)
+                if record.email or record.phone
+            ]
+            if records:
+                for record in records:
+                    name_parts = record.name.split() if record.kind == "person" else []
+                    leads.append(Lead(
+                        firstName=name_parts[0] if name_parts else "",
+                        lastName=name_parts[-1] if len(name_parts) > 1 else "",
+                        email=record.email or None,
+                        phone=record.phone or None,
+                        location=record.address or None,
+                        source=url
+                    ))
+                return leads
             
-            # Extract contact information using common patterns
+            # Extract contact information from mailto:/tel: links
             # This is a simplified example and would need to be customized
-            email_elements = soup.find_all("a", href=lambda x: x and "mailto:" in x)
-            phone_elements = soup.find_all("a", href=lambda x: x and "tel:" in x)
+            candidates = contact_extractor.extract(soup)
+            emails = [c.value for c in candidates if c.kind == "email" and c.source == "link"]
+            phones = [c.value for c in candidates if c.kind == "phone" and c.source == "link"]
             
             # Combine found contact information into leads
-            for i in range(max(len(email_elements), len(phone_elements))):
-                email = email_elements[i]['href'].replace('mailto:', '') if i < len(email_elements) else None
-                phone = phone_elements[i]['href'].replace('tel:', '') if i < len(phone_elements) else None
+            for i in range(max(len(emails), len(phones))):
+                email = emails[i] if i < len(emails) else None
+                phone = phones[i] if i < len(phones) else None
                 
                 if email or phone:  # Only create lead if we have at least one contact method
                     leads.append(Lead(
@@ -0,0 +1,102 @@
+"""
+Compare the HTML parser backends on saved pages.
+
+    python benchmarks/bench_html_parser.py [--repeat N] [PATH ...]
+
+PATH may be an .html file, a directory of .html files, or a response cache
+directory (SCRAPER_CACHE_DIR) whose .json entries are benchmarked too.
+Defaults to tests/fixtures/html.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.utils.html_parser import HTMLParser, available_backends  # noqa: E402
+
+# The lookups the scrapers run, so the query column reflects real selector use
+SELECTORS = [
+    ("div", {"class": "VkpGBb"}),
+    ("div", {"class": "dbg0pd"}),
+    ("div", {"itemprop": "itemListElement"}),
+    ("span", {"class": "_tyxjp1"}),
+    ("a", {"class": "_1n81at5"}),
+    ("li", {"class": "reusable-search__result-container"}),
+    ("div", {"class": "search-results__result-item"}),
+    ("div", {"class": "result-lockup__name"}),
+    ("div", {"class": "g"}),
+    ("a", {"href": True}),
+]
+
+
+def load_pages(paths: List[str]) -> List[Tuple[str, bytes]]:
+    pages = []
+    for path in paths:
+        files = [path]
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith((".html", ".json"))
+            )
+        for file_path in files:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            if file_path.endswith(".json"):
+                data = json.loads(data).get("text", "").encode("utf-8")
+            pages.append((os.path.basename(file_path), data))
+    return pages
+
+
+def run_queries(soup) -> int:
+    found = 0
+    for name, attrs in SELECTORS:
+        found += len(soup.find_all(name, attrs))
+    found += len(soup.get_text())
+    return found
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", default=[os.path.join(ROOT, "tests", "fixtures", "html")])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_pages(args.paths)
+    backends = available_backends()
+    print(f"{len(pages)} pages, backends: {', '.join(backends)}, best of {args.repeat}")
+    print(f"{'page':<36} {'backend':<12} {'parse ms':>10} {'parse+query ms':>16}")
+
+    totals = {backend: [0.0, 0.0] for backend in backends}
+    for name, data in pages:
+        for backend in backends:
+            html_parser = HTMLParser(backend)
+            parse_ms = best_of(lambda: html_parser.parse(data), args.repeat)
+            query_ms = best_of(lambda: run_queries(html_parser.parse(data)), args.repeat)
+            totals[backend][0] += parse_ms
+            totals[backend][1] += query_ms
+            print(f"{name[:36]:<36} {backend:<12} {parse_ms:>10.2f} {query_ms:>16.2f}")
+
+    print()
+    baseline = totals.get("html.parser", [0.0, 0.0])[1]
+    for backend, (parse_ms, query_ms) in totals.items():
+        speedup = f"{baseline / query_ms:.1f}x" if query_ms and baseline else "-"
+        print(f"{'total':<36} {backend:<12} {parse_ms:>10.2f} {query_ms:>16.2f}  {speedup} vs html.parser")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import csv
+import json
+import os
+
+
+class CrawlCheckpoint:
+    """
+    Resumable CSV output for a crawl over industries and result pages.
+
+    After each page its rows are appended to the CSV, then one line recording
+    (industry, page, rows, last page, CSV size) is appended to the checkpoint
+    log. Both files are synced to disk, so a crash loses at most the page in
+    progress. On restart the log is replayed, the CSV is cut back to its size
+    at the last checkpoint (dropping rows of a page that was never checkpointed)
+    and the crawl picks up after the last finished page of each industry.
+    Delete the log to start the crawl over.
+    """
+
+    def __init__(self, csv_path, header, log_path=None):
+        self.csv_path = csv_path
+        self.header = list(header)
+        self.log_path = log_path or os.path.splitext(csv_path)[0] + '.checkpoint.jsonl'
+        self.pages = {}
+        self.last_pages = {}
+        self.rows = 0
+        self.pages_done = 0
+        self._csv = None
+        self._writer = None
+        self._log = None
+
+    def open(self):
+        csv_size = self._replay()
+        if csv_size is None or not os.path.exists(self.csv_path):
+            if self.pages_done:
+                print('checkpoint log has no matching CSV, starting over')
+            self.pages, self.last_pages, self.rows, self.pages_done = {}, {}, 0, 0
+            with open(self.log_path, 'w'):
+                pass
+            with open(self.csv_path, 'w', newline='') as csv_file:
+                csv.writer(csv_file).writerow(self.header)
+        else:
+            with open(self.csv_path, 'r+b') as csv_file:
+                csv_file.truncate(csv_size)
+            print('resuming after', self.pages_done, 'pages,', self.rows, 'rows')
+        self._csv = open(self.csv_path, 'a', newline='')
+        self._writer = csv.writer(self._csv)
+        self._log = open(self.log_path, 'a', encoding='utf-8')
+        return self
+
+    def _replay(self):
+        """Load finished pages from the log; returns the CSV size at the last checkpoint."""
+        if not os.path.exists(self.log_path):
+            return None
+        csv_size = None
+        valid_bytes = 0
+        with open(self.log_path, 'rb') as log:
+            for line in log:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line torn by a crash mid-write; everything before it is good
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                self.pages[entry['industry']] = entry['page']
+                self.last_pages[entry['industry']] = entry['last_page']
+                self.rows += entry['rows']
+                self.pages_done += 1
+                csv_size = entry['csv_bytes']
+                valid_bytes += len(line)
+        with open(self.log_path, 'r+b') as log:
+            log.truncate(valid_bytes)
+        return csv_size
+
+    def next_page(self, industry):
+        return self.pages.get(industry, 0) + 1
+
+    def last_page(self, industry):
+        return self.last_pages.get(industry)
+
+    def is_complete(self, industry):
+        return industry in self.pages and self.pages[industry] >= self.last_pages[industry]
+
+    def record(self, industry, page, last_page, rows):
+        """Append a finished page's rows to the CSV, then checkpoint it."""
+        self._writer.writerows(rows)
+        self._csv.flush()
+        os.fsync(self._csv.fileno())
+        entry = {
+            'industry': industry,
+            'page': page,
+            'last_page': last_page,
+            'rows': len(rows),
+            'csv_bytes': os.fstat(self._csv.fileno()).st_size,
+        }
+        self._log.write(json.dumps(entry) + '\n')
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self.pages[industry] = page
+        self.last_pages[industry] = last_page
+        self.rows += len(rows)
+        self.pages_done += 1
+
+    def close(self):
+        for handle in (self._csv, self._log):
+            if handle is not None:
+                handle.close()
+        self._csv = self._writer = self._log = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *args):
+        self.close()
+        return False
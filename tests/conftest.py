@@ -0,0 +1,93 @@
+"""Shared test setup."""
+
+import os
+import sys
+import types
+
+# backend/app is served as the top-level "app" package from inside backend/,
+# which clashes with the root app package; tests import it as backend_app
+BACKEND_APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend", "app")
+
+if "backend_app" not in sys.modules:
+    backend_app = types.ModuleType("backend_app")
+    backend_app.__path__ = [BACKEND_APP]
+    sys.modules["backend_app"] = backend_app
+
+
+class FakeContent:
+    """
+    The body stream of a FakeResponse; records the size of every chunk read.
+    Like aiohttp's StreamReader, read(n) returns no more than one network chunk
+    of buffer_size bytes, so callers that expect n bytes at once are caught out.
+    """
+
+    def __init__(self, data: bytes, buffer_size: int = 16):
+        self.data = data
+        self.buffer_size = buffer_size
+        self.position = 0
+        self.chunks = []
+
+    async def read(self, size=-1):
+        end = len(self.data) if size < 0 else self.position + min(size, self.buffer_size)
+        chunk = self.data[self.position:end]
+        self.position += len(chunk)
+        self.chunks.append(len(chunk))
+        return chunk
+
+    async def iter_chunked(self, size):
+        while self.position < len(self.data):
+            yield await self.read(size)
+
+    def at_eof(self):
+        return self.position >= len(self.data)
+
+
+class FakeResponse:
+    """A stand-in for an aiohttp response, usable as an async context manager."""
+
+    def __init__(self, status=200, body="", headers=None, url="https://example.com/", charset=None, buffer_size=16):
+        self.status = status
+        self.url = url
+        self.charset = charset
+        self.headers = headers or {}
+        self.body = body.encode() if isinstance(body, str) else body
+        self.content = FakeContent(self.body, buffer_size)
+
+    @property
+    def chunks(self):
+        return self.content.chunks
+
+    async def read(self):
+        return self.body
+
+    async def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeSession:
+    """Replays queued responses, raising queued exceptions, and records every request."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    @property
+    def urls(self):
+        return [url for url, _ in self.requests]
+
+    @property
+    def headers(self):
+        return [kwargs.get("headers") or {} for _, kwargs in self.requests]
@@ -0,0 +1,67 @@
+"""Tests for the AIMD concurrency controller."""
+
+import asyncio
+import time
+
+import pytest
+from backend_app.utils.aimd import AdaptiveConcurrency, AIMDWindow, parse_retry_after
+
+
+def test_window_grows_additively_and_cuts_multiplicatively():
+    """Test growth on fast successes, holding on slow ones and one cut per round trip."""
+    window = AIMDWindow(initial=2, minimum=1, maximum=8, latency_target=1.0)
+    for _ in range(10):
+        window.record(status=200, latency=0.1)
+    assert 4 < window.window < 5
+    grown = window.window
+    window.record(status=200, latency=3.0)
+    assert window.window == grown
+
+    window.record(status=429)
+    assert window.window == grown / 2
+    window.record(status=503)
+    assert window.window == grown / 2
+    window.last_cut -= 10
+    window.record(error=True)
+    assert window.window == grown / 4
+    assert window.limit == 1
+
+
+def test_retry_after_seconds_and_dates():
+    """Test Retry-After parsing and that it blocks the source."""
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    window = AIMDWindow()
+    window.record(status=429, retry_after="30")
+    assert 29 < window.retry_wait() <= 30
+    assert window.pace(4) > 29
+
+
+@pytest.mark.asyncio
+async def test_slots_follow_the_window():
+    """Test that in-flight requests stay under the window and Retry-After holds requests back."""
+    limiter = AdaptiveConcurrency(initial=2, maximum=2)
+    peak = 0
+    running = 0
+
+    async def request():
+        nonlocal peak, running
+        async with limiter.slot("web") as outcome:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            outcome.status = 200
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert peak == 2
+
+    async with limiter.slot("google") as outcome:
+        outcome.status = 429
+        outcome.retry_after = "1"
+    started = time.monotonic()
+    async with limiter.slot("google"):
+        pass
+    assert time.monotonic() - started >= 0.9
+    assert limiter.stats()["google"]["decreases"] == 1
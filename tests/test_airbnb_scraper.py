@@ -0,0 +1,61 @@
+"""Tests for the Airbnb scraper's host profile fetching."""
+
+import pytest
+from backend_app.services import airbnb_scraper as airbnb_module
+from backend_app.services.airbnb_scraper import AirbnbScraper
+from backend_app.utils.politeness import PolitenessScheduler
+from conftest import FakeResponse, FakeSession
+
+# Six listings from three hosts, host 2 owning listings far apart
+LISTING_HOSTS = [1, 2, 1, 3, 2, 2]
+
+
+def search_page():
+    listings = "".join(
+        f'<div itemprop="itemListElement"><meta itemprop="name" content="Home {index}">'
+        f'<span class="_tyxjp1">${100 + index}</span><span class="r1g2bVn">4.{index}</span>'
+        f'<a class="_1n81at5" href="/users/show/{host}">Host</a></div>'
+        for index, host in enumerate(LISTING_HOSTS)
+    )
+    return f"<html><body>{listings}</body></html>"
+
+
+def host_page(host):
+    return (
+        f'<html><body><h1 class="_1n81at5">Host {host}</h1>'
+        f'<div class="_1n81at5">Austin, TX · {host + 1} listings</div></body></html>'
+    )
+
+
+class FakeAirbnb(FakeSession):
+    """Serves the search page and one profile per host, whatever order they are asked for in."""
+
+    def get(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        if "/users/show/" in url:
+            return FakeResponse(200, host_page(int(url.rsplit("/", 1)[1])), url=url)
+        return FakeResponse(200, search_page(), url=url)
+
+
+@pytest.mark.asyncio
+async def test_each_host_profile_is_fetched_once(monkeypatch):
+    """Test one request per unique host and one lead per listing, in listing order."""
+    monkeypatch.setattr(airbnb_module, "scheduler", PolitenessScheduler(0, 0))
+    scraper = AirbnbScraper()
+    session = FakeAirbnb()
+
+    async def setup_session():
+        scraper.session = session
+
+    monkeypatch.setattr(scraper, "setup_session", setup_session)
+    leads = await scraper.scrape_leads({"location": "Austin", "max_concurrency": 3, "max_per_host": 3})
+
+    host_requests = [url for url in session.urls if "/users/show/" in url]
+    assert sorted(host_requests) == [f"https://www.airbnb.com/users/show/{host}" for host in (1, 2, 3)]
+    assert len(leads) == len(LISTING_HOSTS)
+    assert [lead["profile_url"] for lead in leads] == [
+        f"https://www.airbnb.com/users/show/{host}" for host in LISTING_HOSTS
+    ]
+    assert [lead["name"] for lead in leads] == [f"Host {host}" for host in LISTING_HOSTS]
+    assert [lead["average_rating"] for lead in leads] == [4.0, 4.1, 4.2, 4.3, 4.4, 4.5]
+    assert leads[1]["property_count"] == 3
@@ -0,0 +1,186 @@
+"""Tests for the Playwright browser pool, browsing profiles and in-page extraction."""
+
+import asyncio
+import json
+
+import pytest
+from app.utils.browser_pool import BrowserPool
+from app.utils.browsing_profiles import TRACKER_DOMAINS, BrowsingProfile
+from app.utils.extraction_spec import ExtractionSpecs
+from app.utils.page_extraction import extract_records
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+        self.routes = []
+
+    def is_closed(self):
+        return self.closed
+
+    async def route(self, pattern, handler):
+        self.routes.append(handler)
+
+    async def unroute(self, pattern, handler):
+        self.routes.remove(handler)
+
+class FakeContext:
+    def __init__(self, browser, storage_state):
+        self.browser = browser
+        self.storage_state_loaded = storage_state
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage()
+
+    async def storage_state(self, path):
+        self.browser.saved.append(self)
+        with open(path, "w") as f:
+            json.dump({"context": self.browser.contexts.index(self)}, f)
+
+    async def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+        self.saved = []
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, storage_state=None):
+        context = FakeContext(self, storage_state)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+
+    async def launch(self, headless):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def stop(self):
+        pass
+
+def fake_pool(tmp_path, **options):
+    pool = BrowserPool(storage_state_path=str(tmp_path / "state.json"), **options)
+    pool.playwright = FakePlaywright()
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_pages_are_leased_reused_and_recycled(tmp_path):
+    """Test that a context is reused until its page budget is spent and leases are capped."""
+    pool = fake_pool(tmp_path, max_contexts=2, pages_per_context=2)
+    async with pool.page() as first:
+        assert pool.stats()["in_use"] == 1
+    async with pool.page() as second:
+        assert second is first
+    browser = pool.browser
+    assert len(browser.contexts) == 1 and browser.contexts[0].closed
+    assert pool.stats()["contexts_recycled"] == 1
+
+    async def hold(release):
+        async with pool.page():
+            await release.wait()
+
+    release = asyncio.Event()
+    holders = [asyncio.create_task(hold(release)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    assert pool.stats()["in_use"] == 2
+    release.set()
+    await asyncio.gather(*holders)
+    assert pool.stats()["pages_served"] == 5
+
+
+@pytest.mark.asyncio
+async def test_only_one_context_persists_the_session(tmp_path):
+    """Test that contexts closing one after another write the storage state once."""
+    pool = fake_pool(tmp_path, max_contexts=3, pages_per_context=1)
+
+    async def visit():
+        async with pool.page():
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(visit(), visit(), visit())
+    browser = pool.browser
+    assert browser.saved == [browser.contexts[0]]
+
+    # The next context loads the saved session and owns it from now on
+    await visit()
+    assert browser.contexts[3].storage_state_loaded == str(tmp_path / "state.json")
+    assert browser.saved == [browser.contexts[0], browser.contexts[3]]
+
+
+@pytest.mark.asyncio
+async def test_restart_keeps_the_lease_cap(tmp_path):
+    """Test that a restart while a page is leased keeps the slots and drops the stale context."""
+    pool = fake_pool(tmp_path, max_contexts=1, pages_per_context=10)
+    async with pool.page() as stale:
+        old_browser = pool.browser
+        old_browser.connected = False
+        await pool.start()
+        assert pool.browser is not old_browser
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.page().__aenter__(), 0.05)
+    assert pool.stats()["idle"] == 0
+    async with pool.page() as fresh:
+        assert fresh is not stale
+
+
+@pytest.mark.asyncio
+async def test_lean_profile_intercepts_for_the_lease_only(tmp_path):
+    """Test that a lean profile blocks trackers and resource types while the page is leased."""
+    profile = BrowsingProfile(blocked_resource_types=frozenset({"image"}), blocked_domains=TRACKER_DOMAINS)
+    assert profile.lean and not BrowsingProfile().lean
+    assert profile.should_block("image", "https://example.com/a.png")
+    assert profile.should_block("script", "https://www.google-analytics.com/ga.js")
+    assert not profile.should_block("script", "https://notgoogle-analytics.com/app.js")
+
+    pool = fake_pool(tmp_path, max_contexts=1, pages_per_context=10)
+    async with pool.page(profile) as page:
+        assert page.routes == [profile.handle_route]
+    assert page.routes == []
+
+
+class FakeExtractionPage:
+    url = "https://www.airbnb.com/s/austin"
+
+    def __init__(self, raw_records):
+        self.raw_records = raw_records
+        self.calls = []
+
+    async def eval_on_selector_all(self, selector, script, fields):
+        self.calls.append((selector, fields))
+        return self.raw_records
+
+
+@pytest.mark.asyncio
+async def test_extract_records_finishes_in_page_results():
+    """Test that in-page records are post-processed and incomplete ones are dropped."""
+    extractor = ExtractionSpecs(None).get("airbnb_listing")
+    page = FakeExtractionPage([
+        {"title": "Loft", "price": "$120", "average_rating": "4.9", "host_url": "/users/show/1"},
+        {"title": "Cabin", "price": "$90", "average_rating": None, "host_url": "/users/show/2"},
+    ])
+    records = await extract_records(page, extractor)
+    assert records == [{
+        "title": "Loft",
+        "price": "$120",
+        "average_rating": 4.9,
+        "host_url": "https://www.airbnb.com/users/show/1",
+    }]
+    assert page.calls[0][0] == "div[itemprop=itemListElement]"
+    assert page.calls[0][1]["host_url"]["attribute"] == "href"
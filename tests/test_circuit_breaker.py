@@ -0,0 +1,113 @@
+"""Tests for the per-source circuit breakers."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from backend_app.utils.circuit_breaker import CircuitBreaker, CircuitBreakers, CircuitOpenError
+
+
+def test_trips_on_error_rate_and_recovers_through_a_probe():
+    """Test closed -> open -> half-open -> closed, and a failed probe doubling the open time."""
+    breaker = CircuitBreaker("google", window=10, min_calls=4, error_rate=0.5, open_seconds=30)
+    for success in (True, False, True):
+        breaker.acquire()
+        breaker.record(success)
+    assert breaker.state == "closed"
+    breaker.acquire()
+    breaker.record(False)
+    assert breaker.state == "open"
+    assert not breaker.available
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    breaker._opened_at -= 30
+    assert breaker.state == "half_open"
+    assert breaker.acquire()
+    assert not breaker.available
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+    breaker.record(False, probe=True)
+    assert breaker.state == "open"
+    assert 59 < breaker.retry_in() <= 60
+
+    breaker._opened_at -= 60
+    probe = breaker.acquire()
+    breaker.record(True, latency=0.5, probe=probe)
+    assert breaker.state == "closed"
+    assert breaker.stats()["trips"] == 2
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_only_the_probe_ends_the_half_open_state():
+    """Test that calls started before the breaker opened can neither free nor decide the probe."""
+    breaker = CircuitBreaker("google", min_calls=1, open_seconds=30)
+    assert breaker.acquire() is False
+    stale = breaker.acquire()
+    breaker.record(False, probe=breaker.acquire())
+    assert breaker.state == "open"
+
+    breaker._opened_at -= 30
+    probe = breaker.acquire()
+    assert probe is True
+    breaker.cancel(stale)
+    breaker.record(True, probe=stale)
+    assert breaker.state == "half_open"
+    assert not breaker.available
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    breaker.cancel(probe)
+    assert breaker.available
+    probe = breaker.acquire()
+    breaker.record(True, probe=probe)
+    assert breaker.state == "closed"
+    # A probe's late duplicate verdict changes nothing
+    breaker.record(False, probe=probe)
+    assert breaker.state == "closed"
+
+
+def test_threads_racing_for_the_probe_get_one():
+    """Test that of many worker threads acquiring a half-open breaker, exactly one probes."""
+    breaker = CircuitBreaker("linkedin", min_calls=1, open_seconds=0)
+    breaker.record(False)
+
+    def try_acquire(_):
+        try:
+            return breaker.acquire()
+        except CircuitOpenError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        outcomes = list(executor.map(try_acquire, range(200)))
+    assert outcomes.count(True) == 1
+    assert outcomes.count(None) == 199
+
+
+def test_trips_on_slow_calls():
+    """Test that successful but slow calls open the breaker too."""
+    breaker = CircuitBreaker("linkedin", min_calls=3, slow_call_seconds=5, slow_rate=0.6)
+    breaker.record(True, latency=1)
+    breaker.record(True, latency=9)
+    breaker.record(True, latency=9)
+    assert breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_call_counts_exceptions_and_frees_a_cancelled_probe():
+    """Test the call() context manager and the per-source registry."""
+    breakers = CircuitBreakers(min_calls=1, open_seconds=0)
+    breaker = breakers.get("airbnb")
+    assert breakers.get("airbnb") is breaker
+    with pytest.raises(ValueError):
+        async with breaker.call():
+            raise ValueError("blocked")
+    assert breaker.trips == 1
+
+    # open_seconds=0: the breaker is half-open straight away
+    with pytest.raises(KeyboardInterrupt):
+        async with breaker.call():
+            raise KeyboardInterrupt
+    assert breaker.available
+    async with breaker.call():
+        pass
+    assert breakers.stats()["airbnb"]["state"] == "closed"
@@ -0,0 +1,51 @@
+"""Tests for the global and per-host concurrency limiter."""
+
+import asyncio
+from collections import Counter
+
+import pytest
+from backend_app.utils.concurrency import HostLimiter, host_of
+
+
+@pytest.mark.asyncio
+async def test_map_enforces_global_and_per_host_caps():
+    """Test that map never runs more than the global cap, or the host cap for any one host."""
+    limiter = HostLimiter(max_concurrency=3, max_per_host=2)
+    active = Counter()
+    peak = Counter()
+
+    async def fetch(url):
+        host = host_of(url)
+        active[host] += 1
+        active["*"] += 1
+        peak[host] = max(peak[host], active[host])
+        peak["*"] = max(peak["*"], active["*"])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        active["*"] -= 1
+        return url
+
+    urls = [f"https://{host}.example/{index}" for host in ("a", "b", "c", "d") for index in range(4)]
+    assert await limiter.map(fetch, urls) == urls
+    assert peak.pop("*") == 3
+    assert max(peak.values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_map_keeps_order_and_maps_errors_to_none(caplog):
+    """Test input-order results, None for logged failures and the on_result callback."""
+    limiter = HostLimiter(max_concurrency=2, max_per_host=1)
+    completed = []
+
+    async def fetch(url):
+        await asyncio.sleep(0.02 if url.endswith("1") else 0)
+        if url.endswith("2"):
+            raise ValueError(url)
+        return url.upper()
+
+    urls = ["https://a.example/1", "https://b.example/2", "https://c.example/3"]
+    results = await limiter.map(fetch, urls, on_result=lambda index, result: completed.append(index))
+    assert results == ["HTTPS://A.EXAMPLE/1", None, "HTTPS://C.EXAMPLE/3"]
+    assert sorted(completed) == [0, 2]
+    assert "fetch failed for 'https://b.example/2'" in caplog.text
+    assert caplog.records[-1].exc_info[0] is ValueError
@@ -0,0 +1,50 @@
+"""Tests for the single-scan contact extractor."""
+
+import os
+import re
+
+from bs4 import BeautifulSoup
+from backend_app.utils.contact_extractor import ContactExtractor, contact_extractor
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+
+def test_extract_returns_every_candidate_with_positions():
+    """Test that all candidates are returned in page order with their offsets."""
+    text = "Call (303) 555-0100 or mail pm@summit.com. Office: 200 Market St, Denver, CO"
+    candidates = contact_extractor.extract_text(text)
+    assert [(c.kind, c.value) for c in candidates] == [
+        ("phone", "(303) 555-0100"),
+        ("email", "pm@summit.com"),
+        ("address", "200 Market St"),
+        ("address", " Denver, CO"),
+    ]
+    for candidate in candidates:
+        assert text[candidate.start:candidate.end] == candidate.value
+
+
+def test_extract_text_matches_finditer_over_long_runs():
+    """Test that skipping inside runs finds the same matches as a plain scan."""
+    extractor = ContactExtractor()
+    text = ("lorem ipsum dolor " * 200) + "Austin, TX 1234567890 a@b.io 12 Elm St, Reno, NV"
+    plain = re.compile(extractor._combined.pattern)
+    expected = [(m.start(), m.group()) for m in plain.finditer(text)]
+    assert [(c.start, c.value) for c in extractor.extract_text(text)] == expected
+
+
+def test_links_are_found_in_the_same_pass():
+    """Test mailto:/tel: links, their offsets and that the text matches get_text()."""
+    with open(os.path.join(FIXTURES, "property_manager_contact.html"), "rb") as f:
+        soup = BeautifulSoup(f.read(), "html.parser")
+    text, links = contact_extractor.page_text(soup)
+    assert text == soup.get_text()
+    emails = [c.value for c in links if c.kind == "email"]
+    phones = [c.value for c in links if c.kind == "phone"]
+    assert len(emails) == len(phones) == 12
+    assert emails[0] == "pm0@summitresidential.com"
+    assert phones[0] == "+13035550100"
+    assert text[links[0].start:].startswith("pm0@summitresidential.com")
+
+    candidates = contact_extractor.extract(soup)
+    assert ContactExtractor.first(candidates, "email") == "pm0@summitresidential.com"
+    assert ContactExtractor.first(candidates, "address", detail="street") == "200 Market St"
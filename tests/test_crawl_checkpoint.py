@@ -0,0 +1,55 @@
+"""Tests for the resumable crawl checkpoint log."""
+
+import csv
+
+from crawl_checkpoint import CrawlCheckpoint
+
+HEADER = ['LinkedIn Name', 'Title_Company', 'Industry', 'Location']
+
+
+def read_rows(path):
+    with open(path, newline='') as csv_file:
+        return list(csv.reader(csv_file))
+
+
+def test_resume_after_last_checkpointed_page(tmp_path):
+    """Test that a rerun continues after the last page and keeps earlier rows."""
+    output = str(tmp_path / 'scraped.csv')
+    with CrawlCheckpoint(output, HEADER) as checkpoint:
+        checkpoint.record('Retail', 1, 3, [['Ann Lee', 'PM at Acme', 'Retail', 'Denver']])
+        checkpoint.record('Retail', 2, 3, [['Bo Park', 'CFO at Zed', 'Retail', 'Austin']])
+
+    with CrawlCheckpoint(output, HEADER) as checkpoint:
+        assert checkpoint.next_page('Retail') == 3
+        assert checkpoint.last_page('Retail') == 3
+        assert not checkpoint.is_complete('Retail')
+        assert checkpoint.next_page('Banking') == 1
+        checkpoint.record('Retail', 3, 3, [['Cy Diaz', 'VP at Acme', 'Retail', 'Reno']])
+        assert checkpoint.is_complete('Retail')
+
+    rows = read_rows(output)
+    assert rows[0] == HEADER
+    assert [row[0] for row in rows[1:]] == ['Ann Lee', 'Bo Park', 'Cy Diaz']
+
+
+def test_unfinished_page_and_torn_log_line_are_dropped(tmp_path):
+    """Test that rows written after the last checkpoint and a torn log line are discarded."""
+    output = str(tmp_path / 'scraped.csv')
+    with CrawlCheckpoint(output, HEADER) as checkpoint:
+        checkpoint.record('Retail', 1, 5, [['Ann Lee', 'PM at Acme', 'Retail', 'Denver']])
+        log_path = checkpoint.log_path
+
+    # A crash after page 2's rows reached the CSV, in the middle of its log line
+    with open(output, 'a', newline='') as csv_file:
+        csv.writer(csv_file).writerow(['Bo Park', 'CFO at Zed', 'Retail', 'Austin'])
+    with open(log_path, 'a') as log:
+        log.write('{"industry": "Retail", "pa')
+
+    with CrawlCheckpoint(output, HEADER) as checkpoint:
+        assert checkpoint.next_page('Retail') == 2
+        assert checkpoint.rows == 1
+        checkpoint.record('Retail', 2, 5, [['Bo Park', 'CFO at Zed', 'Retail', 'Austin']])
+
+    assert [row[0] for row in read_rows(output)[1:]] == ['Ann Lee', 'Bo Park']
+    with CrawlCheckpoint(output, HEADER) as checkpoint:
+        assert checkpoint.pages_done == 2
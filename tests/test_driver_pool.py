@@ -0,0 +1,123 @@
+"""Tests for the pool of long-lived Selenium drivers."""
+
+import asyncio
+import json
+import os
+import stat
+
+import pytest
+from backend_app.utils.driver_pool import DriverPool
+
+COOKIES = [
+    {"name": "li_at", "value": "token", "domain": ".linkedin.com", "sameSite": "Lax"},
+    {"name": "lang", "value": "en", "domain": ".linkedin.com", "sameSite": "unspecified"},
+]
+
+
+class FakeDriver:
+    def __init__(self, cookies=()):
+        self.alive = True
+        self.quit_called = False
+        self.cookies = list(cookies)
+        self.visited = []
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("browser is gone")
+        return 1
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def get_cookies(self):
+        return self.cookies
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def quit(self):
+        self.quit_called = True
+
+class FakeFactory:
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        driver = FakeDriver(COOKIES)
+        self.drivers.append(driver)
+        return driver
+
+
+@pytest.mark.asyncio
+async def test_drivers_are_leased_reused_and_recycled():
+    """Test that a driver is reused until its page budget is spent and leases are capped."""
+    pool = DriverPool(max_drivers=2, pages_per_driver=2)
+    factory = FakeFactory()
+    async with pool.driver(factory) as first:
+        first.pages_served += 1
+    async with pool.driver(factory) as second:
+        assert second is first
+        second.pages_served += 1
+    assert factory.drivers[0].quit_called
+    assert pool.stats()["drivers_recycled"] == 1
+
+    async def hold(release):
+        async with pool.driver(factory):
+            await release.wait()
+
+    release = asyncio.Event()
+    holders = [asyncio.create_task(hold(release)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    assert pool.stats()["in_use"] == 2
+    release.set()
+    await asyncio.gather(*holders)
+    assert pool.stats()["idle"] == 2
+    assert len(factory.drivers) == 3
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_and_blocked_drivers_are_retired():
+    """Test that a dead idle driver is replaced and a driver marked as blocked is not pooled again."""
+    pool = DriverPool(max_drivers=1, pages_per_driver=100)
+    factory = FakeFactory()
+    async with pool.driver(factory) as lease:
+        pass
+    factory.drivers[0].alive = False
+    async with pool.driver(factory) as replacement:
+        assert replacement is not lease
+    assert factory.drivers[0].quit_called
+    assert pool.stats()["unhealthy"] == 1
+
+    # The scraper retires a challenged driver by spending its page budget
+    async with pool.driver(factory) as blocked:
+        blocked.pages_served = pool.pages_per_driver
+    assert factory.drivers[1].quit_called
+    assert pool.stats()["idle"] == 0
+    async with pool.driver(factory) as fresh:
+        assert fresh.driver is factory.drivers[2]
+
+
+@pytest.mark.asyncio
+async def test_cookies_are_saved_privately_and_restored(tmp_path):
+    """Test that a logged-in driver's cookies are saved with mode 0600 and loaded into a new driver."""
+    path = str(tmp_path / "session" / "cookies.json")
+    pool = DriverPool(max_drivers=1, pages_per_driver=1, cookie_path=path)
+    factory = FakeFactory()
+    async with pool.driver(factory) as lease:
+        lease.logged_in = True
+        lease.pages_served = 1
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    with open(path) as f:
+        assert json.load(f) == COOKIES
+
+    driver = FakeDriver()
+    assert pool.restore_cookies(driver, "https://www.linkedin.com")
+    assert driver.visited == ["https://www.linkedin.com"]
+    assert [cookie["name"] for cookie in driver.cookies] == ["li_at", "lang"]
+    assert driver.cookies[0]["sameSite"] == "Lax"
+    assert "sameSite" not in driver.cookies[1]
+    assert pool.stats()["cookie_restores"] == 1
+
+    assert not DriverPool(1, 1, cookie_path=str(tmp_path / "missing.json")).restore_cookies(
+        FakeDriver(), "https://www.linkedin.com"
+    )
@@ -0,0 +1,98 @@
+"""Tests for the declarative extraction specs."""
+
+import json
+import os
+
+import pytest
+from backend_app.utils.extraction_spec import ExtractionSpecs, compile_specs
+from backend_app.utils.html_parser import HTMLParser, available_backends
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+HOST_PAGE = """<html><body>
+<h1 class="_1n81at5">Maria</h1>
+<div class="_1n81at5 section">Austin, TX
+  <div class="_1n81at5"><div class="_1n81at5">Loft</div><span class="_tyxjp1">$120</span><span class="r1g2bVn">4.9</span></div>
+  <div class="_1n81at5"><div class="_1n81at5">Cabin</div><span class="_tyxjp1">$90</span></div>
+</div>
+</body></html>"""
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_default_specs_match_the_fixtures(backend):
+    """Test the built-in specs, post processors and required fields on every backend."""
+    specs = ExtractionSpecs(None)
+    parser = HTMLParser(backend)
+
+    places = specs.get("google").extract(parser.parse(load_fixture("google_local_results.html")))
+    assert len(places) == 40
+    assert places[0]["name"].endswith("Property Management 0")
+    assert places[0]["website"].startswith("https://")
+    assert places[0]["phone"] == "(512) 555-1000"
+
+    listings = specs.get("airbnb_listing").extract(
+        parser.parse(load_fixture("airbnb_search.html")), base_url="https://www.airbnb.com"
+    )
+    assert len(listings) == 30
+    assert listings[0]["title"] == "Cozy home 0 near downtown"
+    assert listings[0]["host_url"] == "https://www.airbnb.com/users/show/1000"
+    assert isinstance(listings[0]["average_rating"], float)
+
+    people = specs.get("sales_navigator").extract(parser.parse(load_fixture("sales_navigator_results.html")))
+    assert len(people) == 25
+    assert people[0]["title"] == "Property Manager"
+
+    host = specs.get("airbnb_host_details").extract_one(parser.parse(HOST_PAGE))
+    assert host["name"] == "Maria"
+    assert [listing["title"] for listing in host["listings"]] == ["Loft"]
+
+
+def test_in_page_records_find_the_phone_like_the_contact_extractor():
+    """Test that the phone post processor also runs on records extracted in the page."""
+    google = ExtractionSpecs(None).get("google")
+    assert google.js_fields()["phone"] == {"selector": None, "attribute": None, "pattern": None}
+    records = google.finish([
+        {"name": "Acme Property Management", "phone": "Acme · 4.8 (120) · Austin, TX · +15125551000"},
+        {"name": "No Phone PM", "phone": "Austin, TX 78701"},
+    ])
+    assert [record["phone"] for record in records] == ["+15125551000", None]
+
+
+def test_invalid_specs_are_rejected():
+    """Test that bad selectors, processors and references fail at compile time."""
+    with pytest.raises(ValueError):
+        compile_specs({"a": {"fields": {"name": {"selector": "div span"}}}})
+    with pytest.raises(ValueError):
+        compile_specs({"a": {"fields": {"name": {"post": ["nope"]}}}})
+    with pytest.raises(ValueError):
+        compile_specs({"a": {"fields": {"items": {"selector": "ul", "each": "missing"}}}})
+
+
+def test_spec_file_is_hot_reloaded(tmp_path):
+    """Test that edits to the spec file are picked up and a broken file keeps the last good specs."""
+    path = tmp_path / "specs.json"
+    specs = ExtractionSpecs(str(path), check_interval=0)
+    soup = HTMLParser("html.parser").parse("<div class='card'><b class='n'>Acme</b><i>12 units</i></div>")
+    with pytest.raises(KeyError):
+        specs.get("cards")
+
+    path.write_text(json.dumps({"cards": {"container": "div.card", "fields": {"name": {"selector": "b.n"}}}}))
+    assert specs.get("cards").extract(soup) == [{"name": "Acme"}]
+    assert specs.get("google").container == "div.VkpGBb"
+
+    path.write_text(json.dumps({"cards": {
+        "container": "div.card",
+        "fields": {"name": {"selector": "b.n", "post": ["lower"]}, "units": {"selector": "i", "post": ["digits"]}},
+    }}))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert specs.get("cards").extract(soup) == [{"name": "acme", "units": 12}]
+
+    path.write_text("{broken")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert specs.get("cards").extract(soup) == [{"name": "acme", "units": 12}]
+    assert specs.stats()["reload_errors"] == 1
@@ -0,0 +1,82 @@
+"""Tests for the crawl frontier."""
+
+from backend_app.utils.frontier import BloomFilter, CrawlFrontier, canonicalize_url
+
+
+def test_canonicalize_url():
+    """Test fragments, default ports, case, parameter order and tracking parameters."""
+    assert canonicalize_url("HTTPS://Example.COM:443/a?b=2&a=1#team") == "https://example.com/a?a=1&b=2"
+    assert canonicalize_url("http://example.com:80") == "http://example.com/"
+    assert canonicalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
+    assert canonicalize_url(
+        "https://example.com/?utm_source=ads&gclid=1&fbclid=2&UTM_Medium=x&page=2&ref=home"
+    ) == "https://example.com/?page=2&ref=home"
+    assert canonicalize_url("https://example.com/?q=&q=a") == "https://example.com/?q=&q=a"
+    assert canonicalize_url("https://example.com./a") == canonicalize_url("https://example.com/a")
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added item is found and the set-bit count matches the bits."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"https://example.com/{index}" for index in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"https://other.example/{index}" in bloom for index in range(2000))
+    assert false_positives < 100
+    assert bloom.bits_set == sum(bin(byte).count("1") for byte in bloom.bits)
+    assert BloomFilter(1000, 0.01, bytearray(bloom.bits)).fill_ratio() == bloom.fill_ratio()
+
+
+def test_jobs_skip_repeats_and_recent_visits():
+    """Test de-duplication within a job and across jobs."""
+    frontier = CrawlFrontier(ttl=3600, capacity=1000)
+    job = frontier.job()
+    assert job.admit_all(["https://a.example/x?b=2&a=1#1", "https://a.example/x?a=1&b=2#2", "https://b.example"]) == [
+        "https://a.example/x?b=2&a=1#1",
+        "https://b.example",
+    ]
+    frontier.mark_visited("https://a.example/x?a=1&b=2&utm_campaign=spring")
+    assert frontier.job().admit_all(["https://a.example/x?b=2&a=1", "https://b.example/"]) == ["https://b.example/"]
+    stats = frontier.stats()
+    assert (stats["admitted"], stats["duplicates"], stats["recently_visited"]) == (3, 1, 1)
+    assert stats["bloom_fill_ratio"] > 0
+
+    assert CrawlFrontier(ttl=0).job().admit("https://A.example/x#top") == "https://A.example/x#top"
+
+
+def test_visits_expire_after_two_generations():
+    """Test that a visit is remembered for one rotation and forgotten after the next."""
+    frontier = CrawlFrontier(ttl=100, capacity=1000)
+    frontier.mark_visited("https://a.example/")
+    frontier.started_at -= 150
+    assert frontier.recently_visited("https://a.example/")
+    assert frontier.previous is not None
+
+    frontier.started_at -= 150
+    assert not frontier.recently_visited("https://a.example/")
+
+    # A frontier idle for more than two TTLs drops both generations at once
+    frontier.mark_visited("https://b.example/")
+    frontier.started_at -= 250
+    assert not frontier.recently_visited("https://b.example/")
+    assert frontier.previous is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    """Test that both generations survive a restart and mismatched settings start fresh."""
+    path = str(tmp_path / "frontier.bin")
+    frontier = CrawlFrontier(ttl=100, path=path, capacity=1000)
+    frontier.mark_visited("https://old.example/")
+    frontier.started_at -= 150
+    frontier.mark_visited("https://new.example/")
+    frontier.save()
+
+    restarted = CrawlFrontier(ttl=100, path=path, capacity=1000)
+    assert restarted.recently_visited("https://old.example/")
+    assert restarted.recently_visited("https://new.example/")
+    assert not restarted.recently_visited("https://never.example/")
+    assert restarted.current.bits_set == frontier.current.bits_set
+
+    resized = CrawlFrontier(ttl=100, path=path, capacity=5000)
+    assert not resized.recently_visited("https://new.example/")
@@ -0,0 +1,63 @@
+"""Tests for the pluggable HTML parser backends."""
+
+import codecs
+import os
+
+import pytest
+from backend_app.utils.html_parser import HTMLParser, available_backends, sniff_encoding
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def test_sniff_encoding():
+    """Test the BOM, Content-Type, meta tag and fallback order."""
+    meta = b'<html><head><meta charset="windows-1252"></head></html>'
+    assert sniff_encoding(codecs.BOM_UTF8 + meta, "latin-1") == "utf-8"
+    assert sniff_encoding(meta, "ISO-8859-1") == "iso8859-1"
+    assert sniff_encoding(meta) == "cp1252"
+    assert sniff_encoding("<p>café</p>".encode("utf-8")) == "utf-8"
+    assert sniff_encoding("<p>café</p>".encode("cp1252"), "not-a-charset") == "cp1252"
+
+
+def test_unknown_backend_falls_back():
+    """Test that an unavailable backend degrades to the standard library parser."""
+    assert HTMLParser("no-such-parser").backend == "html.parser"
+    assert HTMLParser("auto").backend in ("lxml", "html.parser")
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_scraper_selectors_match_across_backends(backend):
+    """Test that the selectors the scrapers use give the same results on every backend."""
+    soup = HTMLParser(backend).parse(load_fixture("airbnb_search.html"))
+    listings = soup.find_all('div', {'itemprop': 'itemListElement'})
+    assert len(listings) == 30
+    assert listings[0].find('meta', {'itemprop': 'name'})['content'] == "Cozy home 0 near downtown"
+    assert listings[0].find('a', {'class': '_1n81at5'})['href'] == "/users/show/1000"
+    assert soup.find('nav', {'aria-label': 'Pagination'}).find_all('button')[-1].text == "15"
+
+    soup = HTMLParser(backend).parse(load_fixture("google_local_results.html"))
+    results = soup.find_all('div', class_='VkpGBb')
+    assert len(results) == 40
+    assert results[0].find('div', class_='dbg0pd').text.strip().endswith("Property Management 0")
+    assert results[0].find('a', href=True)['href'].startswith("https://")
+
+    soup = HTMLParser(backend).parse(load_fixture("property_manager_contact.html"))
+    mailto = soup.find_all("a", href=lambda x: x and "mailto:" in x)
+    assert len(mailto) == 12
+    managers = soup.find_all(lambda tag: tag.name in ['h3'] and 'property manager' in tag.get_text().lower())
+    assert managers[0].find_next(['p', 'div', 'span']).get_text().strip() == "Summit Residential LLC"
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_parse_bytes_uses_declared_charset(backend):
+    """Test that raw bytes are decoded with the charset declared in the page."""
+    soup = HTMLParser(backend).parse(load_fixture("sales_navigator_results.html"))
+    names = [result.find('div', class_='result-lockup__name').text.strip()
+             for result in soup.find_all('li', class_='search-results__result-item')]
+    assert len(names) == 25
+    assert any(name.startswith(("José", "Zoë", "Renée", "François")) for name in names)
@@ -0,0 +1,95 @@
+"""Tests for the keyword automaton and the element text index."""
+
+import os
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+from backend_app.utils.keyword_matcher import KeywordAutomaton
+from backend_app.utils.text_index import build_text_index
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "html")
+
+KEYWORDS = [
+    "property manager",
+    "property management",
+    "real estate manager",
+    "property owner",
+    "landlord",
+    "property administrator",
+    "property supervisor",
+    "property director",
+    "property coordinator",
+    "property specialist",
+]
+MANAGER_TAGS = ["p", "div", "span", "h1", "h2", "h3", "h4", "h5", "h6"]
+
+
+def substring_positions(text, keyword):
+    """Every start position of keyword in text, overlapping ones included."""
+    return [start for start in range(len(text)) if text.startswith(keyword, start)]
+
+
+def test_overlapping_and_prefix_keywords():
+    """Test that keywords inside, overlapping or prefixing other keywords are all reported."""
+    automaton = KeywordAutomaton(["he", "she", "his", "hers"])
+    assert sorted(automaton.iter_matches("ushers")) == [(1, 1), (2, 0), (2, 3)]
+
+    automaton = KeywordAutomaton(["property manage", "property manager", "manager", "aa"])
+    text = "a property manager and property management; aaa"
+    assert automaton.positions(text) == [[2, 23], [2], [11], [44, 45]]
+    assert KeywordAutomaton([]).positions(text) == []
+    assert KeywordAutomaton(["", "x"]).positions("xx") == [[], [0, 1]]
+
+
+def test_matches_ignore_word_boundaries_like_substring_checks():
+    """Test that keywords match inside longer words, as the substring checks did."""
+    automaton = KeywordAutomaton(["manager", "landlord"])
+    assert automaton.positions("managers, landlords and co-landlord") == [[0], [10, 27]]
+    assert automaton.positions("mana ger land-lord") == [[], []]
+
+
+def test_index_lowers_text_without_shifting_offsets():
+    """Test case folding, including characters that lower-case to two characters."""
+    soup = BeautifulSoup("<div><p>İlker Aydın PROPERTY Manager</p><span>Acme</span></div>", "html.parser")
+    index = build_text_index(soup, MANAGER_TAGS)
+    assert len(index.lowered) == len(index.text)
+    automaton = KeywordAutomaton(["property manager"])
+    positions = automaton.positions(index.lowered)[0]
+    assert [index.text[start:start + 16] for start in positions] == ["PROPERTY Manager"]
+    paragraph = next(i for i, (element, _, _) in enumerate(index.spans) if element.name == "p")
+    assert list(index.elements_containing(positions, 16)) == [0, paragraph]
+    assert index.element_text(index.next_element(paragraph, ["span"])) == "Acme"
+
+
+def test_automaton_matches_substring_search():
+    """Test the automaton against str.startswith at every position on random text."""
+    automaton = KeywordAutomaton(KEYWORDS)
+    rng = random.Random(7)
+    words = ["property", "manager", "management", "owner", "landlord", "real", "estate", "the", "pro"]
+    for _ in range(50):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 60)))
+        text = text.replace("pro property", "proproperty")
+        assert automaton.positions(text) == [substring_positions(text, keyword) for keyword in KEYWORDS]
+
+
+@pytest.mark.parametrize("name", ["property_manager_contact.html", "google_local_results.html"])
+def test_index_finds_the_elements_find_all_found(name):
+    """Test the indexed lookup against the per-keyword find_all it replaced."""
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        soup = BeautifulSoup(f.read(), "html.parser")
+    index = build_text_index(soup, MANAGER_TAGS)
+    automaton = KeywordAutomaton(KEYWORDS)
+    positions = automaton.positions(index.lowered)
+    matched = 0
+    for keyword_index, keyword in enumerate(KEYWORDS):
+        expected = soup.find_all(
+            lambda tag: tag.name in MANAGER_TAGS and keyword in tag.get_text().lower()
+        )
+        found = list(index.elements_containing(positions[keyword_index], len(keyword)))
+        assert [index.spans[element_index][0] for element_index in found] == expected
+        assert [index.element_text(element_index) for element_index in found] == [
+            element.get_text() for element in expected
+        ]
+        matched += len(found)
+    assert matched
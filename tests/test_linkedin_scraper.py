@@ -0,0 +1,71 @@
+"""Tests for the LinkedIn scraper's prefetched page loads."""
+
+import threading
+import time
+
+from backend_app.services.linkedin_scraper import LinkedInCrawl, LinkedInScraper
+from backend_app.utils.driver_pool import PooledDriver
+
+
+class FakeDriver:
+    """Shows the results page it was last sent to, after a short load time."""
+
+    def __init__(self):
+        self.page = 1
+        self.opened = []
+
+    @property
+    def page_source(self):
+        return f"<html>page {self.page}</html>"
+
+
+class FakeScraper(LinkedInScraper):
+    def _open(self, crawl, url):
+        time.sleep(0.01)
+        crawl.driver.page = int(url.split("page=")[1].split("&")[0])
+        crawl.driver.opened.append(crawl.driver.page)
+
+    def _random_delay(self):
+        pass
+
+    def _scroll_page(self, driver, result_selector=".search-results__result-item"):
+        time.sleep(0.01)
+
+
+def load_in_threads(scraper, crawl, pages):
+    """Start a load per page in the given order, each thread a little after the last."""
+    html = {}
+
+    def load(page):
+        html[page] = scraper._load_results_page(crawl, {}, page)
+
+    threads = []
+    for page in pages:
+        thread = threading.Thread(target=load, args=(page,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)
+    return threads, html
+
+
+def test_pages_load_in_order_when_later_threads_come_first():
+    """Test that a prefetch reaching the driver first waits, so every page returns its own HTML."""
+    scraper = FakeScraper()
+    crawl = LinkedInCrawl(PooledDriver(FakeDriver()))
+    threads, html = load_in_threads(scraper, crawl, [3, 2, 1])
+    for thread in threads:
+        thread.join(5)
+    assert html == {page: f"<html>page {page}</html>" for page in (1, 2, 3)}
+    assert crawl.driver.opened == [2, 3]
+
+
+def test_finishing_the_crawl_releases_waiting_pages():
+    """Test that pages still waiting for their turn return None once the crawl is over."""
+    scraper = FakeScraper()
+    crawl = LinkedInCrawl(PooledDriver(FakeDriver()))
+    threads, html = load_in_threads(scraper, crawl, [2, 3])
+    crawl.finish()
+    for thread in threads:
+        thread.join(5)
+    assert html == {2: None, 3: None}
+    assert crawl.driver.opened == []
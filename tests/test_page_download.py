@@ -0,0 +1,40 @@
+"""Tests for the streaming, size-capped page downloader."""
+
+import pytest
+from backend_app.utils.page_download import PageDownloader
+from conftest import FakeResponse
+
+HTML = {"Content-Type": "text/html; charset=utf-8"}
+
+
+@pytest.mark.asyncio
+async def test_stops_reading_after_body_end():
+    """Test that reading stops once </body> has arrived, even across chunks."""
+    downloader = PageDownloader(max_bytes=10_000, chunk_size=8)
+    page = b"<html><body>contact</BODY></html>" + b"<script>x</script>" * 100
+    response = FakeResponse(200, page, HTML)
+    result = await downloader.read(response)
+    assert result.body.startswith(b"<html><body>contact</BODY")
+    assert not result.truncated
+    assert sum(response.chunks) < len(page)
+    assert downloader.stats()["stopped_at_body_end"] == 1
+
+@pytest.mark.asyncio
+async def test_cap_truncates_and_non_html_is_skipped():
+    """Test the byte cap and that a non-HTML content type is never read."""
+    downloader = PageDownloader(max_bytes=100, chunk_size=64)
+    truncated = await downloader.read(FakeResponse(200, b"a" * 1000, {"Content-Length": "1000"}))
+    assert len(truncated.body) == 100
+    assert truncated.truncated
+
+    exact = await downloader.read(FakeResponse(200, b"a" * 100, HTML))
+    assert not exact.truncated
+
+    pdf = FakeResponse(200, b"%PDF" * 100, {"Content-Type": "application/pdf"})
+    skipped = await downloader.read(pdf)
+    assert skipped.skipped == "content type application/pdf"
+    assert skipped.body == b""
+    assert pdf.chunks == []
+
+    stats = downloader.stats()
+    assert (stats["pages"], stats["truncated"], stats["skipped"]) == (2, 1, 1)
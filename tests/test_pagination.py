@@ -0,0 +1,105 @@
+"""Tests for the prefetching page crawler."""
+
+import asyncio
+
+import pytest
+from backend_app.utils.pagination import crawl_pages
+
+
+class FakeSite:
+    """Serves numbered pages after a per-page delay and tracks the fetches in flight."""
+
+    def __init__(self, delays=None, missing=(), empty=()):
+        self.delays = delays or {}
+        self.missing = set(missing)
+        self.empty = set(empty)
+        self.started = []
+        self.cancelled = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def fetch(self, page):
+        self.started.append(page)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(page, 0.01))
+        except asyncio.CancelledError:
+            self.cancelled.append(page)
+            raise
+        finally:
+            self.in_flight -= 1
+        return None if page in self.missing else page
+
+    def parse(self, page):
+        return [] if page in self.empty else [f"lead {page}"]
+
+
+async def collect(pages):
+    return [item async for item in pages]
+
+
+@pytest.mark.asyncio
+async def test_yields_in_page_order_within_the_window():
+    """Test that later pages finishing first are still yielded in order, with the window bounded."""
+    site = FakeSite(delays={1: 0.05, 2: 0.03, 3: 0.01})
+    results = await collect(crawl_pages(site.fetch, site.parse, total_pages=6, window=2))
+    assert [page for page, _ in results] == [1, 2, 3, 4, 5, 6]
+    assert results[0] == (1, ["lead 1"])
+    assert site.peak == 3
+    assert site.started == [1, 2, 3, 4, 5, 6]
+
+
+@pytest.mark.asyncio
+async def test_window_zero_fetches_one_page_at_a_time():
+    """Test that no page is prefetched without a window."""
+    site = FakeSite()
+    await collect(crawl_pages(site.fetch, site.parse, total_pages=3, window=0, first_page=2))
+    assert site.peak == 1
+    assert site.started == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_missing_page_is_skipped():
+    """Test that a page fetched as None is skipped and the pages after it are still crawled."""
+    site = FakeSite(missing={3})
+    results = await collect(crawl_pages(site.fetch, site.parse, total_pages=6, window=2))
+    assert [page for page, _ in results] == [1, 2, 4, 5, 6]
+    assert site.started == [1, 2, 3, 4, 5, 6]
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_stops_the_crawl_and_cancels_prefetches():
+    """Test that an exception from fetch, like an open circuit breaker, ends the crawl."""
+    site = FakeSite(delays={4: 1, 5: 1})
+
+    async def fetch(page):
+        if page == 3:
+            raise RuntimeError("circuit open")
+        return await site.fetch(page)
+
+    results = []
+    with pytest.raises(RuntimeError):
+        async for item in crawl_pages(fetch, site.parse, total_pages=10, window=2):
+            results.append(item)
+    assert [page for page, _ in results] == [1, 2]
+    assert sorted(site.cancelled) == [4, 5]
+    assert site.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_empty_page_and_early_exit_cancel_prefetches():
+    """Test that a page without results, or a consumer that stops early, cancels the pages in flight."""
+    # Page 5 joins the window while page 2 is parsed
+    site = FakeSite(delays={3: 1, 4: 1, 5: 1}, empty={2})
+    results = await collect(crawl_pages(site.fetch, site.parse, total_pages=10, window=2))
+    assert results == [(1, ["lead 1"])]
+    assert sorted(site.cancelled) == [3, 4, 5]
+
+    site = FakeSite(delays={2: 1, 3: 1, 4: 1})
+    pages = crawl_pages(site.fetch, site.parse, total_pages=10, window=2)
+    async for page, _ in pages:
+        break
+    await pages.aclose()
+    assert sorted(site.cancelled) == [2, 3, 4]
+    assert site.in_flight == 0
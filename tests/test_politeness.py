@@ -0,0 +1,38 @@
+"""Tests for the per-host politeness scheduler."""
+
+import asyncio
+import time
+
+import pytest
+from backend_app.utils.politeness import PolitenessScheduler, parse_crawl_delays
+
+def test_parse_crawl_delays():
+    """Test parsing the host=seconds setting format."""
+    delays = parse_crawl_delays("Example.com=3, bad, other.org=x,slow.net=0.5")
+    assert delays == {"example.com": 3.0, "slow.net": 0.5}
+
+@pytest.mark.asyncio
+async def test_wait_spaces_requests_per_host():
+    """Test that one host is spaced out while another host is not held back."""
+    scheduler = PolitenessScheduler(min_delay=0.1, max_delay=0.1)
+    start = time.monotonic()
+
+    async def timed_wait(url):
+        await scheduler.wait(url)
+        return time.monotonic() - start
+
+    first, second, other = await asyncio.gather(
+        timed_wait("https://a.example.com/1"),
+        timed_wait("https://a.example.com/2"),
+        timed_wait("https://b.example.com/1"),
+    )
+    assert first < 0.05
+    assert second >= 0.1
+    assert other < 0.05
+
+def test_crawl_delay_overrides_jitter():
+    """Test that a configured crawl delay raises the spacing for its host."""
+    scheduler = PolitenessScheduler(min_delay=0.1, max_delay=0.2)
+    scheduler.set_crawl_delay("Slow.example.com", 10)
+    assert scheduler.spacing("slow.example.com") == 10
+    assert scheduler.spacing("fast.example.com") <= 0.2
@@ -0,0 +1,85 @@
+"""Tests for the on-disk HTTP response cache."""
+
+import pytest
+from backend_app.utils.page_download import PageDownloader
+from backend_app.utils.response_cache import ResponseCache
+from conftest import FakeResponse, FakeSession
+
+@pytest.mark.asyncio
+async def test_fresh_entry_skips_network(tmp_path):
+    """Test that a fresh entry is served without a request or before_request call."""
+    cache = ResponseCache(str(tmp_path), max_bytes=10_000, default_ttl=60)
+    session = FakeSession(FakeResponse(200, "<html>a</html>"))
+    calls = []
+
+    async def before_request():
+        calls.append(1)
+
+    first = await cache.fetch(session, "https://example.com/", before_request=before_request)
+    second = await cache.fetch(session, "https://example.com/", before_request=before_request)
+    assert first.text == second.text == "<html>a</html>"
+    assert second.from_cache
+    assert len(session.requests) == 1
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_revalidated(tmp_path):
+    """Test that a stale entry sends validators and is reused on 304."""
+    cache = ResponseCache(str(tmp_path), max_bytes=10_000, default_ttl=60)
+    session = FakeSession(
+        FakeResponse(200, "body", {"Cache-Control": "no-cache", "ETag": '"v1"'}),
+        FakeResponse(304, headers={"Cache-Control": "max-age=60"}),
+    )
+    await cache.fetch(session, "https://example.com/page")
+    response = await cache.fetch(session, "https://example.com/page")
+    assert session.headers[1]["If-None-Match"] == '"v1"'
+    assert response.text == "body"
+    assert response.fresh
+    assert cache.revalidated == 1
+
+@pytest.mark.asyncio
+async def test_no_store_and_errors_are_not_cached(tmp_path):
+    """Test that no-store and non-200 responses are not written."""
+    cache = ResponseCache(str(tmp_path), max_bytes=10_000, default_ttl=60)
+    session = FakeSession(
+        FakeResponse(200, "secret", {"Cache-Control": "no-store"}),
+        FakeResponse(500, "error"),
+    )
+    await cache.fetch(session, "https://example.com/a")
+    await cache.fetch(session, "https://example.com/b")
+    assert cache.stats()["entries"] == 0
+
+@pytest.mark.asyncio
+async def test_truncated_body_is_not_cached(tmp_path):
+    """Test that a body cut at the downloader's cap is returned but fetched again next time."""
+    html = {"Content-Type": "text/html"}
+    cache = ResponseCache(str(tmp_path), 10_000, 60, downloader=PageDownloader(max_bytes=100))
+    session = FakeSession(FakeResponse(200, "a" * 1000, html), FakeResponse(200, "a" * 50, html))
+    truncated = await cache.fetch(session, "https://example.com/long")
+    assert truncated.truncated and len(truncated.text) == 100
+    assert cache.get("https://example.com/long") is None
+    complete = await cache.fetch(session, "https://example.com/long")
+    assert not complete.truncated and not complete.from_cache
+    assert cache.get("https://example.com/long").text == "a" * 50
+
+def test_source_ttl_overrides_max_age(tmp_path):
+    """Test that a per-source TTL wins over the server's max-age."""
+    cache = ResponseCache(str(tmp_path), 10_000, 60, source_ttls={"google": 5})
+    assert cache.ttl_for("google", "max-age=600") == 5
+    assert cache.ttl_for("web", "max-age=600") == 600
+    assert cache.ttl_for("web", None) == 60
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used(tmp_path):
+    """Test that the size bound evicts the least recently used entry and persists order."""
+    cache = ResponseCache(str(tmp_path), max_bytes=700, default_ttl=60)
+    session = FakeSession(*(FakeResponse(200, "x" * 100) for _ in range(3)))
+    await cache.fetch(session, "https://example.com/1")
+    await cache.fetch(session, "https://example.com/2")
+    cache.get("https://example.com/1")
+    await cache.fetch(session, "https://example.com/3")
+    assert cache.get("https://example.com/2") is None
+    assert cache.get("https://example.com/1") is not None
+
+    reopened = ResponseCache(str(tmp_path), max_bytes=700, default_ttl=60)
+    assert reopened.get("https://example.com/3") is not None
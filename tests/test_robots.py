@@ -0,0 +1,94 @@
+"""Tests for the robots.txt policy."""
+
+import pytest
+from backend_app.utils.politeness import PolitenessScheduler
+from backend_app.utils.proxy_pool import ProxyPool
+from backend_app.utils.robots import MAX_ROBOTS_BYTES, RobotsPolicy, parse_robots
+from conftest import FakeResponse, FakeSession
+
+ROBOTS = """
+User-agent: otherbot
+Disallow: /
+
+User-agent: *
+Disallow: /private
+Allow: /private/contact
+Disallow: /*.pdf$
+Disallow: /search?
+Crawl-delay: 7
+"""
+
+
+def fresh_policy(cache_dir, **options):
+    return RobotsPolicy(cache_dir, ttl=3600, error_ttl=60, politeness=PolitenessScheduler(0, 0), **options)
+
+
+def test_longest_match_wins_and_allow_wins_ties():
+    """Test prefix and wildcard rules, longest match first."""
+    rules = parse_robots(ROBOTS)
+    assert rules.allowed("/")
+    assert not rules.allowed("/private/notes")
+    assert rules.allowed("/private/contact-us")
+    assert not rules.allowed("/files/brochure.pdf")
+    assert rules.allowed("/files/brochure.pdf?v=2")
+    assert not rules.allowed("/search?q=pm")
+    assert rules.crawl_delay == 7
+    assert not parse_robots(ROBOTS, user_agent="OtherBot/2.1").allowed("/")
+    assert parse_robots("User-agent: *\nDisallow: /a\nAllow: /a\n").allowed("/a")
+
+
+@pytest.mark.asyncio
+async def test_robots_fetched_once_and_cached_on_disk(tmp_path):
+    """Test concurrent checks share one fetch, the disk cache and the crawl delay."""
+    session = FakeSession(FakeResponse(200, ROBOTS))
+    policy = fresh_policy(str(tmp_path))
+    urls = ["https://Robots-Test.example/", "https://robots-test.example/private/x", "https://robots-test.example/about"]
+    assert await policy.filter(session, urls) == [urls[0], urls[2]]
+    assert session.urls == ["https://robots-test.example/robots.txt"]
+    assert policy.politeness.crawl_delays["robots-test.example"] == 7
+
+    restarted = fresh_policy(str(tmp_path))
+    assert not await restarted.allowed(session, urls[1])
+    assert len(session.urls) == 1
+    assert restarted.stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_and_unreachable_robots(tmp_path):
+    """Test that a 404 allows everything and a 503 disallows everything."""
+    missing = fresh_policy(str(tmp_path / "a"))
+    assert await missing.allowed(FakeSession(FakeResponse(404)), "https://missing.example/private")
+    failing = fresh_policy(str(tmp_path / "b"))
+    assert not await failing.allowed(FakeSession(FakeResponse(503)), "https://failing.example/")
+
+
+@pytest.mark.asyncio
+async def test_each_fetch_uses_and_reports_its_own_proxy(tmp_path):
+    """Test that every robots.txt fetch acquires a proxy and reports how it went."""
+    proxies = ProxyPool(["http://only.proxy:8080"], failure_threshold=10)
+    session = FakeSession(FakeResponse(200, ROBOTS), OSError("connection reset"))
+    policy = fresh_policy(None)
+    assert await policy.allowed(session, "https://a.example/", proxies, headers={"User-Agent": "test"})
+    assert not await policy.allowed(session, "https://b.example/", proxies)
+    assert [kwargs["proxy"] for _, kwargs in session.requests] == ["http://only.proxy:8080"] * 2
+    assert session.headers[0] == {"User-Agent": "test"}
+    health = proxies.proxies["http://only.proxy:8080"]
+    assert (health.requests, health.successes, health.failures) == (2, 1, 1)
+
+    unproxied = FakeSession(FakeResponse(200, ROBOTS))
+    assert await fresh_policy(None).allowed(unproxied, "https://c.example/", ProxyPool([]))
+    assert "proxy" not in unproxied.requests[0][1]
+
+
+@pytest.mark.asyncio
+async def test_robots_longer_than_one_chunk_is_read_in_full(tmp_path):
+    """Test that rules after the first network chunk are applied and the size cap still holds."""
+    padding = "".join(f"# comment line {index}\n" for index in range(5000))
+    robots = f"User-agent: *\n{padding}Disallow: /late\n"
+    response = FakeResponse(200, robots, buffer_size=1024)
+    policy = fresh_policy(None)
+    assert not await policy.allowed(FakeSession(response), "https://long.example/late/page")
+    assert len(response.chunks) > 1
+
+    oversized = f"User-agent: *\n{'#' * MAX_ROBOTS_BYTES}\nDisallow: /\n"
+    assert await fresh_policy(None).allowed(FakeSession(FakeResponse(200, oversized, buffer_size=4096)), "https://big.example/")
@@ -0,0 +1,67 @@
+"""Tests for the schema.org structured data extractor."""
+
+from bs4 import BeautifulSoup
+from backend_app.utils.structured_data import StructuredDataExtractor
+
+JSON_LD_PAGE = """<html><head>
+<meta property="og:site_name" content="Summit PM">
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "RealEstateAgent", "name": "Summit Property Management",
+   "telephone": "+1 303 555 0100", "email": "mailto:office@summit.com",
+   "address": {"@type": "PostalAddress", "streetAddress": "200 Market St",
+               "addressLocality": "Denver", "addressRegion": "CO"},
+   "employee": [{"@type": "Person", "name": "Jane Doe", "jobTitle": "Property Manager",
+                 "email": "jane@summit.com"}]},
+  {"@type": "BlogPosting", "author": {"@type": "Person", "name": "Guest Writer"}}
+]}
+</script>
+<script type="application/ld+json">{not json</script>
+</head><body></body></html>"""
+
+MICRODATA_PAGE = """<html><head>
+<meta content="info@rentals.com" property="og:email">
+<meta property='og:site_name' content='Roe Rentals'>
+</head><body>
+<div itemscope itemtype="https://schema.org/Person">
+  <span itemprop="name">Bob Roe</span>
+  <div><span itemprop="jobTitle">Leasing Manager</span></div>
+  <a itemprop="email" href="mailto:bob@rentals.com">Email Bob</a>
+  <div itemprop="address" itemscope itemtype="https://schema.org/PostalAddress">
+    <span itemprop="addressLocality">Austin</span>, <span itemprop="addressRegion">TX</span>
+  </div>
+</div>
+</body></html>"""
+
+
+def test_json_ld_organization_and_people():
+    """Test @graph walking, employers, PostalAddress and skipping authors and bad blocks."""
+    extractor = StructuredDataExtractor()
+    assert not extractor.has_microdata(JSON_LD_PAGE)
+    records = extractor.extract(JSON_LD_PAGE)
+    assert [(record.kind, record.name) for record in records] == [
+        ("organization", "Summit Property Management"),
+        ("person", "Jane Doe"),
+    ]
+    agency, person = records
+    assert agency.schema_type == "RealEstateAgent"
+    assert agency.email == "office@summit.com"
+    assert agency.address == "200 Market St, Denver, CO"
+    assert person.organization == "Summit Property Management"
+    assert person.job_title == "Property Manager"
+
+
+def test_microdata_and_opengraph():
+    """Test nested microdata items, attribute values and the OpenGraph organization."""
+    extractor = StructuredDataExtractor()
+    assert extractor.has_microdata(MICRODATA_PAGE)
+    assert extractor.extract(MICRODATA_PAGE)[0].source == "opengraph"
+
+    records = extractor.extract(MICRODATA_PAGE, BeautifulSoup(MICRODATA_PAGE, "html.parser"))
+    person, site = records
+    assert person.source == "microdata"
+    assert (person.name, person.job_title, person.email) == ("Bob Roe", "Leasing Manager", "bob@rentals.com")
+    assert person.address == "Austin, TX"
+    assert person.organization == "Roe Rentals"
+    assert (site.kind, site.email) == ("organization", "info@rentals.com")
+    assert extractor.stats()["records"] == {"json-ld": 0, "microdata": 1, "opengraph": 2}
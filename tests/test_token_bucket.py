@@ -0,0 +1,45 @@
+"""Tests for the async token-bucket rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+from backend_app.utils.token_bucket import TokenBucket, TokenBucketLimiter, parse_rate_limits
+
+def test_parse_rate_limits():
+    """Test parsing the source=calls_per_minute:burst setting format."""
+    limits = parse_rate_limits("Google=20:5,linkedin=6,bad,web=x:1")
+    assert limits == {"google": (20.0, 5), "linkedin": (6.0, 1)}
+
+@pytest.mark.asyncio
+async def test_bucket_allows_burst_then_waits():
+    """Test that a full bucket serves its burst at once and then refills at the rate."""
+    bucket = TokenBucket(rate_per_minute=600, burst=3)  # 10 tokens per second
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.05
+    await bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+@pytest.mark.asyncio
+async def test_limiter_uses_separate_host_buckets():
+    """Test that a drained host bucket does not hold back another host."""
+    limiter = TokenBucketLimiter(
+        source_rate_per_minute=6000,
+        source_burst=10,
+        host_rate_per_minute=60,
+        host_burst=1
+    )
+    await limiter.acquire("https://a.example.com/1")
+    start = time.monotonic()
+    await asyncio.wait_for(limiter.acquire("https://b.example.com/1"), timeout=0.1)
+    assert time.monotonic() - start < 0.05
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire("https://a.example.com/2"), timeout=0.1)
+
+def test_source_limits_override_defaults():
+    """Test that configured per-source limits replace the default bucket size."""
+    limiter = TokenBucketLimiter(100, 10, 30, 3, source_limits={"google": (20, 5)})
+    assert limiter.source_bucket("google").capacity == 5
+    assert limiter.source_bucket("web").capacity == 10